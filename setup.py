@@ -31,7 +31,8 @@ setup(
     license='Apache License, Version 2.0',
 
     packages=['storage_orm', 'storage_orm.redis_impl'],
-    install_requires=['redis'],
+    install_requires=['redis>=4.2.0'],
+    extras_require={'msgpack': ['msgpack'], 'numpy': ['numpy']},
 
     classifiers=[
         'License :: OSI Approved :: Apache Software License',
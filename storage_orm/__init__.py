@@ -1,5 +1,11 @@
 from .redis_impl import RedisORM
 from .redis_impl import RedisItem
+from .redis_impl import AsyncRedisORM
+from .redis_impl import ShardedRedis
+from .redis_impl import MetricsHook
+from .redis_impl import CallbackHook
+from .redis_impl import InMemoryCollector
+from .redis_impl import OperationMetrics
 
 from .storage_orm import StorageORM
 from .storage_item import StorageItem
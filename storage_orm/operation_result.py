@@ -1,5 +1,7 @@
+from __future__ import annotations
 from enum import Enum
 from typing import Union
+from typing import Optional
 
 
 class OperationStatus(Enum):
@@ -12,10 +14,17 @@ class OperationResult:
     """ Результат записи/чтения из БД """
     status: OperationStatus
     message: str
+    details: list[OperationResult]  # Результаты частей групповой операции (например, порций вставки)
 
-    def __init__(self, status: Union[OperationStatus, bool], message: str = "") -> None:
+    def __init__(
+        self,
+        status: Union[OperationStatus, bool],
+        message: str = "",
+        details: Optional[list[OperationResult]] = None,
+    ) -> None:
         self.status = OperationStatus(status)
         self.message = message
+        self.details = details or []
 
     @property
     def ok(self) -> bool:
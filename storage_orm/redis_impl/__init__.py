@@ -1,2 +1,8 @@
 from .redis_orm import RedisORM
 from .redis_item import RedisItem
+from .async_redis_orm import AsyncRedisORM
+from .sharding import ShardedRedis
+from .metrics import MetricsHook
+from .metrics import CallbackHook
+from .metrics import InMemoryCollector
+from .metrics import OperationMetrics
@@ -0,0 +1,79 @@
+from __future__ import annotations
+import logging
+import redis.asyncio
+from typing import Iterable
+from typing import Optional
+
+from .redis_item import RedisItem
+from .redis_item import T as SubclassItemType
+from .redis_orm import get_chunks
+from .redis_orm import get_bulk_result
+from .redis_orm import BULK_CHUNK_SIZE
+from .redis_orm import BULK_MAX_BYTES
+from ..operation_result import OperationResult
+from ..operation_result import OperationStatus
+
+
+class AsyncRedisORM:
+    """ Работа с БД Redis через объектное представление (asyncio, redis.asyncio) """
+    _client: redis.asyncio.Redis
+
+    def __init__(
+        self,
+        client: redis.asyncio.Redis = None,
+        host: str = None,
+        port: int = 6379,
+        db: int = 0,
+    ) -> None:
+        if client:
+            self._client = client
+        elif host:
+            self._client = redis.asyncio.Redis(host=host, port=port, db=db)
+        else:
+            raise Exception("StorageORM-init must contains redis_client or host values...")
+
+        if not RedisItem._async_db_instance:
+            RedisItem._set_global_async_instance(db_instance=self._client)
+
+    async def asave(self, item: RedisItem, ttl: Optional[float] = None) -> OperationResult:
+        """ Одиночная вставка """
+        return await item.asave(ttl=ttl)
+
+    async def abulk_create(
+        self,
+        items: Iterable[SubclassItemType],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_bytes: int = BULK_MAX_BYTES,
+        ttl: Optional[float] = None,
+    ) -> OperationResult:
+        """
+            Групповая вставка
+            Порции формируются так же, как в RedisORM.bulk_create: для каждой порции
+              выполняется отдельный pipeline с одной командой MSET (и PEXPIRE для ttl)
+            Результат каждой порции доступен в OperationResult.details
+        """
+        chunks_results: list[OperationResult] = []
+        try:
+            for index, chunk in enumerate(get_chunks(items=items, chunk_size=chunk_size, max_bytes=max_bytes)):
+                try:
+                    await RedisItem._aread_indexed_values(db_instance=self._client, objects=chunk.items)
+                    pipe: redis.asyncio.client.Pipeline = self._client.pipeline(transaction=False)
+                    chunk.queue(pipe=pipe, ttl=ttl)
+                    await pipe.execute()
+                    chunk.put_to_cache(db_instance=self._client)
+                    chunks_results.append(chunk.get_result(index=index))
+                except Exception as exception:
+                    self._on_error_actions(exception=exception)
+                    chunks_results.append(chunk.get_result(index=index, exception=exception))
+        except Exception as exception:
+            # Ошибка формирования порции (например, в генераторе объектов)
+            self._on_error_actions(exception=exception)
+            chunks_results.append(OperationResult(status=OperationStatus.failed, message=str(exception)))
+        return get_bulk_result(results=chunks_results)
+
+    def _on_error_actions(self, exception: Exception) -> None:
+        """
+            Действия, выполняющиеся в случае возникновения исключения
+                во время вставки, сохранения, получения данных из БД
+        """
+        logging.exception(exception)
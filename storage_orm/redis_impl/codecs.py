@@ -0,0 +1,172 @@
+from __future__ import annotations
+import struct
+from typing import Any
+from typing import Union
+from typing import Optional
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Форматы struct для упаковки числовых полей по типу поля
+STRUCT_FORMATS: dict[type, str] = {
+    int: "<q",
+    float: "<d",
+    bool: "<?",
+}
+# Типы массивов NumPy для векторного разбора текстовых значений числовых полей
+TEXT_ARRAY_TYPES: dict[type, str] = {
+    int: "int64",
+    float: "float64",
+}
+# Длина отсутствующего (None) поля в упакованном объекте
+BLOB_NONE_LENGTH = -1
+_BLOB_LENGTH = struct.Struct("<i")
+
+
+class Codec:
+    """
+        Кодек значения поля модели
+        - encode: приведение значения поля к формату записи в БД
+        - decode: приведение значения из БД (bytes) к значению поля
+        - decode_array: приведение значений поля множества объектов к массиву NumPy
+          (по умолчанию - массив объектов, значения декодируются по одному)
+    """
+
+    def encode(self, value: Any) -> Any:
+        raise NotImplementedError
+
+    def decode(self, raw: bytes) -> Any:
+        raise NotImplementedError
+
+    def decode_array(self, raws: list[bytes]) -> Any:
+        values: Any = numpy.empty(len(raws), dtype=object)
+        values[:] = [self.decode(raw) for raw in raws]
+        return values
+
+
+class TextCodec(Codec):
+    """ Текстовый формат: значение записывается как есть (приводится к строке redis-py) """
+    field_type: Any
+
+    def __init__(self, field_type: Any = str) -> None:
+        self.field_type = field_type
+
+    def encode(self, value: Any) -> Any:
+        return value
+
+    def decode(self, raw: bytes) -> Any:
+        if self.field_type is str:
+            return raw.decode()
+        return self.field_type(raw)
+
+    def decode_array(self, raws: list[bytes]) -> Any:
+        """ Числа и строки разбираются NumPy целиком, без преобразования каждого значения """
+        if self.field_type in TEXT_ARRAY_TYPES:
+            return numpy.array(raws, dtype=bytes).astype(TEXT_ARRAY_TYPES[self.field_type])
+        if self.field_type is str:
+            return numpy.char.decode(numpy.array(raws, dtype=bytes), "utf-8")
+        return super().decode_array(raws)
+
+
+class StructCodec(Codec):
+    """ Упаковка числовых значений в бинарный формат фиксированной длины (struct) """
+    _struct: struct.Struct
+
+    def __init__(self, field_type: Any = None, format: Optional[str] = None) -> None:
+        format = format or STRUCT_FORMATS.get(field_type)
+        if not format:
+            raise ValueError(f"StructCodec: unsupported field type {field_type}, format must be defined...")
+        self._struct = struct.Struct(format)
+
+    def encode(self, value: Any) -> bytes:
+        return self._struct.pack(value)
+
+    def decode(self, raw: bytes) -> Any:
+        return self._struct.unpack(raw)[0]
+
+    def decode_array(self, raws: list[bytes]) -> Any:
+        """ Значения фиксированной длины одного числового формата читаются из общего буфера """
+        try:
+            dtype: Any = numpy.dtype(self._struct.format)
+        except TypeError:
+            return super().decode_array(raws)
+        return numpy.frombuffer(b"".join(raws), dtype=dtype)
+
+
+class MsgpackCodec(Codec):
+    """ Сериализация значений в формат msgpack (необходим пакет msgpack) """
+
+    def __init__(self, field_type: Any = None) -> None:
+        if msgpack is None:
+            raise ImportError("MsgpackCodec requires msgpack package: pip install msgpack")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value)
+
+    def decode(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw)
+
+
+# Кодеки, доступные по имени в Meta.codec и Meta.codecs модели
+CODECS: dict[str, type[Codec]] = {
+    "text": TextCodec,
+    "struct": StructCodec,
+    "msgpack": MsgpackCodec,
+}
+
+
+def get_codec(codec: Union[str, Codec], field_type: Any) -> Codec:
+    """ Получение кодека поля по имени (или готового экземпляра) и типу поля """
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in CODECS:
+        raise ValueError(f"Unknown codec: {codec}, available: {', '.join(CODECS)}...")
+    return CODECS[codec](field_type)
+
+
+def to_bytes(value: Any) -> bytes:
+    """ Приведение значения к bytes аналогично кодированию значений redis-py """
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, str):
+        return value.encode()
+    if isinstance(value, float):
+        return repr(value).encode()
+    return str(value).encode()
+
+
+def pack_blob(values: list[Any]) -> bytes:
+    """
+        Упаковка закодированных значений полей объекта в одно значение:
+          для каждого поля - длина (int32, -1 для None) и данные
+    """
+    parts: list[bytes] = []
+    for value in values:
+        if value is None:
+            parts.append(_BLOB_LENGTH.pack(BLOB_NONE_LENGTH))
+            continue
+        raw: bytes = to_bytes(value)
+        parts.append(_BLOB_LENGTH.pack(len(raw)))
+        parts.append(raw)
+    return b"".join(parts)
+
+
+def unpack_blob(blob: bytes) -> list[Optional[bytes]]:
+    """ Распаковка значений полей объекта, упакованных pack_blob """
+    values: list[Optional[bytes]] = []
+    offset: int = 0
+    while offset < len(blob):
+        (length,) = _BLOB_LENGTH.unpack_from(blob, offset)
+        offset += _BLOB_LENGTH.size
+        if length == BLOB_NONE_LENGTH:
+            values.append(None)
+            continue
+        values.append(blob[offset:offset + length])
+        offset += length
+    return values
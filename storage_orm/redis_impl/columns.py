@@ -0,0 +1,68 @@
+from __future__ import annotations
+from typing import Any
+from typing import Optional
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from .codecs import Codec
+from .schema import ModelSchema
+from .schema import KEYS_DELIMITER
+
+
+def build_columns(
+    schema: ModelSchema,
+    tables: list[bytes],
+    values: list[Optional[bytes]],
+) -> dict[str, Any]:
+    """
+        Формирование колонок (массивов NumPy) из значений полей, полученных из БД
+        - values: значения полей модели для каждого префикса записи из tables
+          (построчно, в порядке schema.fields), None - значение отсутствует в БД
+        - результат: массив для каждого параметра Meta.table и каждого поля модели,
+          строки массивов соответствуют найденным в БД записям
+        Записи, для которых в БД нет ни одного поля, исключаются; отсутствующие значения
+          числовых (float) полей заменяются на NaN, остальных - на None (массив объектов)
+    """
+    if numpy is None:
+        raise ImportError("RedisItem.filter(as_columns=True) requires numpy package: pip install numpy")
+    fields_count: int = len(schema.fields)
+    matrix: Any = numpy.empty(len(values), dtype=object)
+    matrix[:] = values
+    matrix = matrix.reshape(len(tables), fields_count)
+    present: Any = numpy.not_equal(matrix, None)
+    found_rows: Any = present.any(axis=1)
+    matrix, present = matrix[found_rows], present[found_rows]
+    found_tables: list[bytes] = [table for table, found in zip(tables, found_rows) if found]
+
+    columns: dict[str, Any] = {}
+    delimiter: bytes = KEYS_DELIMITER.encode()
+    table_parts: list[list[bytes]] = [table[schema.table_slice].split(delimiter) for table in found_tables]
+    for key, position in schema.table_keys.items():
+        columns[key] = numpy.char.decode(
+            numpy.array([parts[position] for parts in table_parts], dtype=bytes),
+            "utf-8",
+        )
+    for index, field in enumerate(schema.fields):
+        columns[field] = _build_column(
+            codec=schema.codecs[field],
+            column=matrix[:, index],
+            present=present[:, index],
+        )
+    return columns
+
+
+def _build_column(codec: Codec, column: Any, present: Any) -> Any:
+    """ Декодирование значений поля кодеком с заполнением отсутствующих значений """
+    if present.all():
+        return codec.decode_array(column.tolist())
+    values: Any = codec.decode_array(column[present].tolist())
+    result: Any
+    if values.dtype.kind == "f":
+        result = numpy.full(len(column), numpy.nan, dtype=values.dtype)
+    else:
+        result = numpy.full(len(column), None, dtype=object)
+    result[present] = values
+    return result
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import fnmatch
+import operator
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+from typing import NamedTuple
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# Префикс ключей вторичных индексов (ключи индексов не совпадают с паттернами поиска записей)
+INDEX_KEY_PREFIX = "__index__"
+# Префикс ключей реестров префиксов записей моделей
+REGISTRY_KEY_PREFIX = "__registry__"
+# Реестр, разделённый по значению первого параметра Meta.table (Meta.registry = "sharded")
+REGISTRY_SHARDED = "sharded"
+# Части ключей разделённого реестра: часть (set префиксов) и список частей (set значений)
+REGISTRY_SHARD_KEY = "shard"
+REGISTRY_SHARDS_KEY = "shards"
+# Разделитель частей ключа индекса и аргумента фильтра и оператора сравнения
+INDEX_KEY_DELIMITER = ":"
+PREDICATE_DELIMITER = "__"
+# Типы полей, индексируемых sorted set (значение поля - score); остальные - set для каждого значения
+NUMERIC_TYPES: tuple[type, ...] = (int, float, bool)
+# Операторы сравнения фильтра по индексируемым полям
+OPERATOR_EQ = "eq"
+OPERATOR_IN = "in"
+RANGE_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "lt": operator.lt,
+    "lte": operator.le,
+}
+
+
+class IndexPredicate(NamedTuple):
+    """ Условие фильтра по индексируемому полю, например, date_time__gte=1600000000 """
+    field: str
+    operator: str
+    value: Any
+
+    def match(self, value: Any) -> bool:
+        """ Проверка значения поля объекта """
+        if value is None:
+            return False
+        if self.operator == OPERATOR_IN:
+            return value in self.value
+        if self.operator == OPERATOR_EQ:
+            return value == self.value
+        return RANGE_OPERATORS[self.operator](value, self.value)
+
+    def mask(self, column: Any) -> Any:
+        """ Проверка значений колонки (массива NumPy) """
+        if self.operator == OPERATOR_IN:
+            return numpy.isin(column, list(self.value))
+        if self.operator == OPERATOR_EQ:
+            return column == self.value
+        return RANGE_OPERATORS[self.operator](column, self.value)
+
+
+def split_index_predicates(
+    kwargs: dict[str, Any],
+    indexes: dict[str, bool],
+    fields: Iterable[str],
+) -> tuple[list[IndexPredicate], dict[str, Any]]:
+    """
+        Разделение аргументов фильтра на условия по индексируемым полям и остальные аргументы
+          (параметры Meta.table); условие по неиндексируемому полю модели - ошибка
+    """
+    predicates: list[IndexPredicate] = []
+    other_kwargs: dict[str, Any] = {}
+    fields = set(fields)
+    for key, value in kwargs.items():
+        field, _, operator_name = key.partition(PREDICATE_DELIMITER)
+        if field not in fields:
+            other_kwargs[key] = value
+            continue
+        if field not in indexes:
+            raise ValueError(f"Field {field} is not indexed, add it to Meta.indexes to filter by it...")
+        operator_name = operator_name or OPERATOR_EQ
+        if operator_name not in (OPERATOR_EQ, OPERATOR_IN, *RANGE_OPERATORS):
+            raise ValueError(f"Unknown filter operator: {key}...")
+        if operator_name in RANGE_OPERATORS and not indexes[field]:
+            raise ValueError(f"Range filter {key} requires numeric field...")
+        predicates.append(IndexPredicate(field=field, operator=operator_name, value=value))
+    return predicates, other_kwargs
+
+
+def get_index_key(table: str, field: str) -> str:
+    """ Ключ sorted set индекса числового поля модели (Meta.table) """
+    return INDEX_KEY_DELIMITER.join([INDEX_KEY_PREFIX, table, field])
+
+
+def get_value_index_key(table: str, field: str, value: Any) -> str:
+    """ Ключ set индекса значения поля модели (Meta.table) """
+    return INDEX_KEY_DELIMITER.join([INDEX_KEY_PREFIX, table, field, str(value)])
+
+
+def get_indexed_values_key(table: str, field: str) -> str:
+    """
+        Ключ hash обратных записей индекса значений поля модели (Meta.table): префикс записи -
+          последнее индексированное значение (для удаления префикса из set прежнего значения)
+    """
+    return INDEX_KEY_DELIMITER.join([INDEX_KEY_PREFIX, table, field])
+
+
+def get_registry_key(table: str, shard: Optional[str] = None) -> str:
+    """ Ключ set реестра префиксов записей модели (Meta.table) или части разделённого реестра """
+    if shard is None:
+        return INDEX_KEY_DELIMITER.join([REGISTRY_KEY_PREFIX, table])
+    return INDEX_KEY_DELIMITER.join([REGISTRY_KEY_PREFIX, table, REGISTRY_SHARD_KEY, shard])
+
+
+def get_registry_shards_key(table: str) -> str:
+    """ Ключ set значений первого параметра (частей) разделённого реестра модели (Meta.table) """
+    return INDEX_KEY_DELIMITER.join([REGISTRY_KEY_PREFIX, table, REGISTRY_SHARDS_KEY])
+
+
+def get_score(value: Any) -> Any:
+    """ Значение числового поля для score sorted set """
+    return int(value) if isinstance(value, bool) else value
+
+
+def get_score_range(operator_name: str, value: Any) -> tuple[Any, Any]:
+    """ Границы ZRANGEBYSCORE для условия сравнения (равенства) числового поля """
+    score: Any = get_score(value)
+    return {
+        "gt": (f"({score}", "+inf"),
+        "gte": (score, "+inf"),
+        "lt": ("-inf", f"({score}"),
+        "lte": ("-inf", score),
+    }.get(operator_name, (score, score))
+
+
+def match_tables(tables: Iterable[bytes], patterns: list[str]) -> list[bytes]:
+    """ Префиксы записей, совпадающие хотя бы с одним из паттернов поиска (glob) """
+    return [
+        table for table in tables
+            if any(fnmatch.fnmatchcase(table.decode(), pattern) for pattern in patterns)
+    ]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import threading
+from time import monotonic
+from typing import Any
+from typing import Optional
+from typing import NamedTuple
+from collections import OrderedDict
+
+# Максимальное количество объектов в локальном кеше модели по умолчанию
+CACHE_MAX_ITEMS = 1024
+
+
+class CacheInfo(NamedTuple):
+    """ Статистика локального кеша модели """
+    hits: int
+    misses: int
+    size: int
+    max_items: int
+    ttl: Optional[float]
+
+
+class LocalCache:
+    """
+        Локальный (в памяти процесса) кеш объектов модели с вытеснением по LRU и TTL
+        Ключ кеша - префикс записи объекта (RedisItem._table)
+    """
+    hits: int
+    misses: int
+    max_items: int
+    ttl: Optional[float]
+    _items: OrderedDict[str, tuple[float, Any]]
+    _lock: threading.Lock
+
+    def __init__(self, max_items: int = CACHE_MAX_ITEMS, ttl: Optional[float] = None) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.max_items = max_items
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """ Получение объекта; просроченный объект удаляется и считается промахом """
+        with self._lock:
+            cached: Optional[tuple[float, Any]] = self._items.get(key)
+            if cached is None or (self.ttl is not None and monotonic() - cached[0] > self.ttl):
+                if cached is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, key: str, value: Any) -> None:
+        """ Добавление (обновление) объекта с вытеснением наиболее давно использованных """
+        with self._lock:
+            self._items[key] = (monotonic(), value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """ Удаление объекта из кеша """
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        """ Очистка кеша и статистики """
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._items),
+            max_items=self.max_items,
+            ttl=self.ttl,
+        )
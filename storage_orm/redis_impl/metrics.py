@@ -0,0 +1,384 @@
+from __future__ import annotations
+import bisect
+import logging
+import threading
+from time import time
+from time import perf_counter
+from collections import deque
+from contextvars import ContextVar
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Optional
+from typing import TypeVar
+
+# Границы интервалов гистограмм длительности по умолчанию, секунд
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.,
+)
+# Количество последних медленных операций, сохраняемых InMemoryCollector
+SLOW_OPERATIONS_COUNT = 100
+
+# Этапы операций
+PHASE_DISCOVER = "discover"  # Определение префиксов записей (ключей): SCAN, реестр, индексы
+PHASE_CACHE = "cache"  # Получение объектов из локального кеша
+PHASE_FETCH = "fetch"  # Получение значений (MGET, HMGET)
+PHASE_BUILD = "build"  # Декодирование значений и формирование объектов
+PHASE_ENCODE = "encode"  # Формирование данных записи объектов
+PHASE_WRITE = "write"  # Запись данных (pipeline)
+
+ItemT = TypeVar("ItemT")
+
+
+class OperationMetrics(NamedTuple):
+    """
+        Метрики одной операции ORM (аналог span OpenTelemetry: имя, время начала,
+          длительность и атрибуты)
+    """
+    operation: str  # Имя операции, например, "filter", "bulk_create"
+    model: str  # Имя модели (для операций RedisORM с объектами разных моделей - пустая строка)
+    start_time: float  # Время начала, секунд от эпохи (time.time())
+    duration: float  # Длительность, секунд
+    phases: dict[str, float]  # Длительность этапов, секунд
+    round_trips: int  # Количество сетевых запросов к Redis (команды и pipeline)
+    keys: int  # Количество затронутых ключей
+    bytes: int  # Объём данных ответов (чтение) или записываемых данных (запись), байт
+    error: Optional[BaseException]  # Исключение операции (None - операция выполнена)
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """ Атрибуты операции в виде плоского словаря (например, для атрибутов span) """
+        return {
+            "db.system": "redis",
+            "storage_orm.model": self.model,
+            "storage_orm.round_trips": self.round_trips,
+            "storage_orm.keys": self.keys,
+            "storage_orm.bytes": self.bytes,
+            **{f"storage_orm.phase.{phase}": duration for phase, duration in self.phases.items()},
+        }
+
+
+class MetricsHook:
+    """
+        Обработчик метрик операций: on_operation() вызывается после завершения каждой
+          операции в потоке операции, поэтому должен выполняться быстро
+        Исключения обработчика записываются в журнал и не влияют на операцию
+    """
+    def on_operation(self, metrics: OperationMetrics) -> None:
+        raise NotImplementedError
+
+
+class CallbackHook(MetricsHook):
+    """
+        Обработчик метрик - функция, например, для передачи span в OpenTelemetry:
+
+            def export_span(metrics: OperationMetrics) -> None:
+                start_time: int = int(metrics.start_time * 1e9)
+                span = tracer.start_span(f"storage_orm.{metrics.operation}", start_time=start_time)
+                span.set_attributes(metrics.attributes)
+                span.end(end_time=start_time + int(metrics.duration * 1e9))
+
+            RedisItem.add_metrics_hook(CallbackHook(export_span))
+    """
+    callback: Callable[[OperationMetrics], None]
+
+    def __init__(self, callback: Callable[[OperationMetrics], None]) -> None:
+        self.callback = callback
+
+    def on_operation(self, metrics: OperationMetrics) -> None:
+        self.callback(metrics)
+
+
+class Histogram:
+    """ Гистограмма значений с фиксированными границами интервалов (аналогично Prometheus) """
+    buckets: tuple[float, ...]
+    counts: list[int]
+    count: int
+    sum: float
+    max: float
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        # Последний интервал - значения больше последней границы
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.
+        self.max = 0.
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """ Оценка квантиля: верхняя граница интервала, содержащего квантиль (не больше max) """
+        if not self.count:
+            return 0.
+        rank: float = q * self.count
+        accumulated: int = 0
+        for bound, count in zip(self.buckets, self.counts):
+            accumulated += count
+            if accumulated >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class OperationStats:
+    """ Накопленная статистика операций одного вида (операция и модель) """
+    count: int
+    errors: int
+    round_trips: int
+    keys: int
+    bytes: int
+    latency: Histogram
+    phases: dict[str, Histogram]
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.round_trips = 0
+        self.keys = 0
+        self.bytes = 0
+        self.latency = Histogram()
+        self.phases = {}
+
+    def add(self, metrics: OperationMetrics) -> None:
+        self.count += 1
+        self.errors += metrics.error is not None
+        self.round_trips += metrics.round_trips
+        self.keys += metrics.keys
+        self.bytes += metrics.bytes
+        self.latency.observe(metrics.duration)
+        for phase, duration in metrics.phases.items():
+            histogram: Optional[Histogram] = self.phases.get(phase)
+            if histogram is None:
+                histogram = self.phases[phase] = Histogram()
+            histogram.observe(duration)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "round_trips": self.round_trips,
+            "keys": self.keys,
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+            "phases": {phase: histogram.as_dict() for phase, histogram in self.phases.items()},
+        }
+
+
+class InMemoryCollector(MetricsHook):
+    """
+        Сбор метрик в памяти процесса: гистограммы длительности операций и их этапов,
+          суммарные количества сетевых запросов, ключей и байт по операциям и моделям,
+          последние операции длительностью не меньше slow_threshold секунд
+    """
+    slow_threshold: Optional[float]
+    slow_operations: deque[OperationMetrics]
+    _stats: dict[tuple[str, str], OperationStats]
+    _lock: threading.Lock
+
+    def __init__(self, slow_threshold: Optional[float] = None, slow_count: int = SLOW_OPERATIONS_COUNT) -> None:
+        self.slow_threshold = slow_threshold
+        self.slow_operations = deque(maxlen=slow_count)
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def on_operation(self, metrics: OperationMetrics) -> None:
+        with self._lock:
+            key: tuple[str, str] = (metrics.operation, metrics.model)
+            stats: Optional[OperationStats] = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = OperationStats()
+            stats.add(metrics=metrics)
+            if self.slow_threshold is not None and metrics.duration >= self.slow_threshold:
+                self.slow_operations.append(metrics)
+
+    def get_stats(self, operation: str, model: str = "") -> Optional[OperationStats]:
+        """ Статистика операции модели (None - операции не выполнялись) """
+        return self._stats.get((operation, model))
+
+    def snapshot(self) -> dict[str, Any]:
+        """ Статистика всех операций: {"<операция>:<модель>": {...}} """
+        with self._lock:
+            return {
+                f"{operation}:{model}": stats.as_dict()
+                    for (operation, model), stats in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.slow_operations.clear()
+
+
+class OperationRecorder:
+    """ Сбор метрик выполняющейся операции (см. track()) """
+    __slots__ = ("hooks", "operation", "model", "phases", "round_trips", "keys", "bytes", "_start_time", "_start")
+    hooks: tuple[MetricsHook, ...]
+    operation: str
+    model: str
+    phases: dict[str, float]
+    round_trips: int
+    keys: int
+    bytes: int
+
+    def __init__(self, hooks: tuple[MetricsHook, ...], operation: str, model: str) -> None:
+        self.hooks = hooks
+        self.operation = operation
+        self.model = model
+        self.phases = {}
+        self.round_trips = 0
+        self.keys = 0
+        self.bytes = 0
+        self._start_time = time()
+        self._start = perf_counter()
+
+    def add_phase(self, phase: str, duration: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.) + duration
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        metrics: OperationMetrics = OperationMetrics(
+            operation=self.operation,
+            model=self.model,
+            start_time=self._start_time,
+            duration=perf_counter() - self._start,
+            phases=self.phases,
+            round_trips=self.round_trips,
+            keys=self.keys,
+            bytes=self.bytes,
+            error=error,
+        )
+        for hook in self.hooks:
+            try:
+                hook.on_operation(metrics)
+            except Exception as exception:
+                logging.exception(exception)
+
+
+# Операция текущего потока (задачи asyncio), метрики которой собираются
+_current_recorder: ContextVar[Optional[OperationRecorder]] = ContextVar("storage_orm_recorder", default=None)
+
+
+class _Track:
+    """ Контекст операции: сбор метрик операции и передача их обработчикам по завершении """
+    __slots__ = ("_recorder", "_token")
+
+    def __init__(self, recorder: OperationRecorder) -> None:
+        self._recorder = recorder
+
+    def __enter__(self) -> OperationRecorder:
+        self._token = _current_recorder.set(self._recorder)
+        return self._recorder
+
+    def __exit__(self, exc_type: Any, exc_value: Optional[BaseException], traceback: Any) -> None:
+        _current_recorder.reset(self._token)
+        self._recorder.finish(error=exc_value)
+
+
+class _Phase:
+    """ Контекст этапа операции: длительность добавляется к этапу текущей операции """
+    __slots__ = ("_recorder", "_phase", "_start")
+
+    def __init__(self, recorder: OperationRecorder, phase: str) -> None:
+        self._recorder = recorder
+        self._phase = phase
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *_) -> None:
+        self._recorder.add_phase(self._phase, perf_counter() - self._start)
+
+
+class _NullContext:
+    """ Контекст без действий: используется, если метрики не собираются """
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *_) -> None:
+        return None
+
+
+_NULL_CONTEXT = _NullContext()
+
+
+def track(hooks: tuple[MetricsHook, ...], operation: str, model: str = "") -> Any:
+    """
+        Контекст операции, например:
+
+            with track(hooks=cls._metrics_hooks, operation="filter", model=cls.__name__):
+                ...
+
+        Без обработчиков возвращается контекст без действий: метрики не собираются
+    """
+    if not hooks:
+        return _NULL_CONTEXT
+    return _Track(recorder=OperationRecorder(hooks=hooks, operation=operation, model=model))
+
+
+def phase(name: str) -> Any:
+    """ Контекст этапа текущей операции (без действий, если метрики не собираются) """
+    recorder: Optional[OperationRecorder] = _current_recorder.get()
+    if recorder is None:
+        return _NULL_CONTEXT
+    return _Phase(recorder=recorder, phase=name)
+
+
+def timed(items: Iterable[ItemT], name: str) -> Iterable[ItemT]:
+    """ Учёт времени формирования элементов (например, генератора) как этапа текущей операции """
+    recorder: Optional[OperationRecorder] = _current_recorder.get()
+    if recorder is None:
+        return items
+    return _timed_iter(items=items, recorder=recorder, name=name)
+
+
+def _timed_iter(items: Iterable[ItemT], recorder: OperationRecorder, name: str) -> Iterator[ItemT]:
+    iterator: Iterator[ItemT] = iter(items)
+    while True:
+        start: float = perf_counter()
+        try:
+            item: ItemT = next(iterator)
+        except StopIteration:
+            recorder.add_phase(name, perf_counter() - start)
+            return
+        recorder.add_phase(name, perf_counter() - start)
+        yield item
+
+
+def record(round_trips: int = 1, keys: int = 0, payload: Any = None, size: int = 0) -> None:
+    """
+        Учёт сетевых запросов текущей операции: количество запросов, ключей и объём
+          данных - size байт или объём значений ответа payload (вычисляется, только
+          если метрики собираются)
+    """
+    recorder: Optional[OperationRecorder] = _current_recorder.get()
+    if recorder is None:
+        return
+    recorder.round_trips += round_trips
+    recorder.keys += keys
+    recorder.bytes += size + (get_payload_size(payload) if payload is not None else 0)
+
+
+def get_payload_size(payload: Any) -> int:
+    """ Объём данных ответа Redis (значения bytes/str, в том числе во вложенных списках), байт """
+    if isinstance(payload, (bytes, str)):
+        return len(payload)
+    if isinstance(payload, (list, tuple, set)):
+        return sum(map(get_payload_size, payload))
+    return 0
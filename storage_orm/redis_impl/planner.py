@@ -0,0 +1,260 @@
+from __future__ import annotations
+import math
+import fnmatch
+import itertools
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from .schema import WILDCARD
+from .schema import KEYS_DELIMITER
+from .schema import ModelSchema
+from .indexes import match_tables
+
+# Суффикс аргумента фильтра со списком значений
+IN_PREFIX = "__in"
+# Максимальное количество паттернов поиска по умолчанию (каждый паттерн - отдельный проход SCAN)
+MAX_PATTERNS = 32
+# Символы glob-паттерна Redis (значения с ними - паттерны, а не точные значения)
+GLOB_CHARS = frozenset("*?[]\\")
+# Символы, которые не объединяются в класс символов ("[...]"): glob и специальные символы классов
+CLASS_UNSAFE_CHARS = GLOB_CHARS | frozenset("^-!")
+# Минимальная длина последовательности символов, записываемой диапазоном ("[0-9]")
+CLASS_RANGE_LENGTH = 3
+
+# Стратегии выполнения фильтра
+PLAN_EXACT = "exact"  # Префиксы записей формируются без поиска
+PLAN_PATTERNS = "patterns"  # Поиск по паттернам, совпадающим только с искомыми записями
+PLAN_SCAN = "scan"  # Поиск по расширенным паттернам с отбором префиксов записей на стороне клиента
+
+
+class QueryPlan:
+    """
+        План выборки по параметрам Meta.table:
+        - strategy: PLAN_EXACT, PLAN_PATTERNS или PLAN_SCAN
+        - tables: префиксы записей (PLAN_EXACT), иначе None
+        - patterns: паттерны префиксов записей для SCAN/SSCAN (PLAN_EXACT - префиксы записей)
+        - patterns_params: значения (glob) параметров каждого паттерна (отсутствует - WILDCARD)
+        - filters: проверки частей префикса записи на стороне клиента (PLAN_SCAN):
+          позиция части - точные значения и паттерны значений параметра
+        - cartesian_count: количество паттернов без объединения (декартово произведение __in)
+    """
+    __slots__ = ("strategy", "tables", "patterns", "patterns_params", "filters", "cartesian_count", "_schema")
+    strategy: str
+    tables: Optional[list[str]]
+    patterns: list[str]
+    patterns_params: list[dict[str, Any]]
+    filters: dict[int, tuple[frozenset[str], tuple[str, ...]]]
+    cartesian_count: int
+    _schema: ModelSchema
+
+    def __init__(
+        self,
+        schema: ModelSchema,
+        strategy: str,
+        tables: Optional[list[str]] = None,
+        patterns: Optional[list[str]] = None,
+        patterns_params: Optional[list[dict[str, Any]]] = None,
+        filters: Optional[dict[int, tuple[frozenset[str], tuple[str, ...]]]] = None,
+        cartesian_count: int = 1,
+    ) -> None:
+        self._schema = schema
+        self.strategy = strategy
+        self.tables = tables
+        self.patterns = patterns or []
+        self.patterns_params = patterns_params or []
+        self.filters = filters or {}
+        self.cartesian_count = cartesian_count
+
+    def match_table(self, table: str) -> bool:
+        """ Проверка префикса записи отборами плана (на стороне клиента) """
+        if not self.filters:
+            return True
+        parts: list[str] = self._schema.split_table(table)
+        for position, (values, value_patterns) in self.filters.items():
+            part: str = parts[position]
+            if part not in values and not any(fnmatch.fnmatchcase(part, pattern) for pattern in value_patterns):
+                return False
+        return True
+
+    def filter_keys(self, keys: list[bytes], with_fields: bool = False) -> list[bytes]:
+        """
+            Отбор найденных ключей отборами плана (без отборов - без изменений):
+              with_fields - ключи полей ("префикс.поле"), иначе ключи - префиксы записей
+        """
+        if not self.filters:
+            return keys
+        delimiter: bytes = KEYS_DELIMITER.encode()
+        return [
+            key for key in keys
+                if self.match_table((key.rsplit(delimiter, 1)[0] if with_fields else key).decode())
+        ]
+
+    def match_tables(self, tables: Iterable[bytes]) -> list[bytes]:
+        """ Префиксы записей, совпадающие с префиксами (паттернами и отборами) плана """
+        if self.tables is not None:
+            plan_tables: set[bytes] = {table.encode() for table in self.tables}
+            return [table for table in tables if table in plan_tables]
+        return self.filter_keys(keys=match_tables(tables=tables, patterns=self.patterns))
+
+
+def build_plan(schema: ModelSchema, kwargs: dict, max_patterns: int = MAX_PATTERNS) -> QueryPlan:
+    """
+        Выбор плана выборки по аргументам фильтра (параметрам Meta.table и спискам __in):
+        - все параметры определены точными значениями - префиксы записей без поиска;
+        - иначе - паттерны поиска: значения __in одной длины, различающиеся одним символом,
+          объединяются в класс символов ("1[0-9]"), паттерны которого совпадают только
+          с искомыми значениями (glob Redis не поддерживает перечисления "{a,b}",
+          поэтому остальные значения - отдельные паттерны);
+        - если паттернов больше max_patterns (каждый паттерн - отдельный проход SCAN по всей БД),
+          значения параметров с наибольшим количеством паттернов заменяются одним расширенным
+          паттерном, а найденные префиксы записей отбираются по значениям на стороне клиента
+    """
+    values: dict[str, list[Any]] = _get_params_values(kwargs=kwargs)
+    in_params: list[str] = [param for param in values if param in schema.placeholders]
+    cartesian_count: int = math.prod(len(values[param]) for param in in_params)
+    if not all(values.values()):
+        return QueryPlan(schema=schema, strategy=PLAN_EXACT, tables=[], cartesian_count=0)
+
+    if all(
+        param in values and not any(is_pattern(value) for value in values[param])
+            for param in schema.placeholders
+    ):
+        # Порядок префиксов записей - порядок значений __in (в порядке аргументов)
+        tables: dict[str, dict[str, Any]] = {}
+        for combination in itertools.product(*(values[param] for param in in_params)):
+            params: dict[str, Any] = dict(zip(in_params, combination))
+            tables.setdefault(schema.build_table(params), params)
+        return QueryPlan(
+            schema=schema,
+            strategy=PLAN_EXACT,
+            tables=list(tables),
+            patterns=list(tables),
+            patterns_params=list(tables.values()),
+            cartesian_count=cartesian_count,
+        )
+
+    # Варианты значений (glob) каждого параметра
+    alternatives: dict[str, list[Any]] = {
+        param: collapse_values(values=values[param]) if param in schema.table_keys else list(values[param])
+            for param in schema.placeholders
+                if param in values
+    }
+    filters: dict[int, tuple[frozenset[str], tuple[str, ...]]] = {}
+    while math.prod(map(len, alternatives.values())) > max_patterns:
+        # Расширяется параметр с наибольшим количеством вариантов (отдельная часть префикса записи)
+        candidates: list[str] = [
+            param for param, param_alternatives in alternatives.items()
+                if len(param_alternatives) > 1 and param in schema.table_keys
+        ]
+        if not candidates:
+            break
+        param: str = max(candidates, key=lambda candidate: len(alternatives[candidate]))
+        param_values: list[str] = [str(value) for value in values[param]]
+        alternatives[param] = [get_superset_pattern(values=param_values)]
+        filters[schema.table_keys[param]] = (
+            frozenset(value for value in param_values if not is_pattern(value)),
+            tuple(value for value in param_values if is_pattern(value)),
+        )
+
+    patterns_params: list[dict[str, Any]] = [
+        dict(zip(alternatives, combination))
+            for combination in itertools.product(*alternatives.values())
+    ]
+    patterns: list[str] = [
+        schema.get_filter_template(frozenset(params)).format(**params)
+            for params in patterns_params
+    ]
+    return QueryPlan(
+        schema=schema,
+        strategy=PLAN_SCAN if filters else PLAN_PATTERNS,
+        patterns=patterns,
+        patterns_params=patterns_params,
+        filters=filters,
+        cartesian_count=cartesian_count,
+    )
+
+
+def collapse_values(values: Iterable[Any]) -> list[str]:
+    """
+        Точное объединение значений в паттерны: значения одной длины, различающиеся
+          символом в одной позиции, объединяются в класс символов, например,
+          ["10", "11", "12", "20", "21", "22"] -> ["[12][0-2]"] (паттерны совпадают
+          только с исходными значениями); значения с glob и специальными символами
+          остаются без изменений
+    """
+    strings: list[str] = list(dict.fromkeys(str(value) for value in values))
+    collapsible: list[str] = [value for value in strings if value and not CLASS_UNSAFE_CHARS.intersection(value)]
+    others: list[str] = [value for value in strings if not value or CLASS_UNSAFE_CHARS.intersection(value)]
+    # Значение - произведение множеств символов каждой позиции
+    groups: list[tuple[frozenset[str], ...]] = [tuple(map(frozenset, value)) for value in collapsible]
+    max_length: int = max(map(len, groups), default=0)
+    changed: bool = True
+    while changed:
+        changed = False
+        for position in reversed(range(max_length)):
+            # Группы, совпадающие во всех позициях, кроме position, объединяются (объединение точное)
+            merged: dict[tuple, set[str]] = {}
+            for group in groups:
+                if position >= len(group):
+                    merged.setdefault((group, None, None), set())
+                    continue
+                merged.setdefault((len(group), group[:position], group[position + 1:]), set()).update(group[position])
+            if len(merged) < len(groups):
+                changed = True
+                groups = [
+                    key[0] if key[1] is None else (*key[1], frozenset(chars), *key[2])
+                        for key, chars in merged.items()
+                ]
+    return ["".join(map(_get_chars_pattern, group)) for group in groups] + others
+
+
+def get_superset_pattern(values: list[str]) -> str:
+    """
+        Один паттерн, совпадающий со всеми значениями (и, возможно, с другими):
+          класс символов каждой позиции для значений одной длины, иначе WILDCARD
+    """
+    lengths: set[int] = set(map(len, values))
+    if len(lengths) != 1 or any(CLASS_UNSAFE_CHARS.intersection(value) for value in values):
+        return WILDCARD
+    return "".join(_get_chars_pattern(frozenset(chars)) for chars in zip(*values))
+
+
+def _get_chars_pattern(chars: frozenset[str]) -> str:
+    """ Символ или класс символов, последовательности записываются диапазоном ("[0-9]") """
+    if len(chars) == 1:
+        return next(iter(chars))
+    codes: list[int] = sorted(map(ord, chars))
+    ranges: list[list[int]] = [[codes[0], codes[0]]]
+    for code in codes[1:]:
+        if code == ranges[-1][1] + 1 and chr(code).isalnum() == chr(ranges[-1][1]).isalnum():
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    parts: list[str] = []
+    for start, end in ranges:
+        if end - start + 1 >= CLASS_RANGE_LENGTH:
+            parts.append(f"{chr(start)}-{chr(end)}")
+        else:
+            parts.extend(map(chr, range(start, end + 1)))
+    return "[" + "".join(parts) + "]"
+
+
+def _get_params_values(kwargs: dict) -> dict[str, list[Any]]:
+    """
+        Значения параметров Meta.table из аргументов фильтра: для __in - список значений
+          без повторов, иначе - одно значение (значение без __in приоритетнее списка)
+    """
+    values: dict[str, list[Any]] = {}
+    for key, value in kwargs.items():
+        if key.endswith(IN_PREFIX):
+            values.setdefault(key[:-len(IN_PREFIX)], list(dict.fromkeys(value)))
+    for key, value in kwargs.items():
+        if not key.endswith(IN_PREFIX):
+            values[key] = [value]
+    return values
+
+
+def is_pattern(value: Any) -> bool:
+    """ Значение содержит символы glob-паттерна Redis (не определяет часть ключа однозначно) """
+    return not GLOB_CHARS.isdisjoint(str(value))
@@ -1,15 +1,66 @@
 from __future__ import annotations
-import re
+import abc
 import copy
+import math
+import fnmatch
 import redis
+import asyncio
+import logging
+import weakref
 import itertools
+import redis.asyncio
 from typing import Any
 from typing import cast
 from typing import Union
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
 from typing import Mapping
 from typing import Type
 from typing import TypeVar
 
+from .local_cache import CacheInfo
+from .local_cache import LocalCache
+from .codecs import Codec
+from .codecs import TextCodec
+from .codecs import pack_blob
+from .codecs import unpack_blob
+from .schema import ModelSchema
+from .columns import build_columns
+from .metrics import PHASE_BUILD
+from .metrics import PHASE_CACHE
+from .metrics import PHASE_DISCOVER
+from .metrics import PHASE_FETCH
+from .metrics import MetricsHook
+from .metrics import phase
+from .metrics import track
+from .metrics import record
+from .indexes import NUMERIC_TYPES
+from .indexes import OPERATOR_IN
+from .indexes import REGISTRY_SHARDED
+from .indexes import IndexPredicate
+from .indexes import get_score
+from .indexes import get_index_key
+from .indexes import get_indexed_values_key
+from .indexes import get_registry_key
+from .indexes import get_registry_shards_key
+from .indexes import get_score_range
+from .indexes import get_value_index_key
+from .indexes import split_index_predicates
+from .planner import MAX_PATTERNS
+from .planner import PLAN_EXACT
+from .planner import QueryPlan
+from .planner import build_plan
+from .planner import is_pattern
+from .scripts import FILTER_SCRIPT
+from .scripts import SCRIPT_NUMBER
+from .scripts import SCRIPT_STRING
+from .scripts import ScriptPredicate
+from .scripts import get_filter_script_args
+from .scripts import parse_filter_reply
+from .schema import WILDCARD
+from .schema import KEYS_DELIMITER
 from ..storage_item import StorageItem
 from ..operation_result import OperationResult
 from ..operation_result import OperationStatus
@@ -23,198 +74,1330 @@ _Key = Union[str, bytes]
 ResponseT = Any
 
 T = TypeVar('T', bound='RedisItem')
-IN_PREFIX = "__in"
-KEYS_DELIMITER = "."
+# Подсказка COUNT для SCAN по умолчанию (количество ключей, просматриваемых за одну итерацию)
+SCAN_COUNT = 1000
+# Количество объектов в одной порции потоковой выборки по умолчанию
+BATCH_SIZE = 1000
+# Максимальное количество ключей в одной команде MGET (команды объединяются в pipeline)
+MGET_CHUNK_SIZE = 5000
+# Максимальное количество одновременно выполняемых асинхронных запросов поиска ключей
+ASYNC_CONCURRENCY = 16
+# Варианты хранения объекта: отдельный ключ для каждого поля, один hash на объект
+#   или одно упакованное значение (blob) на объект
+STORAGE_KEYS = "keys"
+STORAGE_HASH = "hash"
+STORAGE_BLOB = "blob"
+# Кодек значений полей по умолчанию (текстовое представление)
+DEFAULT_CODEC = "text"
 
 
-class RedisItem(StorageItem):
+class _RedisItemMeta(abc.ABCMeta):
+    """
+        Метакласс моделей RedisItem: для моделей с Meta.compact = True формируются
+          __slots__ из параметров Meta.table и полей модели - экземпляры не содержат
+          __dict__, значения полей хранятся один раз, а префикс записи (_table)
+          и значения полей (_params) вычисляются при обращении
+    """
+
+    def __new__(mcls, name: str, bases: tuple, namespace: dict, **kwargs: Any) -> _RedisItemMeta:
+        meta: Any = namespace.get("Meta") or next(
+            (base.Meta for base in bases if hasattr(base, "Meta")),
+            None,
+        )
+        if getattr(meta, "compact", False) and "__slots__" not in namespace:
+            schema: ModelSchema = ModelSchema(
+                table=meta.table,
+                annotations=namespace.get("__annotations__", {}),
+                default_codec=DEFAULT_CODEC,
+                field_codecs={},
+            )
+            # Атрибуты, для которых слоты уже определены в базовых моделях, повторно не добавляются
+            inherited_slots: set[str] = {
+                slot
+                    for base in bases
+                        for base_class in base.__mro__
+                            for slot in base_class.__dict__.get("__slots__", ())
+            }
+            namespace["__slots__"] = tuple(
+                attribute
+                    for attribute in (*schema.attributes, "_dirty", "_replaced")
+                        if attribute not in inherited_slots
+            )
+            namespace["_table"] = property(_get_compact_table)
+            namespace["_params"] = property(_get_compact_params)
+            namespace["using"] = _CompactUsing()
+        return super().__new__(mcls, name, bases, namespace, **kwargs)
+
+
+def _get_compact_table(self: RedisItem) -> str:
+    """ Префикс записи компактного объекта (формируется из значений параметров Meta.table) """
+    return self._schema.build_table({key: getattr(self, key) for key in self._schema.placeholders})
+
+
+def _get_compact_params(self: RedisItem) -> dict[str, Any]:
+    """ Значения полей компактного объекта """
+    return {key: getattr(self, key, None) for key in self._schema.fields}
+
+
+class _CompactUsing:
+    """
+        using() компактной модели: экземпляры не содержат __dict__, поэтому метод
+          экземпляра (instance_using) выбирается во время обращения, а не в __init__
+    """
+
+    def __get__(self, instance: Optional[RedisItem], owner: Type[RedisItem]) -> Any:
+        if instance is None:
+            return RedisItem.__dict__["using"].__get__(None, owner)
+        return instance.instance_using
+
+
+class RedisItemList(list):
+    """
+        Результат выборки filter(): список объектов с групповыми операциями, например:
+
+            StorageItem.filter(subsystem_id=10).delete()
+    """
+
+    def delete(self) -> OperationResult:
+        """ Удаление объектов выборки одним pipeline (см. RedisItem.delete) """
+        if not self:
+            return OperationResult(status=OperationStatus.success, message="deleted=0")
+        db_instance: Optional[redis.Redis] = self[0]._db_instance
+        if not db_instance:
+            raise Exception("Redis database not connected...")
+        try:
+            deleted_count: int = RedisItem._delete_objects(db_instance=db_instance, objects=self)
+            return OperationResult(status=OperationStatus.success, message=f"deleted={deleted_count}")
+        except Exception as exception:
+            logging.exception(exception)
+            return OperationResult(status=OperationStatus.failed, message=str(exception))
+
+
+class RedisItem(StorageItem, metaclass=_RedisItemMeta):
+    __slots__ = ()
     _table: str
     _table_keys: dict[str, int]
+    _scan_count: int = SCAN_COUNT
     _params: Mapping[_Key, _Value]
     _db_instance: Union[redis.Redis, None] = None
+    _async_db_instance: Union[redis.asyncio.Redis, None] = None
+    _cache_options: Optional[dict] = None
+    _caches: Optional[weakref.WeakKeyDictionary] = None
+    _storage: str = STORAGE_KEYS
+    _codecs: dict[str, Codec] = {}
+    _schema: ModelSchema
+    _compact: bool = False
+    _indexes: dict[str, bool] = {}
+    _registry: Union[bool, str] = False
+    _ttl: Optional[float] = None
+    _metrics_hooks: tuple[MetricsHook, ...] = ()
+    _max_patterns: int = MAX_PATTERNS
+    _is_using_copy: bool = False
 
     class Meta:
         table = ""  # Pattern имени записи, например, "subsystem.{subsystem_id}.tag.{tag_id}"
+        scan_count = SCAN_COUNT  # Подсказка COUNT для SCAN во время поиска ключей
+        max_patterns = MAX_PATTERNS  # Максимальное количество паттернов поиска (проходов SCAN) одного фильтра
+        cache = None  # Параметры локального кеша, например, {"max_items": 1000, "ttl": 5.0}
+        storage = STORAGE_KEYS  # Вариант хранения: STORAGE_KEYS ("keys"), STORAGE_HASH ("hash"), STORAGE_BLOB ("blob")
+        codec = DEFAULT_CODEC  # Кодек значений полей модели: "text", "struct", "msgpack" или экземпляр Codec
+        codecs: dict = {}  # Кодеки отдельных полей, например, {"any_value": "struct"}
+        compact = False  # Компактные экземпляры на основе __slots__ (для больших выборок)
+        indexes: list = []  # Индексируемые поля для фильтра по значениям, например, ["date_time"]
+        registry = False  # Реестр префиксов записей вместо SCAN по всей БД: True или "sharded"
+        ttl = None  # Время жизни записей объектов, секунд (None - без ограничения)
+        hash_tag = False  # Префикс записи в скобках hash tag ("{...}") - ключи записи в одном слоте кластера
 
     def __init_subclass__(cls) -> None:
-        cls._table_keys = {
-            index.replace("{", "").replace("}", ""): key
-                for key, index in enumerate(cls.Meta.table.split(KEYS_DELIMITER))
-                    if index.startswith("{") and index.endswith("}")
-        }
+        if cls.__dict__.get("_is_using_copy"):
+            # Копия класса using(): схема, кеш и параметры Meta исходной модели используются без повторной компиляции
+            return
+        cls._compile_schema()
+        cls._scan_count = getattr(cls.Meta, "scan_count", SCAN_COUNT)
+        cls._max_patterns = getattr(cls.Meta, "max_patterns", MAX_PATTERNS)
+        if cls._max_patterns < 1:
+            raise ValueError(f"{cls.__name__}.Meta.max_patterns must be positive...")
+        cls._compact = getattr(cls.Meta, "compact", False)
+        cls._cache_options = getattr(cls.Meta, "cache", None) or None
+        # Локальные кеши модели по подключениям: объекты разных БД кешируются раздельно
+        cls._caches = weakref.WeakKeyDictionary() if cls._cache_options else None
+        cls._storage = getattr(cls.Meta, "storage", STORAGE_KEYS)
+        if cls._storage not in (STORAGE_KEYS, STORAGE_HASH, STORAGE_BLOB):
+            raise ValueError(f"{cls.__name__}.Meta.storage has unknown value: {cls._storage}...")
+        # Индексируемые поля: True - числовое поле (sorted set), False - set для каждого значения
+        cls._indexes = {}
+        for field in getattr(cls.Meta, "indexes", []):
+            if field not in cls.__annotations__:
+                raise ValueError(f"{cls.__name__}.Meta.indexes contains unknown field: {field}...")
+            cls._indexes[field] = cls.__annotations__[field] in NUMERIC_TYPES
+        cls._registry = getattr(cls.Meta, "registry", False)
+        if cls._registry not in (False, True, REGISTRY_SHARDED):
+            raise ValueError(f"{cls.__name__}.Meta.registry has unknown value: {cls._registry}...")
+        if cls._registry == REGISTRY_SHARDED and (
+            not cls._schema.placeholders or cls._schema.placeholders[0] not in cls._schema.table_keys
+        ):
+            raise ValueError(
+                f"{cls.__name__}.Meta.registry = \"{REGISTRY_SHARDED}\" requires "
+                f"the first Meta.table parameter as a separate part of the table..."
+            )
+        cls._ttl = getattr(cls.Meta, "ttl", None)
+        if cls._ttl is not None and cls._ttl <= 0:
+            raise ValueError(f"{cls.__name__}.Meta.ttl must be positive...")
+        if cls._ttl is not None and (cls._registry or cls._indexes):
+            # Записи реестра и индексов не истекают вместе с записями объектов
+            raise ValueError(f"{cls.__name__}.Meta.ttl is not supported with Meta.registry or Meta.indexes...")
 
     @classmethod
-    def _make_kwargs_from_objects(cls: Type[T], objects: list[T]) -> dict:
+    def _compile_schema(cls: Type[T]) -> None:
         """
-            Конкатенация атрибутов объектов и их подготовка для
-                использования в качестве фильтров
+            Компиляция схемы модели (шаблоны ключей, поля, кодеки) во время объявления модели,
+              чтобы не повторять эти вычисления при создании и получении каждого объекта
         """
-        result_kwargs: dict = {}
-        for obj in objects:
-            for key, position in obj._table_keys.items():
-                value: str = obj._table.split(KEYS_DELIMITER)[position]
-                if key in result_kwargs:
-                    result_kwargs[key] += str(value)
-                else:
-                    result_kwargs[key] = str(value)
-
-        for key in result_kwargs.keys():
-            result_kwargs[key] = f"[{result_kwargs[key]}]"
-
-        print(f"{result_kwargs=}")
-
-        return result_kwargs
+        cls._schema = ModelSchema(
+            table=cls.Meta.table,
+            annotations=cls.__annotations__,
+            default_codec=getattr(cls.Meta, "codec", DEFAULT_CODEC),
+            field_codecs=getattr(cls.Meta, "codecs", {}),
+            hash_tag=getattr(cls.Meta, "hash_tag", False),
+        )
+        cls._table_keys = cls._schema.table_keys
+        cls._codecs = cls._schema.codecs
 
     def __init__(self, **kwargs) -> None:
+        schema: ModelSchema = self._schema
+        if self._compact:
+            # Проверка наличия всех параметров Meta.table (аналогично формированию _table)
+            schema.build_table(kwargs)
+            # Значения хранятся только в __slots__, _table и _params вычисляются при обращении
+            for key, value in kwargs.items():
+                object.__setattr__(self, key, value)
+            return
         # Формирование полей модели из переданных дочернему классу аргументов
-        [self.__dict__.__setitem__(key, value) for key, value in kwargs.items()]
+        #   (напрямую в __dict__, без отслеживания изменений в __setattr__)
+        attributes: dict[str, Any] = self.__dict__
+        attributes.update(kwargs)
         # Формирование изолированной среды с данными класса для дальнейшей работы с БД
-        self._table = self.__class__.Meta.table.format(**kwargs)
-        self._params = {
-            key: kwargs.get(key, None)
-                for key in self.__class__.__annotations__
-        }
+        attributes["_table"] = schema.build_table(kwargs)
+        attributes["_params"] = {key: kwargs.get(key) for key in schema.fields}
         # Перегрузка методов для экземпляра класса
-        self.using = self.instance_using  # type: ignore
+        attributes["using"] = self.instance_using
 
     def __getattr__(self, attr_name: str):
         return object.__getattribute__(self, attr_name)
 
+    def __copy__(self: T) -> T:
+        """ Копия объекта: значения копируются без отметки полей изменёнными (см. __setattr__) """
+        return self._copy_as(model=self.__class__)
+
+    def _copy_as(self: T, model: Type[T]) -> T:
+        """ Копия объекта с классом model (класс объекта или его копия using()) и признаками изменения полей """
+        copied_instance: T = object.__new__(model)
+        if not self._compact:
+            copied_instance.__dict__.update(self.__dict__)
+            return copied_instance
+        for attribute in (*self._schema.attributes, "_dirty", "_replaced"):
+            if hasattr(self, attribute):
+                object.__setattr__(copied_instance, attribute, getattr(self, attribute))
+        return copied_instance
+
+    def __setattr__(self, attr_name: str, value: Any) -> None:
+        """
+            Присваивание значения поля модели отмечает поле изменённым (dirty_fields)
+            Для полей с индексом значений (Meta.indexes) запоминается значение до первого
+              изменения - при записи префикс записи удаляется из индекса прежнего значения
+            _params и набор изменённых полей заменяются новыми объектами, а не изменяются:
+              копии объекта (copy.copy, локальный кеш) не разделяют изменения
+        """
+        if attr_name not in self._schema.codecs or (not self._compact and "_params" not in self.__dict__):
+            # Присваивание атрибута, не являющегося полем, или до формирования объекта в __init__
+            object.__setattr__(self, attr_name, value)
+            return
+        previous_value: Any = getattr(self, attr_name, None)
+        object.__setattr__(self, attr_name, value)
+        if not self._compact:
+            object.__setattr__(self, "_params", {**self.__dict__["_params"], attr_name: value})
+        dirty: frozenset[str] = self.dirty_fields
+        if self._indexes.get(attr_name) is False and attr_name not in dirty:
+            object.__setattr__(self, "_replaced", {**self._replaced_values, attr_name: previous_value})
+        object.__setattr__(self, "_dirty", dirty | {attr_name})
+
     @classmethod
     def _set_global_instance(cls: Type[T], db_instance: redis.Redis) -> None:
         """ Установка глобальной ссылки на БД во время первого подключения """
         cls._db_instance = db_instance
 
+    @classmethod
+    def _set_global_async_instance(cls: Type[T], db_instance: redis.asyncio.Redis) -> None:
+        """ Установка глобальной ссылки на БД (asyncio) во время первого подключения """
+        cls._async_db_instance = db_instance
+
+    @classmethod
+    def add_metrics_hook(cls: Type[T], hook: MetricsHook) -> None:
+        """
+            Подключение обработчика метрик операций (InMemoryCollector, CallbackHook и т.п.):
+
+                RedisItem.add_metrics_hook(collector)  # Все модели и операции RedisORM
+                ExampleItem.add_metrics_hook(collector)  # Модель ExampleItem и её наследники
+
+            Без обработчиков метрики не собираются
+        """
+        cls._update_metrics_hooks(update=lambda hooks: (*hooks, hook))
+
+    @classmethod
+    def remove_metrics_hook(cls: Type[T], hook: MetricsHook) -> None:
+        """ Отключение обработчика метрик модели (и её наследников) """
+        cls._update_metrics_hooks(update=lambda hooks: tuple(item for item in hooks if item is not hook))
+
+    @classmethod
+    def _update_metrics_hooks(
+        cls: Type[T],
+        update: Callable[[tuple[MetricsHook, ...]], tuple[MetricsHook, ...]],
+    ) -> None:
+        """
+            Изменение обработчиков метрик модели и всех её наследников: обработчики хранятся
+              в каждой модели, чтобы операции не объединяли обработчики иерархии при вызове
+        """
+        models: list[type] = [cls]
+        for model in models:
+            models.extend(model.__subclasses__())
+        # Новые значения вычисляются до изменения (наследники могут использовать значение родителя)
+        metrics_hooks: dict[type, tuple[MetricsHook, ...]] = {
+            model: update(model._metrics_hooks) for model in dict.fromkeys(models)
+        }
+        for model, hooks in metrics_hooks.items():
+            model._metrics_hooks = hooks
+
     @classmethod
     def get(cls: Type[T], _items: list[T] = None, **kwargs) -> T:
         """
             Получение одного объекта по выбранному фильтру
 
                 StorageItem.get(subsystem_id=10, tag_id=55)
+
+            Если переданы значения всех параметров Meta.table, ключи полей формируются
+              без поиска и значения запрашиваются одной командой MGET
         """
-        result_list: list[T] = cls.filter(_items=_items, kwargs=kwargs)
+        result_list: list[T] = cls.filter(_items=_items, **kwargs)
         if not result_list:
-            raise NotFoundException(f"{T} item not found...")
+            raise NotFoundException(f"{cls.__name__} item not found...")
         if len(result_list) > 1:
-            raise MoreThanOneFoundException(f"{T} multiple items found...")
+            raise MoreThanOneFoundException(f"{cls.__name__} multiple items found...")
 
         return result_list[0]
 
     @classmethod
-    def filter(cls: Type[T], _items: list[T] = None, **kwargs) -> list[T]:
+    def filter(
+        cls: Type[T],
+        _items: list[T] = None,
+        scan_count: Optional[int] = None,
+        as_columns: bool = False,
+        server_side: bool = False,
+        **kwargs,
+    ) -> Union[RedisItemList, dict[str, Any]]:
         """
             Получение объектов по фильтру переданных аргументов, например:
 
                 StorageItem.get(subsystem_id=10, tag_id=55)
                 StorageItem.get(subsystem_id__in=[10, 47], tag_id=55)
+
+            Поиск ключей выполняется инкрементально (SCAN), подсказка COUNT
+              берётся из Meta.scan_count или из аргумента scan_count
+
+            _items - получение объектов, префиксы записей которых совпадают с префиксами
+              переданных объектов (ключи формируются без поиска, аргументы не используются):
+
+                StorageItem.filter(_items=[item1, item2])
+
+            Для моделей с Meta.registry паттерны ищутся в реестре префиксов записей модели
+              (SSCAN), а не SCAN по всей БД
+
+            Условия по полям из Meta.indexes (равенство, __in, __gt, __gte, __lt, __lte)
+              определяют записи по индексам (ZRANGEBYSCORE, SMEMBERS) без поиска ключей:
+
+                StorageItem.filter(subsystem_id=10, date_time__gte=1600000000, date_time__lt=1600003600)
+
+            as_columns=True - результат в виде колонок без формирования объектов:
+              словарь массивов NumPy по параметрам Meta.table и полям модели
+
+                columns: dict = StorageItem.filter(subsystem_id=10, as_columns=True)
+                columns["any_value"].mean()
+
+            server_side=True - поиск ключей, получение значений и отбор по условиям на полях
+              (любых полях модели, без Meta.indexes) выполняются на сервере одним Lua-скриптом
+              (см. _filter_server_side): ключи не передаются клиенту и обратно в MGET
+
+                StorageItem.filter(subsystem_id=10, any_value__gte=5, server_side=True)
+
+            Результат - список объектов (RedisItemList) с групповым удалением:
+
+                StorageItem.filter(subsystem_id=10).delete()
         """
         if not cls._db_instance:
             raise Exception("Redis database not connected...")
         if not len(kwargs) and not _items:
             raise Exception(f"{cls.__name__}.get() has empty filter. OOM possible.")
-        # Формирование списка фильтров для возможности поиска входящих в список
-        filters_list: list[str] = cls._get_filters_by_kwargs(kwargs=kwargs)
-        result: list[T] = []
-        for filter in filters_list:
-            keys: list[bytes] = cls._db_instance.keys(pattern=filter)
-            values: list[bytes] = cast(list[bytes], cls._db_instance.mget(keys))
-            result += cls._objects_from_db_items(items=dict(zip(keys, values)))
+        if server_side and as_columns:
+            raise ValueError(f"{cls.__name__}.filter() does not support as_columns with server_side...")
+        if server_side and not hasattr(cls._db_instance, "evalsha"):
+            raise Exception(f"{cls.__name__}.filter(server_side=True) is not supported for shards...")
+        with track(hooks=cls._metrics_hooks, operation="filter", model=cls.__name__):
+            if server_side:
+                return cls._filter_server_side(_items=_items, scan_count=scan_count, kwargs=kwargs)
+            return cls._filter(_items=_items, scan_count=scan_count, as_columns=as_columns, kwargs=kwargs)
+
+    @classmethod
+    def _filter(
+        cls: Type[T],
+        _items: Optional[list[T]],
+        scan_count: Optional[int],
+        as_columns: bool,
+        kwargs: dict,
+    ) -> Union[RedisItemList, dict[str, Any]]:
+        """ Выполнение filter() по этапам: поиск префиксов записей, получение значений, формирование объектов """
+        predicates: list[IndexPredicate]
+        # Если аргументы (объекты, индексы) однозначно определяют записи - ключи формируются без поиска
+        tables: Optional[list[str]]
+        with phase(PHASE_DISCOVER):
+            predicates, kwargs = cls._split_index_predicates(kwargs=kwargs)
+            plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+            if _items:
+                tables = list(dict.fromkeys(item._table for item in _items))
+            elif predicates:
+                tables = cls._get_tables_by_indexes(predicates=predicates, plan=plan)
+            else:
+                tables = plan.tables
+                if tables is None and cls._registry:
+                    tables = cls._get_tables_by_registry(plan=plan, scan_count=scan_count)
+        if as_columns:
+            return cls._get_columns(tables=tables, plan=plan, scan_count=scan_count, predicates=predicates)
+        cached_objects: list[T] = []
+        items: dict[bytes, bytes]
+        if tables is not None:
+            # Объекты из локального кеша не запрашиваются из БД
+            with phase(PHASE_CACHE):
+                cached_objects, tables = cls._get_cached_objects(tables=tables, db_instance=cls._db_instance)
+            with phase(PHASE_FETCH):
+                items = cls._get_db_items_by_tables(tables=[table.encode() for table in tables])
+        else:
+            with phase(PHASE_DISCOVER):
+                keys: list[bytes] = cls._scan_keys_by_plan(plan=plan, count=scan_count)
+            with phase(PHASE_FETCH):
+                # При хранении в hash (blob) найденные ключи являются префиксами записей
+                if cls._storage == STORAGE_KEYS:
+                    items = cls._get_db_items(keys=keys)
+                else:
+                    items = cls._get_db_items_by_tables(tables=keys)
 
-        return result
+        with phase(PHASE_BUILD):
+            objects: list[T] = cls._objects_from_db_items(items=items)
+            cls._put_to_cache(objects=objects, db_instance=cls._db_instance)
+            return RedisItemList(cls._match_predicates(objects=cached_objects + objects, predicates=predicates))
 
     @classmethod
-    def _objects_from_db_items(cls: Type[T], items: dict[bytes, bytes]) -> list[T]:
-        """ Формирование cls(RedisItem)-объектов из данных базы """
-        # Подготовка базовых данных для формирования объектов из ключей
-        #   (уникальные ключи, без имён полей)
-        tables: set[str] = {
-            str(key).rsplit(KEYS_DELIMITER, 1)[0]
-                for key in items.keys()
-        }
-        result_items: list[T] = []
-        for table in tables:
-            # Отбор полей с префиксом текущей table
-            fields_src: list[bytes] = list(
-                filter(lambda item: str(item).startswith(table), items)
+    def _filter_server_side(
+        cls: Type[T],
+        _items: Optional[list[T]],
+        scan_count: Optional[int],
+        kwargs: dict,
+    ) -> RedisItemList:
+        """
+            Выполнение filter() на сервере: префиксы записей (SCAN MATCH по паттернам плана выборки,
+              если префиксы не определены аргументами, объектами или реестром), значения полей
+              и отбор по условиям выполняются скриптом FILTER_SCRIPT за один сетевой запрос
+            Условия по полям с текстовым кодеком (числа, строки) проверяются скриптом,
+              все условия повторно проверяются по полученным объектам
+            Скрипт блокирует сервер на время выполнения: для больших выборок - iter_filter()
+        """
+        with phase(PHASE_DISCOVER):
+            predicates, kwargs = split_index_predicates(
+                kwargs=kwargs,
+                indexes={field: cls.__annotations__[field] in NUMERIC_TYPES for field in cls._schema.fields},
+                fields=cls._schema.fields,
             )
-            fields: dict[str, Any] = {}
-            for field in fields_src:
-                # Формирование атрибутов объекта из присутствующих полей
-                key: str = field.decode().rsplit(KEYS_DELIMITER, 1)[1]
-                # Приведение типа к соответствующему полю cls
-                if cls.__annotations__[key] is str:
-                    fields[key] = items[field].decode()
-                else:
-                    fields[key] = cls.__annotations__[key](items[field])
+            plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+            tables: Optional[list[str]] = list(dict.fromkeys(item._table for item in _items)) if _items else plan.tables
+            if tables is None and cls._registry:
+                tables = cls._get_tables_by_registry(plan=plan, scan_count=scan_count)
+        cached_objects: list[T] = []
+        if tables is not None:
+            with phase(PHASE_CACHE):
+                cached_objects, tables = cls._get_cached_objects(tables=tables, db_instance=cls._db_instance)
+        items: dict[bytes, bytes] = {}
+        if tables is None or tables:
+            with phase(PHASE_FETCH):
+                reply: list[bytes] = FILTER_SCRIPT(client=cls._db_instance, args=get_filter_script_args(  # type: ignore
+                    storage=cls._storage,
+                    count=scan_count or cls._scan_count,
+                    fields=cls._schema.fields,
+                    predicates=cls._get_script_predicates(predicates=predicates),
+                    patterns=cls._get_filters_by_plan(plan=plan),
+                    tables=tables,
+                ))
+                record(keys=len(tables or ()), payload=reply)
+                items = parse_filter_reply(reply=reply)
+        with phase(PHASE_BUILD):
+            if tables is None:
+                # Отбор на стороне клиента по плану выборки (PLAN_SCAN)
+                keys: list[bytes] = plan.filter_keys(keys=list(items), with_fields=cls._storage != STORAGE_BLOB)
+                items = {key: items[key] for key in keys}
+            if cls._storage == STORAGE_BLOB:
+                items = cls._get_fields_from_blobs(blobs=items)
+            objects: list[T] = cls._objects_from_db_items(items=items)
+            cls._put_to_cache(objects=objects, db_instance=cls._db_instance)
+            return RedisItemList(cls._match_predicates(objects=cached_objects + objects, predicates=predicates))
 
-            # Формирование Meta из table класса и префикса полученных данных
-            table_args: dict = {}
-            src_values: list[str] = table.split('.')
-            for key, position in cls._table_keys.items():
-                table_args[key] = src_values[position]
+    @classmethod
+    def _get_script_predicates(cls: Type[T], predicates: list[IndexPredicate]) -> list[ScriptPredicate]:
+        """
+            Условия, проверяемые скриптом выборки: поля с текстовым кодеком (значение в БД -
+              текстовое представление) типов int, float и str; для blob условия не проверяются
+        """
+        if cls._storage == STORAGE_BLOB:
+            return []
+        fields: tuple[str, ...] = cls._schema.fields
+        script_predicates: list[ScriptPredicate] = []
+        for predicate in predicates:
+            codec: Codec = cls._schema.codecs[predicate.field]
+            if not isinstance(codec, TextCodec) or codec.field_type not in (int, float, str):
+                continue
+            values: Iterable[Any] = predicate.value if predicate.operator == OPERATOR_IN else [predicate.value]
+            script_predicates.append(ScriptPredicate(
+                field_index=fields.index(predicate.field) + 1,
+                kind=SCRIPT_STRING if codec.field_type is str else SCRIPT_NUMBER,
+                operator=predicate.operator,
+                values=tuple(map(str, values)),
+            ))
+        return script_predicates
 
-            result_items.append(cls(**(fields | table_args)))
+    @classmethod
+    def _split_index_predicates(cls: Type[T], kwargs: dict) -> tuple[list[IndexPredicate], dict]:
+        """ Разделение аргументов фильтра на условия по индексируемым полям и параметры Meta.table """
+        if not cls._indexes:
+            return [], kwargs
+        return split_index_predicates(kwargs=kwargs, indexes=cls._indexes, fields=cls._schema.fields)
 
-        return result_items
+    @classmethod
+    def _get_tables_by_indexes(cls: Type[T], predicates: list[IndexPredicate], plan: QueryPlan) -> list[str]:
+        """ Префиксы записей, удовлетворяющих условиям по индексам, за один сетевой запрос """
+        pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+        commands_counts: list[int] = cls._queue_index_queries(pipe=pipe, predicates=predicates)
+        replies: list[Any] = pipe.execute()
+        record(keys=sum(commands_counts), payload=replies)
+        return cls._get_tables_from_index_replies(
+            commands_counts=commands_counts,
+            replies=replies,
+            plan=plan,
+        )
+
+    @classmethod
+    def _queue_index_queries(
+        cls: Type[T],
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        predicates: list[IndexPredicate],
+    ) -> list[int]:
+        """
+            Добавление в pipeline команд получения префиксов записей по условиям: ZRANGEBYSCORE
+              для числовых полей, SMEMBERS для остальных (для каждого значения __in)
+            Результат - количество команд каждого условия
+        """
+        commands_counts: list[int] = []
+        for predicate in predicates:
+            values: list[Any] = list(predicate.value) if predicate.operator == OPERATOR_IN else [predicate.value]
+            for value in values:
+                if cls._indexes[predicate.field]:
+                    pipe.zrangebyscore(
+                        get_index_key(table=cls.Meta.table, field=predicate.field),
+                        *get_score_range(operator_name=predicate.operator, value=value),
+                    )
+                else:
+                    pipe.smembers(get_value_index_key(table=cls.Meta.table, field=predicate.field, value=value))
+            commands_counts.append(len(values))
+        return commands_counts
+
+    @classmethod
+    def _get_tables_from_index_replies(
+        cls: Type[T],
+        commands_counts: list[int],
+        replies: list[Iterable[bytes]],
+        plan: Optional[QueryPlan] = None,
+    ) -> list[str]:
+        """
+            Пересечение префиксов записей всех условий (для __in - объединение значений)
+              с отбором по плану выборки параметров Meta.table
+        """
+        tables: Optional[set[bytes]] = None
+        offset: int = 0
+        for commands_count in commands_counts:
+            predicate_tables: set[bytes] = set().union(*replies[offset:offset + commands_count])
+            offset += commands_count
+            tables = predicate_tables if tables is None else tables & predicate_tables
+        found_tables: list[bytes] = sorted(tables or ())
+        if plan is not None:
+            found_tables = plan.match_tables(tables=found_tables)
+        return [table.decode() for table in found_tables]
 
     @staticmethod
-    def _get_list_of_prepared_kwargs(kwargs: dict) -> list[dict]:
-        """
-            Подготовка списка фильтров из словарей:
-                - исходный словарь разделить:
-                    - базовый (без списков в значениях)
-                    - расширенный (со списками в значениях)
-                - получить множество комбинаций расширенного словаря
-                - скомбинировать
-        """
-        basic_kwargs: dict = {}
-        extend_kwargs: dict = {}
-        # Разделение на словари "с" и "без" списков в значениях
-        for key, value in kwargs.items():
-            if not key.endswith(IN_PREFIX):
-                basic_kwargs[key] = value
+    def _match_predicates(objects: list[T], predicates: list[IndexPredicate]) -> list[T]:
+        """
+            Отбор объектов, удовлетворяющих условиям по индексируемым полям
+            Индексы не очищаются при изменении значения поля, поэтому условия
+              проверяются по значениям полученных объектов
+        """
+        if not predicates:
+            return objects
+        return [
+            obj for obj in objects
+                if all(predicate.match(obj._params.get(predicate.field)) for predicate in predicates)
+        ]
+
+    def _queue_index_updates(
+        self,
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        fields: Optional[Iterable[str]] = None,
+        cleared_fields: Iterable[str] = (),
+    ) -> None:
+        """
+            Добавление в pipeline команд обновления индексов полей объекта (fields, None - всех) (ZADD, SADD)
+              и обратных записей индексов значений (HSET, см. get_indexed_values_key); при изменении значения
+              поля с индексом значений - удаление из индекса прежнего значения (SREM), для удаляемых полей
+              (cleared_fields) - также обратной записи (HDEL)
+        """
+        replaced: Mapping[str, Any] = self._replaced_values
+        for field, is_numeric in self._indexes.items():
+            if fields is not None and field not in fields:
+                continue
+            value: Any = self._params.get(field)
+            if is_numeric:
+                if value is not None:
+                    pipe.zadd(get_index_key(table=self.Meta.table, field=field), {self._table: get_score(value)})
+                continue
+            if value is None and field not in cleared_fields:
+                # Значение поля в БД не изменяется
+                continue
+            previous_value: Any = replaced.get(field)
+            if previous_value is not None and (value is None or str(previous_value) != str(value)):
+                pipe.srem(get_value_index_key(table=self.Meta.table, field=field, value=previous_value), self._table)
+            values_key: str = get_indexed_values_key(table=self.Meta.table, field=field)
+            if value is None:
+                pipe.hdel(values_key, self._table)
+                continue
+            pipe.sadd(get_value_index_key(table=self.Meta.table, field=field, value=value), self._table)
+            pipe.hset(values_key, mapping={self._table: str(value)})
+
+    def _queue_expire(
+        self,
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        ttl: Optional[float] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        """
+            Добавление в pipeline команд установки времени жизни записи объекта (PEXPIRE):
+              ttl, секунд, или Meta.ttl модели; для ключа каждого записанного поля
+              (fields, None - всех полей со значением) или для ключа hash/blob
+        """
+        ttl = self._get_ttl(ttl=ttl)
+        if not ttl:
+            return
+        milliseconds: int = int(ttl * 1000)
+        if self._storage != STORAGE_KEYS:
+            pipe.pexpire(self._table, milliseconds)
+            return
+        params: Mapping[str, Any] = self._params
+        for field in fields if fields is not None else self._schema.fields:
+            if params[field] is not None:
+                pipe.pexpire(KEYS_DELIMITER.join([self._table, field]), milliseconds)
+
+    def _get_ttl(self, ttl: Optional[float] = None) -> Optional[float]:
+        """
+            Время жизни записи объекта: ttl вызова или Meta.ttl модели; для моделей с реестром
+              или индексами время жизни не поддерживается - их записи не истекают вместе
+              с записями объектов (проверяется до добавления команд записи в pipeline)
+        """
+        ttl = ttl if ttl is not None else self._ttl
+        if ttl and (self._registry or self._indexes):
+            raise ValueError(f"{self.__class__.__name__}: ttl is not supported with Meta.registry or Meta.indexes...")
+        return ttl
+
+    def _queue_registry_update(self, pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline]) -> None:
+        """
+            Добавление в pipeline команд регистрации префикса записи в реестре модели (SADD);
+              для разделённого реестра - также значения первого параметра в списке частей
+        """
+        if not self._registry:
+            return
+        if self._registry != REGISTRY_SHARDED:
+            pipe.sadd(get_registry_key(table=self.Meta.table), self._table)
+            return
+        shard: str = str(getattr(self, self._schema.placeholders[0]))
+        pipe.sadd(get_registry_key(table=self.Meta.table, shard=shard), self._table)
+        pipe.sadd(get_registry_shards_key(table=self.Meta.table), shard)
+
+    @classmethod
+    def _get_tables_by_registry(cls: Type[T], plan: QueryPlan, scan_count: Optional[int] = None) -> list[str]:
+        """
+            Префиксы записей, совпадающие с паттернами плана выборки, из реестра модели:
+              SSCAN MATCH по set реестра вместо SCAN по всей БД, поэтому время поиска
+              пропорционально количеству записей модели (части реестра), а не размеру БД
+        """
+        shards: list[bytes] = []
+        if cls._is_registry_shards_required(plan=plan):
+            shards = sorted(cls._db_instance.smembers(get_registry_shards_key(table=cls.Meta.table)))  # type: ignore
+            record(keys=1, payload=shards)
+        tables: dict[bytes, None] = {}
+        scans: dict[tuple[str, str], int] = dict.fromkeys(cls._get_registry_scans(plan=plan, shards=shards), 0)
+        # Итерации SSCAN по всем частям реестра выполняются параллельно (см. _scan_keys)
+        while scans:
+            pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+            for (key, pattern), cursor in scans.items():
+                pipe.sscan(key, cursor=cursor, match=pattern, count=scan_count or cls._scan_count)
+            next_scans: dict[tuple[str, str], int] = {}
+            replies: list[Any] = pipe.execute()
+            record(keys=len(scans), payload=replies)
+            for scan, (cursor, found_tables) in zip(scans, replies):
+                tables.update(dict.fromkeys(found_tables))
+                if cursor:
+                    next_scans[scan] = cursor
+            scans = next_scans
+        return sorted(table.decode() for table in plan.filter_keys(keys=list(tables)))
+
+    @classmethod
+    def _is_registry_shards_required(cls: Type[T], plan: QueryPlan) -> bool:
+        """ Необходимость списка частей реестра: значение первого параметра не определено однозначно """
+        if cls._registry != REGISTRY_SHARDED:
+            return False
+        key: str = cls._schema.placeholders[0]
+        return any(
+            key not in params or is_pattern(str(params[key]))
+                for params in plan.patterns_params
+        )
+
+    @classmethod
+    def _get_registry_scans(cls: Type[T], plan: QueryPlan, shards: list[bytes]) -> list[tuple[str, str]]:
+        """
+            Ключи set реестра и паттерны префиксов записей для SSCAN: для разделённого реестра -
+              часть значения первого параметра или все части (shards), совпадающие с его паттерном
+        """
+        if cls._registry != REGISTRY_SHARDED:
+            return list(dict.fromkeys((get_registry_key(table=cls.Meta.table), pattern) for pattern in plan.patterns))
+        key: str = cls._schema.placeholders[0]
+        scans: list[tuple[str, str]] = []
+        for params, pattern in zip(plan.patterns_params, plan.patterns):
+            shard_pattern: str = str(params.get(key, WILDCARD))
+            scans.extend(
+                (get_registry_key(table=cls.Meta.table, shard=shard), pattern)
+                    for shard in (shard.decode() for shard in shards)
+                        if fnmatch.fnmatchcase(shard, shard_pattern)
+            )
+            if not is_pattern(shard_pattern):
+                scans.append((get_registry_key(table=cls.Meta.table, shard=shard_pattern), pattern))
+        return list(dict.fromkeys(scans))
+
+    @classmethod
+    def _get_registry_shard(cls: Type[T], table: bytes) -> str:
+        """ Значение первого параметра Meta.table (часть разделённого реестра) из префикса записи """
+        position: int = cls._schema.table_keys[cls._schema.placeholders[0]]
+        return cls._schema.split_table(table.decode())[position]
+
+    @classmethod
+    def _iter_tables(
+        cls: Type[T],
+        kwargs: dict,
+        scan_count: Optional[int] = None,
+        db_instance: Optional[redis.Redis] = None,
+    ) -> Iterator[bytes]:
+        """
+            Префиксы записей по параметрам Meta.table без повторов: сформированные
+              без поиска, из реестра модели (SSCAN) или найденные в БД (SCAN)
+        """
+        client: redis.Redis = db_instance or cls._db_instance  # type: ignore
+        plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+        if plan.tables is not None:
+            yield from (table.encode() for table in plan.tables)
+            return
+        count: int = scan_count or cls._scan_count
+        seen_tables: set[bytes] = set()
+        if cls._registry:
+            shards: list[bytes] = []
+            if cls._is_registry_shards_required(plan=plan):
+                shards = sorted(client.smembers(get_registry_shards_key(table=cls.Meta.table)))  # type: ignore
+            for key, pattern in cls._get_registry_scans(plan=plan, shards=shards):
+                for table in client.sscan_iter(key, match=pattern, count=count):
+                    if table not in seen_tables and (not plan.filters or plan.match_table(table.decode())):
+                        seen_tables.add(table)
+                        yield table
+            return
+        for pattern in cls._get_filters_by_plan(plan=plan):
+            for key in client.scan_iter(match=pattern, count=count):
+                table = key if cls._storage != STORAGE_KEYS else key.rsplit(KEYS_DELIMITER.encode(), 1)[0]
+                if table not in seen_tables and (not plan.filters or plan.match_table(table.decode())):
+                    seen_tables.add(table)
+                    yield table
+
+    @classmethod
+    def _queue_delete_tables(
+        cls: Type[T],
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        tables: list[bytes],
+    ) -> int:
+        """
+            Добавление в pipeline команд удаления записей: UNLINK ключей каждой записи
+              (первые len(tables) ответов - количество удалённых ключей записи), удаление
+              префиксов из реестра, индексов числовых полей и обратных записей индексов значений;
+              set индексов значений зависят от значений записей - см. _queue_delete_objects
+              (значения известны по объектам) и _queue_delete_value_indexes (значения из БД)
+            Результат - количество добавленных команд
+        """
+        for table in tables:
+            pipe.unlink(*([table] if cls._storage != STORAGE_KEYS else cls._get_keys_by_tables(tables=[table])))
+        if not tables:
+            return 0
+        commands_count: int = len(tables)
+        for field, is_numeric in cls._indexes.items():
+            if is_numeric:
+                pipe.zrem(get_index_key(table=cls.Meta.table, field=field), *tables)
+            else:
+                pipe.hdel(get_indexed_values_key(table=cls.Meta.table, field=field), *tables)
+            commands_count += 1
+        if cls._registry == REGISTRY_SHARDED:
+            tables_by_shard: dict[str, list[bytes]] = {}
+            for table in tables:
+                tables_by_shard.setdefault(cls._get_registry_shard(table=table), []).append(table)
+            for shard, shard_tables in tables_by_shard.items():
+                pipe.srem(get_registry_key(table=cls.Meta.table, shard=shard), *shard_tables)
+            commands_count += len(tables_by_shard)
+        elif cls._registry:
+            pipe.srem(get_registry_key(table=cls.Meta.table), *tables)
+            commands_count += 1
+        cls._invalidate_cache(tables=[table.decode() for table in tables])
+        return commands_count
+
+    @classmethod
+    def _get_columns(
+        cls: Type[T],
+        tables: Optional[list[str]],
+        plan: QueryPlan,
+        scan_count: Optional[int] = None,
+        predicates: Optional[list[IndexPredicate]] = None,
+    ) -> dict[str, Any]:
+        """
+            Получение колонок значений: ответы MGET (HMGET) разбираются векторно,
+              объекты модели и локальный кеш не используются
+        """
+        found_tables: list[bytes]
+        if tables is not None:
+            found_tables = [table.encode() for table in tables]
+        else:
+            found_tables = cls._get_tables_by_keys(keys=cls._scan_keys_by_plan(plan=plan, count=scan_count))
+        columns: dict[str, Any] = build_columns(
+            schema=cls._schema,
+            tables=found_tables,
+            values=cls._get_db_rows(tables=found_tables),
+        )
+        if predicates:
+            # Отбор строк по значениям индексируемых полей (см. _match_predicates)
+            mask: Any = predicates[0].mask(columns[predicates[0].field])
+            for predicate in predicates[1:]:
+                mask &= predicate.mask(columns[predicate.field])
+            columns = {key: column[mask] for key, column in columns.items()}
+        return columns
+
+    @classmethod
+    def _get_tables_by_keys(cls: Type[T], keys: Iterable[bytes]) -> list[bytes]:
+        """ Префиксы записей найденных ключей (при хранении в hash/blob ключ и есть префикс) """
+        if cls._storage != STORAGE_KEYS:
+            return list(dict.fromkeys(keys))
+        delimiter: bytes = KEYS_DELIMITER.encode()
+        return list(dict.fromkeys(key.rsplit(delimiter, 1)[0] for key in keys))
+
+    @classmethod
+    def _get_db_rows(cls: Type[T], tables: list[bytes]) -> list[Optional[bytes]]:
+        """
+            Значения всех полей модели для переданных префиксов записей в виде строк таблицы:
+              для каждого префикса - значения в порядке полей модели (None - отсутствует в БД)
+        """
+        if not tables:
+            return []
+        pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+        cls._queue_db_rows(pipe=pipe, tables=tables)
+        replies: list[Any] = pipe.execute()
+        record(keys=len(tables), payload=replies)
+        return cls._parse_db_rows(replies=replies)
+
+    @classmethod
+    def _queue_db_rows(cls: Type[T], pipe: redis.client.Pipeline, tables: list[bytes]) -> int:
+        """
+            Добавление в pipeline команд получения значений всех полей модели для префиксов
+              записей (HMGET для каждого hash, MGET по MGET_CHUNK_SIZE для ключей и blob)
+            Результат - количество добавленных команд
+        """
+        if cls._storage == STORAGE_HASH:
+            for table in tables:
+                pipe.hmget(table, cls._schema.fields)
+            return len(tables)
+        keys: list[bytes] = tables if cls._storage == STORAGE_BLOB else cls._get_keys_by_tables(tables=tables)
+        chunks: list[list[bytes]] = cls._get_mget_chunks(keys=keys)
+        for chunk in chunks:
+            pipe.mget(chunk)
+        return len(chunks)
+
+    @classmethod
+    def _parse_db_rows(cls: Type[T], replies: list[list[Optional[bytes]]]) -> list[Optional[bytes]]:
+        """ Значения полей (построчно) из ответов команд, добавленных _queue_db_rows """
+        values: Iterator[Optional[bytes]] = itertools.chain.from_iterable(replies)
+        if cls._storage != STORAGE_BLOB:
+            return list(values)
+        empty_row: list[None] = [None] * len(cls._schema.fields)
+        return list(itertools.chain.from_iterable(
+            unpack_blob(blob) if blob is not None else empty_row
+                for blob in values
+        ))
+
+    @classmethod
+    def _objects_from_db_rows(cls: Type[T], tables: list[bytes], values: list[Optional[bytes]]) -> list[T]:
+        """ Формирование объектов из значений полей (построчно), записи без полей исключаются """
+        keys: list[bytes] = cls._get_keys_by_tables(tables=tables)
+        return cls._objects_from_db_items(items=cls._get_existing_db_items(keys=keys, values=values))
+
+    @classmethod
+    def _get_cache(cls: Type[T], db_instance: Any) -> Optional[LocalCache]:
+        """
+            Локальный кеш модели для подключения db_instance (создаётся при первом обращении);
+              None - кеш не используется или подключение не установлено
+        """
+        if cls._caches is None or db_instance is None:
+            return None
+        cache: Optional[LocalCache] = cls._caches.get(db_instance)
+        if cache is None:
+            cache = cls._caches.setdefault(db_instance, LocalCache(**cls._cache_options))  # type: ignore
+        return cache
+
+    @classmethod
+    def _invalidate_cache(cls: Type[T], tables: Iterable[str], db_instance: Any = None) -> None:
+        """ Удаление объектов из локального кеша подключения db_instance (None - кешей всех подключений) """
+        if cls._caches is None:
+            return
+        caches: list[LocalCache] = list(cls._caches.values()) if db_instance is None else [
+            cache for cache in (cls._caches.get(db_instance),) if cache is not None
+        ]
+        for table in tables:
+            for cache in caches:
+                cache.invalidate(table)
+
+    @classmethod
+    def _get_cached_objects(cls: Type[T], tables: list[str], db_instance: Any) -> tuple[list[T], list[str]]:
+        """ Получение объектов из локального кеша подключения: найденные объекты и префиксы промахов """
+        cache: Optional[LocalCache] = cls._get_cache(db_instance=db_instance)
+        if cache is None:
+            return [], tables
+        cached_objects: list[T] = []
+        missed_tables: list[str] = []
+        for table in tables:
+            cached_object: Optional[T] = cache.get(table)
+            if cached_object is None:
+                missed_tables.append(table)
             else:
-                extend_kwargs[key.strip(IN_PREFIX)] = value
-        # Формирование итоговых словарей
-        result_kwargs: list[dict] = []
-        if extend_kwargs:
-            # Получить множество комбинаций расширенного словаря
-            mixed_kwargs: list[dict] = list(
-                dict(zip(extend_kwargs.keys(), values))
-                    for values in itertools.product(*extend_kwargs.values())
+                cached_objects.append(copy.copy(cached_object))
+
+        return cached_objects, missed_tables
+
+    @classmethod
+    def _put_to_cache(cls: Type[T], objects: Iterable[RedisItem], db_instance: Any) -> None:
+        """ Добавление (обновление) объектов в локальном кеше модели для подключения db_instance """
+        cache: Optional[LocalCache] = cls._get_cache(db_instance=db_instance)
+        if cache is None:
+            return
+        for obj in objects:
+            cache.put(obj._table, copy.copy(obj))
+
+    @classmethod
+    def cache_info(cls: Type[T], db_instance: Any = None) -> Optional[CacheInfo]:
+        """
+            Статистика локального кеша модели для подключения db_instance (None - подключения модели);
+              None - кеш не используется
+        """
+        cache: Optional[LocalCache] = cls._get_cache(db_instance=db_instance or cls._db_instance)
+        return cache.info if cache is not None else None
+
+    @classmethod
+    def listen_cache_invalidations(
+        cls: Type[T],
+        db_instance: Optional[redis.Redis] = None,
+        sleep_time: float = 0.1,
+    ) -> redis.client.PubSubWorkerThread:
+        """
+            Подписка на уведомления об изменении ключей модели (keyspace notifications)
+              для инвалидации локального кеша изменениями из других процессов, например:
+
+                ExampleItem.listen_cache_invalidations()
+
+            Уведомления должны быть включены на сервере: notify-keyspace-events "KA"
+            Возвращается поток обработки уведомлений (остановка - thread.stop())
+        """
+        client: Optional[redis.Redis] = db_instance or cls._db_instance
+        if not client:
+            raise Exception("Redis database not connected...")
+        if not hasattr(client, "pubsub"):
+            raise Exception(f"{cls.__name__}.listen_cache_invalidations() is not supported for shards...")
+        db: int = client.connection_pool.connection_kwargs.get("db", 0)
+        pattern: str = cls._get_filters_by_kwargs(kwargs={})[0]
+        pubsub: redis.client.PubSub = client.pubsub(ignore_subscribe_messages=True)
+        pubsub.psubscribe(**{
+            f"__keyspace@{db}__:{pattern}": lambda message: cls._on_keyspace_event(message, db_instance=client),
+        })
+        return pubsub.run_in_thread(sleep_time=sleep_time, daemon=True)
+
+    @classmethod
+    def _on_keyspace_event(cls: Type[T], message: dict, db_instance: Any = None) -> None:
+        """
+            Инвалидация объекта локального кеша подключения db_instance (None - кешей всех подключений)
+              по уведомлению об изменении ключа
+        """
+        if cls._caches is None:
+            return
+        channel: Union[bytes, str] = message["channel"]
+        if isinstance(channel, bytes):
+            channel = channel.decode()
+        key: str = channel.split(":", 1)[1]
+        cls._invalidate_cache(
+            tables=[key if cls._storage != STORAGE_KEYS else key.rsplit(KEYS_DELIMITER, 1)[0]],
+            db_instance=db_instance,
+        )
+
+    @classmethod
+    def iter_filter(
+        cls: Type[T],
+        batch_size: int = BATCH_SIZE,
+        scan_count: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[T]:
+        """
+            Потоковое получение объектов по фильтру переданных аргументов, например:
+
+                for item in StorageItem.iter_filter(subsystem_id__in=[10, 47], batch_size=500):
+                    ...
+
+            Ключи ищутся инкрементально (SCAN), значения запрашиваются через MGET
+              порциями по batch_size объектов, объекты отдаются по мере готовности порции.
+            Пиковое потребление памяти пропорционально batch_size, а не размеру выборки
+              (дополнительно хранятся только префиксы уже отданных объектов)
+        """
+        if not cls._db_instance:
+            raise Exception("Redis database not connected...")
+        if not len(kwargs):
+            raise Exception(f"{cls.__name__}.iter_filter() has empty filter. OOM possible.")
+        if batch_size < 1:
+            raise ValueError(f"{cls.__name__}.iter_filter() batch_size must be positive...")
+        predicates, kwargs = cls._split_index_predicates(kwargs=kwargs)
+        plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+        # Если аргументы однозначно определяют записи (по индексам, реестру) - поиск ключей не требуется
+        tables: Optional[list[str]]
+        if predicates:
+            tables = cls._get_tables_by_indexes(predicates=predicates, plan=plan)
+        else:
+            tables = plan.tables
+            if tables is None and cls._registry:
+                tables = cls._get_tables_by_registry(plan=plan, scan_count=scan_count)
+        if tables is not None:
+            for index in range(0, len(tables), batch_size):
+                yield from cls._match_predicates(
+                    objects=cls._objects_by_tables(
+                        tables=[table.encode() for table in tables[index:index + batch_size]],
+                    ),
+                    predicates=predicates,
+                )
+            return
+        seen_tables: set[bytes] = set()
+        for filter in cls._get_filters_by_plan(plan=plan):
+            tables_batch: list[bytes] = []
+            keys: Iterator[bytes] = cls._db_instance.scan_iter(
+                match=filter,
+                count=scan_count or cls._scan_count,
             )
-            # Обогатить расширенные словари базовым
-            result_kwargs = [mixed_item | basic_kwargs for mixed_item in mixed_kwargs]
+            for key in keys:
+                # Префикс объекта (ключ без имени поля); поля одного объекта
+                #   запрашиваются вместе, чтобы объект не разделился между порциями
+                table: bytes = key if cls._storage != STORAGE_KEYS else key.rsplit(KEYS_DELIMITER.encode(), 1)[0]
+                if table in seen_tables or (plan.filters and not plan.match_table(table.decode())):
+                    continue
+                seen_tables.add(table)
+                tables_batch.append(table)
+                if len(tables_batch) >= batch_size:
+                    yield from cls._objects_by_tables(tables=tables_batch)
+                    tables_batch = []
+            if tables_batch:
+                yield from cls._objects_by_tables(tables=tables_batch)
+
+    @classmethod
+    def _objects_by_tables(cls: Type[T], tables: list[bytes]) -> list[T]:
+        """ Получение объектов по префиксам записей """
+        return cls._objects_from_db_items(items=cls._get_db_items_by_tables(tables=tables))
+
+    @classmethod
+    def _get_db_items_by_tables(cls: Type[T], tables: list[bytes]) -> dict[bytes, bytes]:
+        """ Получение значений всех полей модели для переданных префиксов записей """
+        if cls._storage == STORAGE_HASH:
+            return cls._get_hash_items(tables=tables)
+        if cls._storage == STORAGE_BLOB:
+            return cls._get_fields_from_blobs(blobs=cls._get_db_items(keys=tables))
+        return cls._get_db_items(keys=cls._get_keys_by_tables(tables=tables))
+
+    @classmethod
+    def _get_fields_from_blobs(cls: Type[T], blobs: dict[bytes, bytes]) -> dict[bytes, bytes]:
+        """
+            Распаковка объектов, хранящихся одним значением (blob), в значения полей
+            Результат - ключи в формате "префикс.поле", как при хранении в отдельных ключах
+        """
+        fields: tuple[bytes, ...] = cls._schema.field_suffixes
+        return {
+            table + field: value
+                for table, blob in blobs.items()
+                    for field, value in zip(fields, unpack_blob(blob))
+                        if value is not None
+        }
+
+    @classmethod
+    def _get_hash_items(cls: Type[T], tables: list[bytes]) -> dict[bytes, bytes]:
+        """
+            Получение значений полей объектов, хранящихся в hash, за один сетевой запрос
+              (команды HMGET отправляются одним pipeline)
+            Результат - ключи в формате "префикс.поле", как при хранении в отдельных ключах
+        """
+        if not tables:
+            return {}
+        pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+        for table in tables:
+            pipe.hmget(table, cls._schema.fields)
+        values: list[list[Optional[bytes]]] = pipe.execute()
+        record(keys=len(tables), payload=values)
+        return cls._get_existing_hash_items(tables=tables, values=values)
+
+    @classmethod
+    def _get_existing_hash_items(
+        cls: Type[T],
+        tables: list[bytes],
+        values: list[list[Optional[bytes]]],
+    ) -> dict[bytes, bytes]:
+        """ Сопоставление полей hash и значений с исключением отсутствующих в БД полей """
+        fields: tuple[bytes, ...] = cls._schema.field_suffixes
+        return {
+            table + field: value
+                for table, table_values in zip(tables, values)
+                    for field, value in zip(fields, table_values)
+                        if value is not None
+        }
+
+    @classmethod
+    def _get_keys_by_tables(cls: Type[T], tables: list[bytes]) -> list[bytes]:
+        """ Формирование ключей всех полей модели для переданных префиксов записей """
+        fields: tuple[bytes, ...] = cls._schema.field_suffixes
+        return [table + field for table in tables for field in fields]
+
+    @classmethod
+    def _get_db_items(cls: Type[T], keys: list[bytes]) -> dict[bytes, bytes]:
+        """
+            Получение значений ключей за один сетевой запрос
+            Ключи разбиваются на команды MGET по MGET_CHUNK_SIZE, которые отправляются
+              одним pipeline; отсутствующие в БД ключи исключаются из результата
+        """
+        if not keys:
+            return {}
+        return cls._get_existing_db_items(keys=keys, values=cls._mget(keys=keys))
+
+    @classmethod
+    def _mget(cls: Type[T], keys: list[bytes]) -> list[Optional[bytes]]:
+        """ Получение значений ключей (в порядке ключей) командами MGET по MGET_CHUNK_SIZE """
+        if not keys:
+            return []
+        chunks: list[list[bytes]] = cls._get_mget_chunks(keys=keys)
+        values: list[Optional[bytes]]
+        if len(chunks) == 1:
+            values = cls._db_instance.mget(keys)  # type: ignore
         else:
-            result_kwargs = [basic_kwargs]
-        return result_kwargs
+            pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+            for chunk in chunks:
+                pipe.mget(chunk)
+            values = list(itertools.chain.from_iterable(pipe.execute()))
+        record(keys=len(keys), payload=values)
+        return values
+
+    @staticmethod
+    def _get_mget_chunks(keys: list[bytes]) -> list[list[bytes]]:
+        """ Разбиение ключей на команды MGET по MGET_CHUNK_SIZE """
+        return [
+            keys[index:index + MGET_CHUNK_SIZE]
+                for index in range(0, len(keys), MGET_CHUNK_SIZE)
+        ]
+
+    @staticmethod
+    def _get_existing_db_items(keys: list[bytes], values: list[Optional[bytes]]) -> dict[bytes, bytes]:
+        """ Сопоставление ключей и значений с исключением отсутствующих в БД ключей """
+        return {
+            key: value
+                for key, value in zip(keys, values)
+                    if value is not None
+        }
+
+    @classmethod
+    def _scan_keys(cls: Type[T], patterns: list[str], count: Optional[int] = None) -> list[bytes]:
+        """
+            Инкрементальный поиск ключей по паттернам (SCAN вместо блокирующего KEYS)
+            Итерации SCAN по всем паттернам выполняются параллельно: каждый раунд -
+              один pipeline с очередной командой SCAN для каждого незавершённого паттерна,
+              поэтому количество сетевых запросов не зависит от количества паттернов
+            SCAN может возвращать ключи повторно, поэтому результат дедуплицируется
+              с сохранением порядка
+        """
+        keys: dict[bytes, None] = {}
+        cursors: dict[str, int] = dict.fromkeys(patterns, 0)
+        while cursors:
+            pipe: redis.client.Pipeline = cls._db_instance.pipeline(transaction=False)  # type: ignore
+            for pattern, cursor in cursors.items():
+                pipe.scan(cursor=cursor, match=pattern, count=count or cls._scan_count)
+            next_cursors: dict[str, int] = {}
+            replies: list[Any] = pipe.execute()
+            record(payload=replies)
+            for pattern, (cursor, found_keys) in zip(cursors, replies):
+                keys.update(dict.fromkeys(found_keys))
+                if cursor:
+                    next_cursors[pattern] = cursor
+            cursors = next_cursors
+
+        return list(keys)
+
+    @classmethod
+    def _objects_from_db_items(cls: Type[T], items: dict[bytes, bytes]) -> list[T]:
+        """
+            Формирование cls(RedisItem)-объектов из данных базы
+            Поля группируются по префиксу записи за один проход по ключам,
+              поэтому каждый ключ декодируется и приводится к типу один раз
+        """
+        schema: ModelSchema = cls._schema
+        decoders: dict[str, Any] = schema.decoders
+        # Поля объектов, сгруппированные по префиксу записи (ключ без имени поля)
+        tables: dict[str, dict[str, Any]] = {}
+        for field, value in items.items():
+            table, key = field.decode().rsplit(KEYS_DELIMITER, 1)
+            fields: Optional[dict[str, Any]] = tables.get(table)
+            if fields is None:
+                fields = tables[table] = {}
+            # Приведение типа к соответствующему полю cls (декодирование кодеком поля)
+            fields[key] = decoders[key](value)
+
+        result_items: list[T] = []
+        for table, fields in tables.items():
+            # Формирование Meta из table класса и префикса полученных данных
+            src_values: list[str] = table[schema.table_slice].split(KEYS_DELIMITER)
+            for key, position in schema.table_keys.items():
+                fields[key] = src_values[position]
+
+            result_items.append(cls(**fields))
+
+        return result_items
+
+    @classmethod
+    def _get_plan(cls: Type[T], kwargs: dict) -> QueryPlan:
+        """ План выборки по параметрам Meta.table (см. planner.build_plan) """
+        return build_plan(schema=cls._schema, kwargs=kwargs, max_patterns=cls._max_patterns)
 
     @classmethod
     def _get_filters_by_kwargs(cls: Type[T], kwargs: dict) -> list[str]:
         """ Подготовка списка паттернов поиска """
-        table: str = cls.Meta.table
-        # Шаблон для поиска аргументов, которе не были переданы
-        patterns: list[str] = re.findall(r'\{[^\}]*\}', table)
-        str_filters: list[str] = []
-        # Получение сырого списка фильтров
-        prepared_kwargs_list: list[dict] = cls._get_list_of_prepared_kwargs(kwargs=kwargs)
-        # Замена аргументов, которые не переданы, на звездочку
-        for prepared_kwargs in prepared_kwargs_list:
-            for pattern in patterns:
-                clean_key: str = pattern.strip("{").strip("}")
-                if not clean_key in prepared_kwargs:
-                    table = table.replace(pattern, "*")
-            # Заполнение паттерна поиска
-            str_filters.append(table.format(**prepared_kwargs) + ".*")
-
-        return str_filters
+        return cls._get_filters_by_plan(plan=cls._get_plan(kwargs=kwargs))
+
+    @classmethod
+    def _get_filters_by_plan(cls: Type[T], plan: QueryPlan) -> list[str]:
+        """ Паттерны поиска ключей по паттернам префиксов записей плана выборки """
+        # При хранении в hash/blob ключ записи - префикс без полей
+        suffix: str = "" if cls._storage != STORAGE_KEYS else KEYS_DELIMITER + WILDCARD
+        return [pattern + suffix for pattern in plan.patterns]
+
+    @classmethod
+    def _scan_keys_by_plan(cls: Type[T], plan: QueryPlan, count: Optional[int] = None) -> list[bytes]:
+        """ Поиск ключей по паттернам плана выборки с отбором на стороне клиента (PLAN_SCAN) """
+        return plan.filter_keys(
+            keys=cls._scan_keys(patterns=cls._get_filters_by_plan(plan=plan), count=count),
+            with_fields=cls._storage == STORAGE_KEYS,
+        )
+
+    @classmethod
+    def explain(cls: Type[T], scan_count: Optional[int] = None, **kwargs) -> dict[str, Any]:
+        """
+            Описание выполнения filter() с переданными аргументами без получения объектов, например:
+
+                StorageItem.explain(subsystem_id__in=list(range(100)), tag_id=55)
+
+            Результат:
+            - strategy: "exact" (префиксы записей без поиска), "patterns" (поиск по паттернам,
+              совпадающим только с искомыми записями), "scan" (поиск по расширенным паттернам
+              с отбором на стороне клиента), "indexes" (условия по Meta.indexes)
+            - source: источник префиксов записей: "keys" (без поиска), "indexes", "registry" или "scan"
+            - patterns: паттерны поиска ключей, patterns_count - их количество,
+              cartesian_count - количество паттернов без объединения значений __in
+            - tables_count: количество префиксов записей (без поиска), иначе None
+            - client_filters: параметры Meta.table, отбираемые на стороне клиента
+            - round_trips: оценка количества сетевых запросов (для SCAN - по DBSIZE
+              подключённой БД, без подключения - None)
+        """
+        predicates, kwargs = cls._split_index_predicates(kwargs=kwargs)
+        plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+        positions: dict[int, str] = {position: key for key, position in cls._schema.table_keys.items()}
+        count: int = scan_count or cls._scan_count
+        round_trips: Optional[int]
+        if predicates:
+            source, round_trips = "indexes", 2
+        elif plan.tables is not None:
+            source, round_trips = "keys", 1
+        elif cls._registry:
+            # Список частей реестра, раунды SSCAN (оценка: один) и получение значений
+            source, round_trips = "registry", 2 + cls._is_registry_shards_required(plan=plan)
+        else:
+            source, round_trips = "scan", None
+            dbsize: Optional[Callable[[], int]] = getattr(cls._db_instance, "dbsize", None)
+            if dbsize is not None:
+                # Каждый раунд SCAN - один pipeline по всем паттернам (см. _scan_keys), затем получение значений
+                round_trips = max(math.ceil(dbsize() / count), 1) + 1
+        return {
+            "strategy": "indexes" if predicates else plan.strategy,
+            "source": source,
+            "patterns": [] if plan.strategy == PLAN_EXACT else cls._get_filters_by_plan(plan=plan),
+            "patterns_count": 0 if plan.strategy == PLAN_EXACT else len(plan.patterns),
+            "cartesian_count": plan.cartesian_count,
+            "tables_count": None if plan.tables is None else len(plan.tables),
+            "client_filters": [positions[position] for position in plan.filters],
+            "round_trips": round_trips,
+        }
 
     @property
     def mapping(self) -> Mapping[_Key, _Value]:
-        """ Формирование ключей и значений для БД """
+        """
+            Формирование ключей и значений для БД (значения кодируются кодеками полей)
+            При хранении в hash - поля и значения hash с ключом self._table,
+              при хранении в blob - одно упакованное значение с ключом self._table
+        """
+        return self._get_mapping()
+
+    def _get_mapping(self, fields: Optional[Iterable[str]] = None) -> dict[_Key, _Value]:
+        """
+            Ключи и значения для БД полей fields (None - всех полей модели), поля без значения
+              (None) не записываются; объект в blob записывается целиком
+        """
+        encoders: dict[str, Any] = self._schema.encoders
+        params: Mapping[str, Any] = self._params
+        if self._storage == STORAGE_BLOB:
+            return {self._table: pack_blob(values=[
+                value if value is None or encoders[key] is None else encoders[key](value)
+                    for key, value in params.items()
+            ])}
+        encoded_params: dict[str, Any] = {
+            key: value if encoders[key] is None else encoders[key](value)
+                for key, value in (params.items() if fields is None else ((key, params[key]) for key in fields))
+                    if value is not None
+        }
+        if self._storage == STORAGE_HASH:
+            return encoded_params
         return {
             KEYS_DELIMITER.join([self._table, str(key)]): value
-                for key, value in self._params.items()
+                for key, value in encoded_params.items()
         }
 
     def __repr__(self) -> str:
@@ -238,9 +1421,15 @@ class RedisItem(StorageItem):
                 storage_item_instance.using(db_instance=another_client).save()
 
             Создаётся копия объекта для работы через "неглобальное" подключение к Redis
+            (для компактной модели - объект копии класса, см. using())
         """
+        if self._compact:
+            return self._copy_as(model=self.__class__.using(db_instance=db_instance))
         copied_instance: T = copy.copy(self)
-        copied_instance._db_instance = db_instance
+        if isinstance(db_instance, redis.asyncio.Redis):
+            copied_instance._async_db_instance = db_instance
+        else:
+            copied_instance._db_instance = db_instance
         return copied_instance
 
     @classmethod
@@ -252,19 +1441,366 @@ class RedisItem(StorageItem):
                 another_client: redis.Redis = redis.Redis(host="8.8.8.8", db=12)
                 StorageItem.using(db_instance=another_client).get(subsystem_id=10)
 
-            Создаётся копия класса для работы через "неглобальное" подключение к Redis
+            Создаётся копия класса для работы через "неглобальное" подключение к Redis;
+              копия использует скомпилированную схему и локальный кеш исходной модели
         """
         class CopiedClass(cls):  # type: ignore
-            _db_instance = db_instance
-        CopiedClass.__annotations__.update(cls.__annotations__)
+            __slots__ = ()
+            __annotations__ = dict(cls.__annotations__)
+            _is_using_copy = True
+        if isinstance(db_instance, redis.asyncio.Redis):
+            CopiedClass._async_db_instance = db_instance
+        else:
+            CopiedClass._db_instance = db_instance
         return cast(T, CopiedClass)
 
-    def save(self) -> OperationResult:
-        """ Одиночная вставка """
+    def save(
+        self,
+        ttl: Optional[float] = None,
+        update_fields: Optional[Iterable[str]] = None,
+    ) -> OperationResult:
+        """
+            Одиночная вставка
+            ttl - время жизни записи, секунд (по умолчанию - Meta.ttl модели)
+            update_fields - запись только перечисленных полей, например, изменённых
+              после получения объекта:
+
+                example_item.any_value = 5
+                example_item.save(update_fields=example_item.dirty_fields)
+        """
+        if not self._db_instance:
+            raise Exception("Redis database not connected...")
+        try:
+            fields: Optional[tuple[str, ...]] = self._get_update_fields(update_fields=update_fields)
+            mapping: dict[_Key, _Value] = self._get_mapping(fields=fields)
+            cleared_fields: tuple[str, ...] = self._get_cleared_fields(fields=fields)
+            if self._indexes or self._registry or ttl or self._ttl or cleared_fields:
+                self._read_indexed_values(db_instance=self._db_instance, objects=[self])
+                # Запись и удаление полей, время жизни, обновление индексов и реестра - одним pipeline
+                pipe: redis.client.Pipeline = self._db_instance.pipeline()
+                self._queue_save(pipe=pipe, ttl=ttl, fields=fields, mapping=mapping, cleared_fields=cleared_fields)
+                pipe.execute()
+            elif mapping and self._storage == STORAGE_HASH:
+                self._db_instance.hset(self._table, mapping=mapping)
+            elif mapping:
+                self._db_instance.mset(mapping=mapping)
+            self._clear_dirty_fields(fields=fields)
+            self._update_cache(fields=fields, db_instance=self._db_instance)
+            return OperationResult(status=OperationStatus.success)
+        except Exception as exception:
+            self._on_error_actions(exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+
+    def _queue_save(
+        self,
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        ttl: Optional[float] = None,
+        fields: Optional[tuple[str, ...]] = None,
+        mapping: Optional[dict[_Key, _Value]] = None,
+        cleared_fields: Optional[tuple[str, ...]] = None,
+    ) -> None:
+        """
+            Добавление в pipeline команд записи объекта (полей fields), удаления полей
+              без значения (UNLINK ключей полей, HDEL для hash), времени жизни,
+              обновления индексов и реестра
+        """
+        self._get_ttl(ttl=ttl)
+        mapping = mapping if mapping is not None else self._get_mapping(fields=fields)
+        if mapping and self._storage == STORAGE_HASH:
+            pipe.hset(self._table, mapping=mapping)
+        elif mapping:
+            pipe.mset(mapping=mapping)
+        cleared_fields = cleared_fields if cleared_fields is not None else self._get_cleared_fields(fields=fields)
+        if cleared_fields and self._storage == STORAGE_HASH:
+            pipe.hdel(self._table, *cleared_fields)
+        elif cleared_fields:
+            pipe.unlink(*[KEYS_DELIMITER.join([self._table, field]) for field in cleared_fields])
+        for field in cleared_fields:
+            if self._indexes.get(field):
+                pipe.zrem(get_index_key(table=self.Meta.table, field=field), self._table)
+        self._queue_expire(pipe=pipe, ttl=ttl, fields=fields)
+        self._queue_index_updates(pipe=pipe, fields=fields, cleared_fields=cleared_fields)
+        self._queue_registry_update(pipe=pipe)
+
+    def _update_cache(self, fields: Optional[tuple[str, ...]], db_instance: Any) -> None:
+        """
+            Обновление локального кеша записанным объектом; после частичной записи (fields)
+              объект не совпадает с записью в БД и удаляется из кеша (blob записывается целиком)
+        """
+        if fields is None or self._storage == STORAGE_BLOB:
+            self._put_to_cache(objects=[self], db_instance=db_instance)
+        else:
+            self._invalidate_cache(tables=[self._table], db_instance=db_instance)
+
+    def _get_cleared_fields(self, fields: Optional[tuple[str, ...]]) -> tuple[str, ...]:
+        """
+            Поля без значения (None), удаляемые из БД при записи: перечисленные в fields,
+              при записи всех полей - изменённые присваиванием (blob записывается целиком)
+        """
+        if self._storage == STORAGE_BLOB:
+            return ()
+        candidates: Iterable[str] = fields if fields is not None else self.dirty_fields
+        params: Mapping[str, Any] = self._params
+        return tuple(field for field in self._schema.fields if field in candidates and params[field] is None)
+
+    def _get_update_fields(self, update_fields: Optional[Iterable[str]]) -> Optional[tuple[str, ...]]:
+        """ Проверка полей частичной записи (None - запись всех полей) """
+        if update_fields is None:
+            return None
+        fields: tuple[str, ...] = tuple(update_fields)
+        unknown_fields: set[str] = set(fields).difference(self._schema.fields)
+        if unknown_fields:
+            raise ValueError(f"{self.__class__.__name__}.save() got unknown update_fields: {sorted(unknown_fields)}...")
+        return fields
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        """ Поля, изменённые присваиванием после создания (получения) или записи объекта """
+        return getattr(self, "_dirty", frozenset())
+
+    @property
+    def _replaced_values(self) -> Mapping[str, Any]:
+        """ Значения полей с индексом значений до изменения (с последней записи или получения объекта) """
+        return getattr(self, "_replaced", {})
+
+    def _clear_dirty_fields(self, fields: Optional[tuple[str, ...]] = None) -> None:
+        """ Сброс признака изменения записанных полей (fields, None - всех полей) """
+        dirty: frozenset[str] = self.dirty_fields
+        if dirty:
+            object.__setattr__(self, "_dirty", dirty.difference(fields) if fields is not None else frozenset())
+        replaced: Mapping[str, Any] = self._replaced_values
+        if replaced:
+            object.__setattr__(self, "_replaced", {
+                field: value
+                    for field, value in replaced.items()
+                        if fields is not None and field not in fields
+            })
+
+    def delete(self) -> OperationResult:
+        """
+            Удаление объекта: UNLINK ключей записи, удаление из индексов и реестра
+              одним pipeline; message="deleted=1" (0 - запись отсутствовала в БД)
+        """
         if not self._db_instance:
             raise Exception("Redis database not connected...")
         try:
-            self._db_instance.mset(mapping=self.mapping)
+            deleted_count: int = self._delete_objects(db_instance=self._db_instance, objects=[self])
+            return OperationResult(status=OperationStatus.success, message=f"deleted={deleted_count}")
+        except Exception as exception:
+            self._on_error_actions(exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=str(exception),
+            )
+
+    @staticmethod
+    def _delete_objects(db_instance: redis.Redis, objects: Iterable[RedisItem]) -> int:
+        """
+            Удаление объектов (в том числе разных моделей) одним pipeline
+            Результат - количество объектов, записи которых были в БД
+        """
+        objects_by_model: dict[Type[RedisItem], list[RedisItem]] = {}
+        for obj in objects:
+            objects_by_model.setdefault(type(obj), []).append(obj)
+        if not objects_by_model:
+            return 0
+        RedisItem._read_indexed_values(db_instance=db_instance, objects=itertools.chain(*objects_by_model.values()))
+        pipe: redis.client.Pipeline = db_instance.pipeline(transaction=False)
+        segments: list[tuple[int, int]] = [
+            (len(model_objects), model._queue_delete_objects(pipe=pipe, objects=model_objects))
+                for model, model_objects in objects_by_model.items()
+        ]
+        replies: list[Any] = pipe.execute()
+        deleted_count: int = 0
+        offset: int = 0
+        for objects_count, commands_count in segments:
+            # Первые ответы каждой модели - результаты UNLINK записей (см. _queue_delete_tables)
+            deleted_count += sum(1 for deleted in replies[offset:offset + objects_count] if deleted)
+            offset += commands_count
+        return deleted_count
+
+    @classmethod
+    def _queue_delete_objects(
+        cls: Type[T],
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        objects: list[T],
+    ) -> int:
+        """
+            Добавление в pipeline команд удаления объектов модели, включая удаление
+              из индексов значений полей (значения объектов и последние индексированные значения,
+              см. _read_indexed_values)
+            Результат - количество добавленных команд
+        """
+        commands_count: int = cls._queue_delete_tables(pipe=pipe, tables=[obj._table.encode() for obj in objects])
+        for obj in objects:
+            for field, is_numeric in cls._indexes.items():
+                values: list[Any] = [obj._params.get(field)]
+                if field in obj._replaced_values:
+                    # Объект изменён после получения: в индексе записано прежнее значение
+                    values.append(obj._replaced_values[field])
+                for value in dict.fromkeys(str(value) for value in values if value is not None):
+                    if not is_numeric:
+                        pipe.srem(get_value_index_key(table=cls.Meta.table, field=field, value=value), obj._table)
+                        commands_count += 1
+        return commands_count
+
+    @classmethod
+    def _queue_delete_value_indexes(
+        cls: Type[T],
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        tables: list[bytes],
+        rows: list[Optional[bytes]],
+        indexed_values: list[dict[str, str]],
+    ) -> int:
+        """
+            Добавление в pipeline команд удаления префиксов записей из индексов значений полей (SREM)
+              по значениям полей из БД (rows - строки значений, см. _get_db_rows) и последним
+              индексированным значениям (indexed_values, см. _parse_indexed_values)
+            Результат - количество добавленных команд
+        """
+        fields: tuple[str, ...] = cls._schema.fields
+        commands_count: int = 0
+        for position, table in enumerate(tables):
+            row: list[Optional[bytes]] = rows[position * len(fields):(position + 1) * len(fields)]
+            for field, is_numeric in cls._indexes.items():
+                # Индексы числовых полей очищаются в _queue_delete_tables
+                if is_numeric:
+                    continue
+                raw_value: Optional[bytes] = row[fields.index(field)]
+                values: list[str] = [indexed_values[position][field]] if field in indexed_values[position] else []
+                if raw_value is not None:
+                    values.append(str(cls._schema.decoders[field](raw_value)))
+                for value in dict.fromkeys(values):
+                    pipe.srem(get_value_index_key(table=cls.Meta.table, field=field, value=value), table)
+                    commands_count += 1
+        return commands_count
+
+    @classmethod
+    def _has_value_indexes(cls: Type[T]) -> bool:
+        """ Модель содержит индексы значений полей (set для каждого значения) """
+        return any(not is_numeric for is_numeric in cls._indexes.values())
+
+    @classmethod
+    def _queue_indexed_values(
+        cls: Type[T],
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        tables: list[Union[str, bytes]],
+    ) -> int:
+        """
+            Добавление в pipeline команд получения последних индексированных значений полей записей
+              (HMGET обратных записей индексов значений); результат - количество добавленных команд
+        """
+        fields: list[str] = [field for field, is_numeric in cls._indexes.items() if not is_numeric]
+        for field in fields:
+            pipe.hmget(get_indexed_values_key(table=cls.Meta.table, field=field), tables)
+        return len(fields)
+
+    @classmethod
+    def _parse_indexed_values(cls: Type[T], replies: list[list[Optional[bytes]]]) -> list[dict[str, str]]:
+        """ Последние индексированные значения полей каждой записи по ответам _queue_indexed_values """
+        fields: list[str] = [field for field, is_numeric in cls._indexes.items() if not is_numeric]
+        return [
+            {field: value.decode() for field, value in zip(fields, values) if value is not None}
+                for values in zip(*replies)
+        ]
+
+    @staticmethod
+    def _queue_objects_indexed_values(
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        objects: Iterable[RedisItem],
+    ) -> list[tuple[list[RedisItem], int]]:
+        """
+            Добавление в pipeline команд получения последних индексированных значений полей объектов
+              (моделей с индексами значений); результат - объекты и количество команд каждой модели
+        """
+        objects_by_model: dict[Type[RedisItem], list[RedisItem]] = {}
+        for obj in objects:
+            objects_by_model.setdefault(type(obj), []).append(obj)
+        return [
+            (model_objects, model._queue_indexed_values(pipe=pipe, tables=[obj._table for obj in model_objects]))
+                for model, model_objects in objects_by_model.items()
+        ]
+
+    @staticmethod
+    def _put_indexed_values(segments: list[tuple[list[RedisItem], int]], replies: list[Any]) -> None:
+        """
+            Запоминание последних индексированных значений полей объектов как значений до изменения
+              (см. _replaced_values): при записи и удалении префикс записи удаляется из set этих значений,
+              в том числе после перезаписи записи новым объектом
+        """
+        offset: int = 0
+        for model_objects, commands_count in segments:
+            model: Type[RedisItem] = type(model_objects[0])
+            for obj, indexed_values in zip(
+                model_objects,
+                model._parse_indexed_values(replies=replies[offset:offset + commands_count]),
+            ):
+                if indexed_values:
+                    object.__setattr__(obj, "_replaced", {**obj._replaced_values, **indexed_values})
+            offset += commands_count
+
+    @staticmethod
+    def _read_indexed_values(db_instance: redis.Redis, objects: Iterable[RedisItem]) -> None:
+        """
+            Получение последних индексированных значений полей объектов моделей с индексами значений
+              одним pipeline (см. _put_indexed_values); для остальных объектов запрос не выполняется
+        """
+        indexed_objects: list[RedisItem] = [obj for obj in objects if obj._has_value_indexes()]
+        if not indexed_objects:
+            return
+        pipe: redis.client.Pipeline = db_instance.pipeline(transaction=False)
+        segments: list[tuple[list[RedisItem], int]] = RedisItem._queue_objects_indexed_values(
+            pipe=pipe,
+            objects=indexed_objects,
+        )
+        RedisItem._put_indexed_values(segments=segments, replies=pipe.execute())
+
+    @staticmethod
+    async def _aread_indexed_values(db_instance: redis.asyncio.Redis, objects: Iterable[RedisItem]) -> None:
+        """ Получение последних индексированных значений полей объектов (asyncio), см. _read_indexed_values """
+        indexed_objects: list[RedisItem] = [obj for obj in objects if obj._has_value_indexes()]
+        if not indexed_objects:
+            return
+        pipe: redis.asyncio.client.Pipeline = db_instance.pipeline(transaction=False)
+        segments: list[tuple[list[RedisItem], int]] = RedisItem._queue_objects_indexed_values(
+            pipe=pipe,
+            objects=indexed_objects,
+        )
+        RedisItem._put_indexed_values(segments=segments, replies=await pipe.execute())
+
+    def _on_error_actions(self, exception: Exception) -> None:
+        """
+            Действия, выполняющиеся в случае возникновения исключения
+                во время вставки, сохранения, получения данных из БД
+        """
+        logging.exception(exception)
+
+    async def asave(
+        self,
+        ttl: Optional[float] = None,
+        update_fields: Optional[Iterable[str]] = None,
+    ) -> OperationResult:
+        """ Одиночная вставка (asyncio), ttl и update_fields - см. save() """
+        if not self._async_db_instance:
+            raise Exception("Redis database (asyncio) not connected...")
+        try:
+            fields: Optional[tuple[str, ...]] = self._get_update_fields(update_fields=update_fields)
+            mapping: dict[_Key, _Value] = self._get_mapping(fields=fields)
+            cleared_fields: tuple[str, ...] = self._get_cleared_fields(fields=fields)
+            if self._indexes or self._registry or ttl or self._ttl or cleared_fields:
+                await self._aread_indexed_values(db_instance=self._async_db_instance, objects=[self])
+                pipe: redis.asyncio.client.Pipeline = self._async_db_instance.pipeline()
+                self._queue_save(pipe=pipe, ttl=ttl, fields=fields, mapping=mapping, cleared_fields=cleared_fields)
+                await pipe.execute()
+            elif mapping and self._storage == STORAGE_HASH:
+                await self._async_db_instance.hset(self._table, mapping=mapping)
+            elif mapping:
+                await self._async_db_instance.mset(mapping=mapping)
+            self._clear_dirty_fields(fields=fields)
+            self._update_cache(fields=fields, db_instance=self._async_db_instance)
             return OperationResult(status=OperationStatus.success)
         except Exception as exception:
             self._on_error_actions(exception=exception)
@@ -272,3 +1808,142 @@ class RedisItem(StorageItem):
                 status=OperationStatus.failed,
                 message=str(exception),
             )
+
+    @classmethod
+    async def aget(cls: Type[T], **kwargs) -> T:
+        """
+            Получение одного объекта по выбранному фильтру (asyncio)
+
+                await StorageItem.aget(subsystem_id=10, tag_id=55)
+        """
+        result_list: list[T] = await cls.afilter(**kwargs)
+        if not result_list:
+            raise NotFoundException(f"{cls.__name__} item not found...")
+        if len(result_list) > 1:
+            raise MoreThanOneFoundException(f"{cls.__name__} multiple items found...")
+
+        return result_list[0]
+
+    @classmethod
+    async def afilter(
+        cls: Type[T],
+        scan_count: Optional[int] = None,
+        concurrency: int = ASYNC_CONCURRENCY,
+        **kwargs,
+    ) -> list[T]:
+        """
+            Получение объектов по фильтру переданных аргументов (asyncio), например:
+
+                await StorageItem.afilter(subsystem_id__in=[10, 47], tag_id=55)
+
+            Поиск ключей по нескольким паттернам выполняется конкурентно
+              (не более concurrency одновременных SCAN), значения запрашиваются
+              командами MGET одним pipeline
+        """
+        if not cls._async_db_instance:
+            raise Exception("Redis database (asyncio) not connected...")
+        if not len(kwargs):
+            raise Exception(f"{cls.__name__}.afilter() has empty filter. OOM possible.")
+        predicates, kwargs = cls._split_index_predicates(kwargs=kwargs)
+        plan: QueryPlan = cls._get_plan(kwargs=kwargs)
+        tables: Optional[list[str]]
+        if predicates:
+            pipe: redis.asyncio.client.Pipeline = cls._async_db_instance.pipeline(transaction=False)
+            commands_counts: list[int] = cls._queue_index_queries(pipe=pipe, predicates=predicates)
+            tables = cls._get_tables_from_index_replies(
+                commands_counts=commands_counts,
+                replies=await pipe.execute(),
+                plan=plan,
+            )
+        else:
+            tables = plan.tables
+            if tables is None and cls._registry:
+                tables = await cls._aget_tables_by_registry(plan=plan, scan_count=scan_count)
+        cached_objects: list[T] = []
+        items: dict[bytes, bytes]
+        if tables is not None:
+            cached_objects, tables = cls._get_cached_objects(tables=tables, db_instance=cls._async_db_instance)
+            items = await cls._aget_db_items_by_tables(tables=[table.encode() for table in tables])
+        else:
+            keys: list[bytes] = plan.filter_keys(
+                keys=await cls._ascan_keys(
+                    patterns=cls._get_filters_by_plan(plan=plan),
+                    count=scan_count,
+                    concurrency=concurrency,
+                ),
+                with_fields=cls._storage == STORAGE_KEYS,
+            )
+            if cls._storage == STORAGE_KEYS:
+                items = await cls._aget_db_items(keys=keys)
+            else:
+                items = await cls._aget_db_items_by_tables(tables=keys)
+
+        objects: list[T] = cls._objects_from_db_items(items=items)
+        cls._put_to_cache(objects=objects, db_instance=cls._async_db_instance)
+        return cls._match_predicates(objects=cached_objects + objects, predicates=predicates)
+
+    @classmethod
+    async def _aget_tables_by_registry(cls: Type[T], plan: QueryPlan, scan_count: Optional[int] = None) -> list[str]:
+        """ Префиксы записей, совпадающие с паттернами плана выборки, из реестра модели (asyncio) """
+        shards: list[bytes] = []
+        if cls._is_registry_shards_required(plan=plan):
+            shards = sorted(await cls._async_db_instance.smembers(  # type: ignore
+                get_registry_shards_key(table=cls.Meta.table),
+            ))
+        tables: dict[bytes, None] = {}
+        for key, pattern in cls._get_registry_scans(plan=plan, shards=shards):
+            async for table in cls._async_db_instance.sscan_iter(  # type: ignore
+                key,
+                match=pattern,
+                count=scan_count or cls._scan_count,
+            ):
+                tables[table] = None
+        return sorted(table.decode() for table in plan.filter_keys(keys=list(tables)))
+
+    @classmethod
+    async def _ascan_keys(
+        cls: Type[T],
+        patterns: list[str],
+        count: Optional[int] = None,
+        concurrency: int = ASYNC_CONCURRENCY,
+    ) -> list[bytes]:
+        """ Конкурентный инкрементальный поиск ключей по паттернам (asyncio) """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def scan_pattern(pattern: str) -> list[bytes]:
+            async with semaphore:
+                return [
+                    key async for key in cls._async_db_instance.scan_iter(  # type: ignore
+                        match=pattern,
+                        count=count or cls._scan_count,
+                    )
+                ]
+
+        found_keys: list[list[bytes]] = await asyncio.gather(*map(scan_pattern, patterns))
+        return list(dict.fromkeys(itertools.chain.from_iterable(found_keys)))
+
+    @classmethod
+    async def _aget_db_items(cls: Type[T], keys: list[bytes]) -> dict[bytes, bytes]:
+        """ Получение значений ключей за один сетевой запрос (asyncio) """
+        if not keys:
+            return {}
+        pipe: redis.asyncio.client.Pipeline = cls._async_db_instance.pipeline(transaction=False)  # type: ignore
+        for chunk in cls._get_mget_chunks(keys=keys):
+            pipe.mget(chunk)
+        values: list[Optional[bytes]] = list(itertools.chain.from_iterable(await pipe.execute()))
+
+        return cls._get_existing_db_items(keys=keys, values=values)
+
+    @classmethod
+    async def _aget_db_items_by_tables(cls: Type[T], tables: list[bytes]) -> dict[bytes, bytes]:
+        """ Получение значений всех полей модели для переданных префиксов записей (asyncio) """
+        if cls._storage == STORAGE_KEYS:
+            return await cls._aget_db_items(keys=cls._get_keys_by_tables(tables=tables))
+        if cls._storage == STORAGE_BLOB:
+            return cls._get_fields_from_blobs(blobs=await cls._aget_db_items(keys=tables))
+        if not tables:
+            return {}
+        pipe: redis.asyncio.client.Pipeline = cls._async_db_instance.pipeline(transaction=False)  # type: ignore
+        for table in tables:
+            pipe.hmget(table, cls._schema.fields)
+        return cls._get_existing_hash_items(tables=tables, values=await pipe.execute())
@@ -1,58 +1,634 @@
+from __future__ import annotations
+import os
+import itertools
+import zlib
 import redis
+import redis.asyncio
+import redis.cluster
 import logging
+from concurrent.futures import Future
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Type
+from typing import Union
+from typing import Optional
 
 from .redis_item import RedisItem
+from .redis_item import STORAGE_HASH
+from .redis_item import KEYS_DELIMITER
+from .redis_item import BATCH_SIZE
 from .redis_item import T as SubclassItemType
+from .sharding import ShardedRedis
+from .planner import QueryPlan
+from .metrics import PHASE_BUILD
+from .metrics import PHASE_CACHE
+from .metrics import PHASE_ENCODE
+from .metrics import PHASE_FETCH
+from .metrics import PHASE_WRITE
+from .metrics import MetricsHook
+from .metrics import phase
+from .metrics import timed
+from .metrics import track
+from .metrics import record
 from ..operation_result import OperationResult
 from ..operation_result import OperationStatus
 
 from ..storage_orm import StorageORM
 
+# Максимальное количество объектов в одной порции групповой вставки по умолчанию
+BULK_CHUNK_SIZE = 1000
+# Максимальный (оценочный) объём данных одной порции групповой вставки по умолчанию, байт
+BULK_MAX_BYTES = 4 * 1024 * 1024
+# Размер пула подключений по умолчанию (максимальное количество одновременных операций)
+POOL_MAX_CONNECTIONS = 50
+# Время ожидания свободного подключения пула по умолчанию, секунд (None - без ограничения)
+POOL_TIMEOUT = 20.
+# Варианты параллельной групповой вставки: потоки или процессы
+PARALLEL_MODE_THREAD = "thread"
+PARALLEL_MODE_PROCESS = "process"
+
 
 class RedisORM(StorageORM):
-    """ Работа с БД Redis через объектное представление """
-    _pipe: redis.client.Pipeline
-    _client: redis.Redis
+    """
+        Работа с БД Redis через объектное представление
+
+        Подключения к БД выдаются пулом (redis.ConnectionPool): при подключении по host
+          создаётся BlockingConnectionPool на max_connections подключений - операции
+          сверх размера пула ожидают свободное подключение не дольше pool_timeout секунд
+        Каждая операция выполняется в собственном pipeline, поэтому один экземпляр RedisORM
+          (как и глобальное подключение моделей RedisItem) можно использовать из нескольких
+          потоков одновременно: каждый поток занимает отдельное подключение пула
+
+        Несколько узлов: shards - подключения к независимым серверам (ключи распределяются
+          консистентным хешированием), client=RedisCluster - основные узлы кластера
+          (ключи распределяются по слотам); в обоих случаях используется ShardedRedis
+
+        metrics_hooks - обработчики метрик операций RedisORM (bulk_create, bulk_get);
+          метрики также передаются обработчикам, подключенным RedisItem.add_metrics_hook()
+    """
+    _client: Union[redis.Redis, ShardedRedis]
+    _pool: Optional[redis.ConnectionPool]
+    _metrics_hooks: tuple[MetricsHook, ...]
 
     def __init__(
         self,
-        client: redis.Redis = None,
+        client: Union[redis.Redis, redis.cluster.RedisCluster] = None,
         host: str = None,
         port: int = 6379,
         db: int = 0,
+        max_connections: int = POOL_MAX_CONNECTIONS,
+        pool_timeout: Optional[float] = POOL_TIMEOUT,
+        shards: Optional[list[redis.Redis]] = None,
+        metrics_hooks: Iterable[MetricsHook] = (),
     ) -> None:
-        if client:
+        self._metrics_hooks = tuple(metrics_hooks)
+        if shards:
+            self._client = ShardedRedis(clients=shards)
+        elif isinstance(client, redis.cluster.RedisCluster):
+            self._client = ShardedRedis.from_cluster(cluster=client)
+        elif client:
             self._client = client
         elif host:
-            self._client = redis.Redis(host=host, port=port, db=db)
+            self._client = redis.Redis(connection_pool=redis.BlockingConnectionPool(
+                host=host,
+                port=port,
+                db=db,
+                max_connections=max_connections,
+                timeout=pool_timeout,
+            ))
         else:
-            raise Exception(f"StorageORM-init must contains redis_client or host values...")
+            raise Exception("StorageORM-init must contains redis_client or host values...")
 
-        self._pipe = self._client.pipeline()
+        # У ShardedRedis нет общего пула: каждый узел использует пул своего подключения
+        self._pool = None if self.is_sharded else self._client.connection_pool
         if not RedisItem._db_instance:
             RedisItem._set_global_instance(db_instance=self._client)
 
-    def save(self, item: RedisItem) -> OperationResult:
+    @property
+    def pool(self) -> Optional[redis.ConnectionPool]:
+        """ Пул подключений к БД (None для нескольких узлов) """
+        return self._pool
+
+    @property
+    def is_sharded(self) -> bool:
+        """ Данные распределены по нескольким узлам (ShardedRedis) """
+        return isinstance(self._client, ShardedRedis)
+
+    def _get_metrics_hooks(self) -> tuple[MetricsHook, ...]:
+        """ Обработчики метрик операций RedisORM и глобальные обработчики RedisItem """
+        return self._metrics_hooks + RedisItem._metrics_hooks
+
+    def close(self) -> None:
+        """ Закрытие всех подключений пула (всех узлов) """
+        if self._pool is None:
+            self._client.close()
+        else:
+            self._pool.disconnect()
+
+    def save(self, item: RedisItem, ttl: Optional[float] = None) -> OperationResult:
         """ Одиночная вставка """
-        return item.save()
+        return item.save(ttl=ttl)
+
+    def bulk_create(
+        self,
+        items: Iterable[SubclassItemType],
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_bytes: int = BULK_MAX_BYTES,
+        ttl: Optional[float] = None,
+    ) -> OperationResult:
+        """
+            Групповая вставка
+            Объекты (список или генератор) разбиваются на порции не более chunk_size
+              объектов и не более max_bytes (оценочно) данных; поля объектов порции
+              объединяются в одну команду MSET, pipeline выполняется для каждой порции
+            Результат каждой порции доступен в OperationResult.details
+            Для каждой порции используется отдельный pipeline (и подключение пула),
+              поэтому групповые вставки из разных потоков не смешиваются
+            ttl - время жизни записей, секунд (по умолчанию - Meta.ttl моделей), устанавливается
+              командами PEXPIRE в pipeline порции
+        """
+        chunks_results: list[OperationResult] = []
+        with track(hooks=self._get_metrics_hooks(), operation="bulk_create"):
+            chunks: Iterable[_Chunk] = timed(
+                items=get_chunks(items=items, chunk_size=chunk_size, max_bytes=max_bytes),
+                name=PHASE_ENCODE,
+            )
+            try:
+                for index, chunk in enumerate(chunks):
+                    try:
+                        with phase(PHASE_WRITE):
+                            # Прежние значения полей с индексом значений удаляются из индекса при перезаписи
+                            RedisItem._read_indexed_values(db_instance=self._client, objects=chunk.items)
+                            pipe: redis.client.Pipeline = self._client.pipeline()
+                            chunk.queue(pipe=pipe, ttl=ttl)
+                            pipe.execute()
+                        record(keys=chunk.keys_count, size=chunk.size)
+                        chunk.put_to_cache(db_instance=self._client)
+                        chunks_results.append(chunk.get_result(index=index))
+                    except Exception as exception:
+                        self._on_error_actions(exception=exception)
+                        chunks_results.append(chunk.get_result(index=index, exception=exception))
+            except Exception as exception:
+                # Ошибка формирования порции (например, в генераторе объектов)
+                self._on_error_actions(exception=exception)
+                chunks_results.append(OperationResult(status=OperationStatus.failed, message=str(exception)))
+        return get_bulk_result(results=chunks_results)
+
+    def bulk_create_parallel(
+        self,
+        items: Iterable[SubclassItemType],
+        workers: Optional[int] = None,
+        mode: str = PARALLEL_MODE_THREAD,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        max_bytes: int = BULK_MAX_BYTES,
+        ttl: Optional[float] = None,
+    ) -> OperationResult:
+        """
+            Параллельная групповая вставка, например:
+
+                orm.bulk_create_parallel(items=items, workers=4, mode="process")
 
-    def bulk_create(self, items: list[SubclassItemType]) -> OperationResult:
-        """ Групповая вставка """
+            Объекты распределяются по workers частям (shard) по префиксу записи - все записи
+              одного объекта попадают в одну часть; каждая часть формирует данные объектов
+              и записывается (bulk_create) в отдельном потоке или процессе через отдельные
+              pipeline и подключения
+            - mode="thread": части обрабатываются потоками и используют пул подключений RedisORM
+            - mode="process": объекты передаются процессам (модели должны быть доступны
+              для импорта, pickle), каждый процесс создаёт собственное подключение
+              с параметрами пула RedisORM
+            Результат каждой части (с результатами её порций) доступен в OperationResult.details
+            Объекты items полностью считываются (распределяются по частям) до начала записи,
+              поэтому все объекты находятся в памяти одновременно; для потока объектов,
+              не помещающегося в память, - bulk_create() или вызовы по фрагментам потока
+            Для нескольких узлов (ShardedRedis) поддерживается только mode="thread"
+        """
+        if mode not in (PARALLEL_MODE_THREAD, PARALLEL_MODE_PROCESS):
+            raise ValueError(f"RedisORM.bulk_create_parallel() mode has unknown value: {mode}...")
+        if mode == PARALLEL_MODE_PROCESS and self.is_sharded:
+            raise ValueError(f"RedisORM.bulk_create_parallel() mode=\"{mode}\" is not supported for shards...")
+        workers = workers or os.cpu_count() or 1
+        shards: list[list[SubclassItemType]] = [[] for _ in range(workers)]
         try:
-            for redis_item in items:
-                self._pipe.mset(mapping=redis_item.mapping)
-            self._pipe.execute()
-            return OperationResult(status=OperationStatus.success)
+            for item in items:
+                shards[zlib.crc32(item._table.encode()) % workers].append(item)
+        except Exception as exception:
+            # Ошибка формирования объектов (например, в генераторе объектов)
+            self._on_error_actions(exception=exception)
+            return OperationResult(status=OperationStatus.failed, message=str(exception))
+        shards = [shard for shard in shards if shard]
+
+        shards_results: list[OperationResult] = []
+        executor: Executor
+        futures: list[Future]
+        if mode == PARALLEL_MODE_THREAD:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            futures = [executor.submit(self.bulk_create, shard, chunk_size, max_bytes, ttl) for shard in shards]
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            connection_params: tuple[type, dict[str, Any]] = self._get_connection_params()
+            futures = [
+                executor.submit(_bulk_create_shard, connection_params, shard, chunk_size, max_bytes, ttl)
+                    for shard in shards
+            ]
+        with executor:
+            for index, (shard, future) in enumerate(zip(shards, futures)):
+                shard_message: str = f"shard={index}, items={len(shard)}"
+                try:
+                    shard_result: OperationResult = future.result()
+                except Exception as exception:
+                    self._on_error_actions(exception=exception)
+                    shard_result = OperationResult(status=OperationStatus.failed, message=str(exception))
+                if shard_result.ok and mode == PARALLEL_MODE_PROCESS:
+                    # Локальные кеши моделей текущего процесса обновляются после записи
+                    _Chunk.put_items_to_cache(items=shard, db_instance=self._client)
+                shards_results.append(OperationResult(
+                    status=shard_result.status,
+                    message=shard_message if shard_result.ok else f"{shard_message}, error={shard_result.message}",
+                    details=shard_result.details,
+                ))
+        return get_bulk_result(results=shards_results)
+
+    def _get_connection_params(self) -> tuple[type, dict[str, Any]]:
+        """
+            Класс и параметры подключений пула для создания подключения в другом процессе
+              (передаются только простые значения, служебные объекты пула не копируются)
+        """
+        return self._pool.connection_class, {
+            key: value
+                for key, value in self._pool.connection_kwargs.items()
+                    if isinstance(value, (str, bytes, int, float, bool, type(None)))
+        }
+
+    def bulk_get(
+        self,
+        items: Iterable[Union[RedisItem, Mapping[str, Any]]],
+        model: Optional[Type[SubclassItemType]] = None,
+    ) -> list[Optional[SubclassItemType]]:
+        """
+            Групповое получение объектов по префиксам записей за один сетевой запрос, например:
+
+                orm.bulk_get(items=[item1, item2])
+                orm.bulk_get(items=[{"subsystem_id": 3, "tag_id": 15}, ...], model=ExampleItem)
+
+            Для каждого объекта (или словаря значений параметров Meta.table модели model)
+              формируются ключи записи без поиска; значения всех записей запрашиваются одним
+              pipeline (MGET по MGET_CHUNK_SIZE ключей, HMGET для каждого hash)
+            Результат - объекты в порядке запроса, None - запись отсутствует в БД
+        """
+        with track(hooks=self._get_metrics_hooks(), operation="bulk_get", model=model.__name__ if model else ""):
+            return self._bulk_get(items=items, model=model)
+
+    def _bulk_get(
+        self,
+        items: Iterable[Union[RedisItem, Mapping[str, Any]]],
+        model: Optional[Type[SubclassItemType]] = None,
+    ) -> list[Optional[SubclassItemType]]:
+        requests: list[tuple[Type[RedisItem], str]] = []
+        for item in items:
+            if isinstance(item, RedisItem):
+                requests.append((type(item), item._table))
+            elif model is None:
+                raise ValueError("RedisORM.bulk_get() model must be defined to get objects by Meta.table values...")
+            else:
+                requests.append((model, model._schema.build_table(item)))
+        # Префиксы записей (без повторов), сгруппированные по моделям
+        tables_by_model: dict[Type[RedisItem], dict[str, None]] = {}
+        for item_model, table in requests:
+            tables_by_model.setdefault(item_model, {})[table] = None
+
+        found_objects: dict[tuple[Type[RedisItem], str], RedisItem] = {}
+        queued_models: list[tuple[Type[RedisItem], list[bytes], int]] = []
+        pipe: redis.client.Pipeline = self._client.pipeline(transaction=False)
+        for item_model, tables in tables_by_model.items():
+            # Объекты из локального кеша модели не запрашиваются из БД
+            with phase(PHASE_CACHE):
+                cached_objects, missed_tables = item_model._get_cached_objects(
+                    tables=list(tables),
+                    db_instance=self._client,
+                )
+            found_objects.update({(item_model, obj._table): obj for obj in cached_objects})
+            if missed_tables:
+                encoded_tables: list[bytes] = [table.encode() for table in missed_tables]
+                commands_count: int = item_model._queue_db_rows(pipe=pipe, tables=encoded_tables)
+                queued_models.append((item_model, encoded_tables, commands_count))
+        replies: list[Any] = []
+        if queued_models:
+            with phase(PHASE_FETCH):
+                replies = pipe.execute()
+            record(keys=sum(len(encoded_tables) for _, encoded_tables, _ in queued_models), payload=replies)
+
+        offset: int = 0
+        with phase(PHASE_BUILD):
+            for item_model, encoded_tables, commands_count in queued_models:
+                objects: list[RedisItem] = item_model._objects_from_db_rows(
+                    tables=encoded_tables,
+                    values=item_model._parse_db_rows(replies=replies[offset:offset + commands_count]),
+                )
+                offset += commands_count
+                item_model._put_to_cache(objects=objects, db_instance=self._client)
+                found_objects.update({(item_model, obj._table): obj for obj in objects})
+
+        return [found_objects.get(request) for request in requests]  # type: ignore
+
+    def purge(
+        self,
+        model: Type[RedisItem],
+        chunk_size: int = BATCH_SIZE,
+        scan_count: Optional[int] = None,
+        **kwargs,
+    ) -> OperationResult:
+        """
+            Удаление объектов модели по параметрам Meta.table, например:
+
+                orm.purge(model=ExampleItem, subsystem_id=3)
+
+            Префиксы записей формируются без поиска, берутся из реестра модели (SSCAN)
+              или ищутся инкрементально (SCAN); ключи удаляются порциями по chunk_size
+              объектов - одним pipeline с неблокирующими командами UNLINK на порцию
+            Результат - количество удалённых объектов (message="purged=N")
+        """
+        predicates, kwargs = model._split_index_predicates(kwargs=kwargs)
+        if predicates:
+            raise ValueError("RedisORM.purge() filters by Meta.table parameters only, use filter(...).delete()...")
+        purged_count: int = 0
+        try:
+            tables_batch: list[bytes] = []
+            for table in model._iter_tables(kwargs=kwargs, scan_count=scan_count, db_instance=self._client):
+                tables_batch.append(table)
+                if len(tables_batch) >= chunk_size:
+                    purged_count += self._purge_tables(model=model, tables=tables_batch)
+                    tables_batch = []
+            if tables_batch:
+                purged_count += self._purge_tables(model=model, tables=tables_batch)
+            return OperationResult(status=OperationStatus.success, message=f"purged={purged_count}")
         except Exception as exception:
             self._on_error_actions(exception=exception)
             return OperationResult(
                 status=OperationStatus.failed,
-                message=str(exception),
+                message=f"purged={purged_count}, error={exception}",
             )
 
+    def _purge_tables(self, model: Type[RedisItem], tables: list[bytes]) -> int:
+        """
+            Удаление порции объектов одним pipeline, результат - количество удалённых объектов
+            Для модели с индексами значений полей значения записей и последние индексированные
+              значения предварительно запрашиваются (одним pipeline), чтобы удалить префиксы
+              записей из индексов этих значений
+        """
+        pipe: redis.client.Pipeline = self._client.pipeline(transaction=False)
+        rows: list[Optional[bytes]] = []
+        indexed_values: list[dict[str, str]] = []
+        if model._has_value_indexes():
+            commands_count: int = model._queue_db_rows(pipe=pipe, tables=tables)
+            model._queue_indexed_values(pipe=pipe, tables=tables)
+            replies: list[Any] = pipe.execute()
+            rows = model._parse_db_rows(replies=replies[:commands_count])
+            indexed_values = model._parse_indexed_values(replies=replies[commands_count:])
+            pipe = self._client.pipeline(transaction=False)
+        model._queue_delete_tables(pipe=pipe, tables=tables)
+        if indexed_values:
+            model._queue_delete_value_indexes(pipe=pipe, tables=tables, rows=rows, indexed_values=indexed_values)
+        return sum(1 for deleted in pipe.execute()[:len(tables)] if deleted)
+
+    def bulk_delete(self, items: Iterable[RedisItem], chunk_size: int = BULK_CHUNK_SIZE) -> OperationResult:
+        """
+            Групповое удаление объектов (в том числе разных моделей), например:
+
+                orm.bulk_delete(items=ExampleItem.filter(subsystem_id=3))
+
+            Объекты удаляются порциями по chunk_size - одним pipeline с командами UNLINK
+              ключей записей и удаления из индексов и реестров на порцию
+            Результат - количество удалённых объектов (message="deleted=N")
+        """
+        deleted_count: int = 0
+        try:
+            items_batch: list[RedisItem] = []
+            for item in items:
+                items_batch.append(item)
+                if len(items_batch) >= chunk_size:
+                    deleted_count += RedisItem._delete_objects(db_instance=self._client, objects=items_batch)
+                    items_batch = []
+            if items_batch:
+                deleted_count += RedisItem._delete_objects(db_instance=self._client, objects=items_batch)
+            return OperationResult(status=OperationStatus.success, message=f"deleted={deleted_count}")
+        except Exception as exception:
+            self._on_error_actions(exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=f"deleted={deleted_count}, error={exception}",
+            )
+
+    def migrate_to_hash(
+        self,
+        model: Type[RedisItem],
+        batch_size: int = BATCH_SIZE,
+        **kwargs,
+    ) -> OperationResult:
+        """
+            Перенос объектов модели с хранением в hash (Meta.storage = "hash") из отдельных
+              ключей полей (исходный вариант хранения) в hash, например:
+
+                orm.migrate_to_hash(model=ExampleItem, subsystem_id=3)
+
+            Ключи полей ищутся инкрементально (SCAN); для каждой порции из batch_size объектов
+              значения запрашиваются одним pipeline команд MGET по MGET_CHUNK_SIZE ключей,
+              затем одним pipeline записываются hash и удаляются (UNLINK) исходные ключи
+        """
+        if model._storage != STORAGE_HASH:
+            raise Exception(f"{model.__name__}.Meta.storage must be \"{STORAGE_HASH}\" for migration...")
+        migrated_count: int = 0
+        try:
+            seen_tables: set[bytes] = set()
+            tables_batch: list[bytes] = []
+            plan: QueryPlan = model._get_plan(kwargs=kwargs)
+            for pattern in model._get_filters_by_plan(plan=plan):
+                keys: Iterator[bytes] = self._client.scan_iter(
+                    match=pattern + KEYS_DELIMITER + "*",
+                    count=model._scan_count,
+                    _type="string",
+                )
+                for key in keys:
+                    table: bytes = key.rsplit(KEYS_DELIMITER.encode(), 1)[0]
+                    if table in seen_tables or (plan.filters and not plan.match_table(table.decode())):
+                        continue
+                    seen_tables.add(table)
+                    tables_batch.append(table)
+                    if len(tables_batch) >= batch_size:
+                        migrated_count += self._migrate_tables_to_hash(model=model, tables=tables_batch)
+                        tables_batch = []
+            if tables_batch:
+                migrated_count += self._migrate_tables_to_hash(model=model, tables=tables_batch)
+            return OperationResult(status=OperationStatus.success, message=f"migrated={migrated_count}")
+        except Exception as exception:
+            self._on_error_actions(exception=exception)
+            return OperationResult(
+                status=OperationStatus.failed,
+                message=f"migrated={migrated_count}, error={exception}",
+            )
+
+    def _migrate_tables_to_hash(self, model: Type[RedisItem], tables: list[bytes]) -> int:
+        """ Перенос порции объектов из отдельных ключей полей в hash """
+        fields: tuple[str, ...] = model._schema.fields
+        keys: list[bytes] = model._get_keys_by_tables(tables=tables)
+        # Значения запрашиваются командами MGET по MGET_CHUNK_SIZE ключей (как в bulk_get)
+        pipe: redis.client.Pipeline = self._client.pipeline(transaction=False)
+        for keys_chunk in model._get_mget_chunks(keys=keys):
+            pipe.mget(keys_chunk)
+        values: list[Any] = list(itertools.chain.from_iterable(pipe.execute()))
+        pipe = self._client.pipeline(transaction=False)
+        migrated_count: int = 0
+        for index, table in enumerate(tables):
+            table_keys: list[bytes] = keys[index * len(fields):(index + 1) * len(fields)]
+            table_values: list[Any] = values[index * len(fields):(index + 1) * len(fields)]
+            mapping: dict[str, Any] = {
+                field: value
+                    for field, value in zip(fields, table_values)
+                        if value is not None
+            }
+            if not mapping:
+                continue
+            pipe.hset(table, mapping=mapping)
+            pipe.unlink(*[key for key, value in zip(table_keys, table_values) if value is not None])
+            migrated_count += 1
+        pipe.execute()
+        return migrated_count
+
     def _on_error_actions(self, exception: Exception) -> None:
         """
             Действия, выполняющиеся в случае возникновения исключения
                 во время вставки, сохранения, получения данных из БД
         """
         logging.exception(exception)
+
+
+class _Chunk:
+    """
+        Порция групповой вставки: объекты порции и их объединённые поля
+          (поля объектов, хранящихся в hash, - отдельно по ключу записи)
+    """
+    items: list[RedisItem]
+    mapping: dict[Any, Any]
+    hashes: dict[str, dict[Any, Any]]
+    count: int
+    size: int
+
+    def __init__(self) -> None:
+        self.items = []
+        self.mapping = {}
+        self.hashes = {}
+        self.count = 0
+        self.size = 0
+
+    def add(self, item: RedisItem, mapping: dict[Any, Any], size: int) -> None:
+        self.items.append(item)
+        if item._storage == STORAGE_HASH:
+            self.hashes.setdefault(item._table, {}).update(mapping)
+        else:
+            self.mapping.update(mapping)
+        self.count += 1
+        self.size += size
+
+    @property
+    def keys_count(self) -> int:
+        """ Количество записываемых ключей (полей hash) порции """
+        return len(self.mapping) + sum(map(len, self.hashes.values()))
+
+    def queue(
+        self,
+        pipe: Union[redis.client.Pipeline, redis.asyncio.client.Pipeline],
+        ttl: Optional[float] = None,
+    ) -> None:
+        """
+            Добавление команд записи порции в pipeline: одна MSET, HSET для каждого hash,
+              PEXPIRE (ttl или Meta.ttl) и команды обновления индексов (Meta.indexes)
+              и реестров (Meta.registry) объектов
+        """
+        if ttl is not None:
+            # Проверка времени жизни до добавления команд записи (см. RedisItem._get_ttl)
+            for item in self.items:
+                item._get_ttl(ttl=ttl)
+        if self.mapping:
+            pipe.mset(mapping=self.mapping)
+        for name, mapping in self.hashes.items():
+            if mapping:
+                pipe.hset(name, mapping=mapping)
+        for item in self.items:
+            item._queue_expire(pipe=pipe, ttl=ttl)
+            item._queue_index_updates(pipe=pipe)
+            item._queue_registry_update(pipe=pipe)
+
+    def get_result(self, index: int, exception: Optional[Exception] = None) -> OperationResult:
+        """ Результат записи порции с номером index (exception - ошибка записи) """
+        message: str = f"chunk={index}, items={self.count}"
+        if exception is None:
+            return OperationResult(status=OperationStatus.success, message=message)
+        return OperationResult(status=OperationStatus.failed, message=f"{message}, error={exception}")
+
+    def put_to_cache(self, db_instance: Any) -> None:
+        """ Обновление локальных кешей моделей (для подключения db_instance) записанными объектами """
+        self.put_items_to_cache(items=self.items, db_instance=db_instance)
+
+    @staticmethod
+    def put_items_to_cache(items: Iterable[RedisItem], db_instance: Any) -> None:
+        for item in items:
+            item._clear_dirty_fields()
+            item._put_to_cache(objects=[item], db_instance=db_instance)
+
+
+def get_chunks(items: Iterable[RedisItem], chunk_size: int, max_bytes: int) -> Iterator[_Chunk]:
+    """
+        Разбиение объектов на порции групповой вставки (RedisORM.bulk_create, AsyncRedisORM.abulk_create):
+          не более chunk_size объектов и не более max_bytes (оценочно) данных в порции
+    """
+    chunk: _Chunk = _Chunk()
+    for redis_item in items:
+        item_mapping: dict[Any, Any] = dict(redis_item.mapping)
+        item_size: int = _get_mapping_size(mapping=item_mapping)
+        if chunk.count and (chunk.count >= chunk_size or chunk.size + item_size > max_bytes):
+            yield chunk
+            chunk = _Chunk()
+        chunk.add(item=redis_item, mapping=item_mapping, size=item_size)
+    if chunk.count:
+        yield chunk
+
+
+def get_bulk_result(results: list[OperationResult]) -> OperationResult:
+    """ Общий результат групповой вставки по результатам порций (частей) """
+    failed_results: list[OperationResult] = [result for result in results if not result.ok]
+    return OperationResult(
+        status=OperationStatus.failed if failed_results else OperationStatus.success,
+        message="; ".join(result.message for result in failed_results),
+        details=results,
+    )
+
+
+def _bulk_create_shard(
+    connection_params: tuple[type, dict[str, Any]],
+    items: list[RedisItem],
+    chunk_size: int,
+    max_bytes: int,
+    ttl: Optional[float] = None,
+) -> OperationResult:
+    """ Групповая вставка части объектов в отдельном процессе через собственное подключение """
+    connection_class, connection_kwargs = connection_params
+    client: redis.Redis = redis.Redis(connection_pool=redis.ConnectionPool(
+        connection_class=connection_class,
+        **connection_kwargs,
+    ))
+    try:
+        return RedisORM(client=client).bulk_create(items=items, chunk_size=chunk_size, max_bytes=max_bytes, ttl=ttl)
+    finally:
+        client.close()
+
+
+def _get_mapping_size(mapping: dict[Any, Any]) -> int:
+    """ Оценка объёма данных полей объекта, байт """
+    return sum(
+        len(key) + (len(value) if isinstance(value, (bytes, str)) else len(str(value)))
+            for key, value in mapping.items()
+    )
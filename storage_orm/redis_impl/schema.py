@@ -0,0 +1,138 @@
+from __future__ import annotations
+import string
+from typing import Any
+from typing import Union
+from typing import Mapping
+from typing import Callable
+from typing import Optional
+
+from .codecs import Codec
+from .codecs import TextCodec
+from .codecs import get_codec
+
+# Разделитель частей префикса записи и имени поля в ключе
+KEYS_DELIMITER = "."
+# Значение параметра Meta.table, не переданного в фильтр
+WILDCARD = "*"
+# Границы hash tag (Redis Cluster): слот ключа вычисляется только по части ключа внутри скобок
+HASH_TAG_START = "{"
+HASH_TAG_END = "}"
+
+
+class ModelSchema:
+    """
+        Скомпилированная схема модели: всё, что не меняется между вызовами
+          и вычисляется один раз во время объявления модели
+        - table: шаблон префикса записи (при hash_tag - Meta.table в скобках hash tag,
+          например, "{subsystem.3.tag.15}" - все ключи записи попадают в один слот кластера)
+        - placeholders: параметры Meta.table в порядке следования
+        - table_keys: позиции параметров Meta.table среди частей префикса записи
+        - table_slice: часть префикса записи без скобок hash tag (для разбора на части)
+        - build_table: скомпилированное формирование префикса записи из аргументов
+        - fields: поля модели в порядке объявления
+        - attributes: атрибуты объекта (параметры Meta.table и поля) - __slots__ компактной модели
+        - field_suffixes: окончания ключей полей (".поле") для формирования ключей
+        - decoders/encoders: функции декодирования/кодирования значения поля
+          (None в encoders - значение записывается как есть)
+    """
+    table: str
+    placeholders: tuple[str, ...]
+    table_keys: dict[str, int]
+    table_slice: slice
+    build_table: Callable[[Mapping[str, Any]], str]
+    fields: tuple[str, ...]
+    attributes: tuple[str, ...]
+    field_suffixes: tuple[bytes, ...]
+    codecs: dict[str, Codec]
+    decoders: dict[str, Callable[[bytes], Any]]
+    encoders: dict[str, Optional[Callable[[Any], Any]]]
+    _filter_templates: dict[frozenset, str]
+
+    def __init__(
+        self,
+        table: str,
+        annotations: Mapping[str, Any],
+        default_codec: Union[str, Codec],
+        field_codecs: Mapping[str, Union[str, Codec]],
+        hash_tag: bool = False,
+    ) -> None:
+        self.table = HASH_TAG_START * 2 + table + HASH_TAG_END * 2 if hash_tag else table
+        self.placeholders = tuple(dict.fromkeys(
+            field_name
+                for _, field_name, _, _ in string.Formatter().parse(table)
+                    if field_name is not None
+        ))
+        self.table_keys = {
+            part.replace("{", "").replace("}", ""): position
+                for position, part in enumerate(table.split(KEYS_DELIMITER))
+                    if part.startswith("{") and part.endswith("}")
+        }
+        self.table_slice = slice(1, -1) if hash_tag else slice(None)
+        self.build_table = _compile_table_builder(table=self.table)
+        self.fields = tuple(annotations)
+        self.attributes = tuple(dict.fromkeys(
+            attribute
+                for attribute in (*self.placeholders, *self.fields)
+                    if attribute.isidentifier()
+        ))
+        self.field_suffixes = tuple((KEYS_DELIMITER + field).encode() for field in self.fields)
+        self.codecs = {
+            field: get_codec(codec=field_codecs.get(field, default_codec), field_type=field_type)
+                for field, field_type in annotations.items()
+        }
+        self.decoders = {field: _get_decoder(codec=codec) for field, codec in self.codecs.items()}
+        self.encoders = {
+            field: None if isinstance(codec, TextCodec) else codec.encode
+                for field, codec in self.codecs.items()
+        }
+        self._filter_templates = {}
+
+    def split_table(self, table: str) -> list[str]:
+        """ Части префикса записи (без скобок hash tag) """
+        return table[self.table_slice].split(KEYS_DELIMITER)
+
+    def get_filter_template(self, bound_keys: frozenset) -> str:
+        """
+            Шаблон паттерна поиска, в котором параметры Meta.table, отсутствующие
+              в bound_keys, заменены на WILDCARD (кешируется для каждого набора параметров)
+        """
+        template: Optional[str] = self._filter_templates.get(bound_keys)
+        if template is None:
+            template = self.table
+            for placeholder in self.placeholders:
+                if placeholder not in bound_keys:
+                    template = template.replace(f"{{{placeholder}}}", WILDCARD)
+            self._filter_templates[bound_keys] = template
+        return template
+
+
+def _get_decoder(codec: Codec) -> Callable[[bytes], Any]:
+    """ Функция декодирования значения поля (для текстового формата - без обёртки кодека) """
+    if isinstance(codec, TextCodec):
+        return bytes.decode if codec.field_type is str else codec.field_type
+    return codec.decode
+
+
+def _compile_table_builder(table: str) -> Callable[[Mapping[str, Any]], str]:
+    """
+        Формирование префикса записи из шаблона Meta.table: литеральные части и имена параметров
+          разбираются один раз, префикс записи - соединение частей со значениями параметров
+        Для шаблонов с нестандартными параметрами (индексы, атрибуты, преобразования,
+          спецификации формата) используется str.format_map
+    """
+    parts: list[tuple[str, str]] = []
+    # Литеральная часть перед следующим параметром (экранированные скобки разбираются отдельными частями)
+    tail: str = ""
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(table):
+        tail += literal
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or format_spec or conversion:
+            return table.format_map
+        parts.append((tail, field_name))
+        tail = ""
+
+    def build_table(kwargs: Mapping[str, Any]) -> str:
+        return "".join([literal + format(kwargs[field_name]) for literal, field_name in parts]) + tail
+
+    return build_table
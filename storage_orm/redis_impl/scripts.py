@@ -0,0 +1,209 @@
+from __future__ import annotations
+import hashlib
+import redis
+from typing import Any
+from typing import Iterable
+from typing import Optional
+from typing import NamedTuple
+
+# Источник префиксов записей скрипта выборки: поиск по паттернам (SCAN) или переданные префиксы
+SCRIPT_MODE_SCAN = "scan"
+SCRIPT_MODE_TABLES = "tables"
+# Тип значения условия скрипта: число (сравнение после tonumber) или строка
+SCRIPT_NUMBER = "n"
+SCRIPT_STRING = "s"
+
+# Выборка объектов на стороне сервера: префиксы записей (SCAN MATCH или переданные),
+#   значения полей (MGET, HMGET, GET) и отбор по условиям выполняются одним вызовом,
+#   результат - плоский массив [ключ поля (префикс записи для blob), значение, ...]
+# ARGV: режим, вариант хранения, COUNT, паттерны (префиксы записей), поля, условия;
+#   списки передаются как количество элементов и элементы, условие - номер поля,
+#   тип значения, оператор и список значений
+FILTER_SCRIPT_SOURCE = """
+local mode, storage, count = ARGV[1], ARGV[2], ARGV[3]
+local position = 4
+
+local function read_list()
+    local size = tonumber(ARGV[position])
+    local list = {}
+    for index = 1, size do
+        list[index] = ARGV[position + index]
+    end
+    position = position + size + 1
+    return list
+end
+
+local sources = read_list()
+local fields = read_list()
+local predicates = {}
+local predicates_count = tonumber(ARGV[position])
+position = position + 1
+for index = 1, predicates_count do
+    local field_index, kind, operator = tonumber(ARGV[position]), ARGV[position + 1], ARGV[position + 2]
+    position = position + 3
+    local values = read_list()
+    if kind == "n" then
+        for value_index = 1, #values do
+            values[value_index] = tonumber(values[value_index])
+        end
+    end
+    predicates[index] = {field_index, kind, operator, values}
+end
+
+local function match(value, predicate)
+    if not value then
+        return false
+    end
+    local kind, operator, values = predicate[2], predicate[3], predicate[4]
+    if kind == "n" then
+        value = tonumber(value)
+        if not value then
+            return false
+        end
+    end
+    if operator == "gt" then
+        return value > values[1]
+    elseif operator == "gte" then
+        return value >= values[1]
+    elseif operator == "lt" then
+        return value < values[1]
+    elseif operator == "lte" then
+        return value <= values[1]
+    end
+    for _, expected in ipairs(values) do
+        if value == expected then
+            return true
+        end
+    end
+    return false
+end
+
+local tables = sources
+if mode == "scan" then
+    tables = {}
+    local seen = {}
+    local key_type = storage == "hash" and "hash" or "string"
+    for _, pattern in ipairs(sources) do
+        local cursor = "0"
+        repeat
+            local reply = redis.call("SCAN", cursor, "MATCH", pattern, "COUNT", count, "TYPE", key_type)
+            cursor = reply[1]
+            for _, key in ipairs(reply[2]) do
+                local table_name = key
+                if storage == "keys" then
+                    table_name = string.match(key, "^(.*)%.[^%.]*$")
+                end
+                if table_name and not seen[table_name] then
+                    seen[table_name] = true
+                    tables[#tables + 1] = table_name
+                end
+            end
+        until cursor == "0"
+    end
+end
+
+local result = {}
+for _, table_name in ipairs(tables) do
+    local values
+    if storage == "blob" then
+        values = {redis.call("GET", table_name)}
+    elseif storage == "hash" then
+        values = redis.call("HMGET", table_name, unpack(fields))
+    else
+        local keys = {}
+        for index, field in ipairs(fields) do
+            keys[index] = table_name .. "." .. field
+        end
+        values = redis.call("MGET", unpack(keys))
+    end
+    local matched = true
+    for _, predicate in ipairs(predicates) do
+        if not match(values[predicate[1]], predicate) then
+            matched = false
+            break
+        end
+    end
+    if matched and storage == "blob" then
+        if values[1] then
+            result[#result + 1] = table_name
+            result[#result + 1] = values[1]
+        end
+    elseif matched then
+        for index, field in ipairs(fields) do
+            if values[index] then
+                result[#result + 1] = table_name .. "." .. field
+                result[#result + 1] = values[index]
+            end
+        end
+    end
+end
+return result
+"""
+
+
+class ScriptPredicate(NamedTuple):
+    """ Условие скрипта выборки: номер поля (с 1), тип значения, оператор, значения """
+    field_index: int
+    kind: str
+    operator: str
+    values: tuple[str, ...]
+
+
+class ServerScript:
+    """
+        Lua-скрипт, выполняемый по SHA1 (EVALSHA): скрипт загружается на сервер (SCRIPT LOAD)
+          только при ответе NOSCRIPT - после перезапуска сервера, SCRIPT FLUSH или при первом
+          вызове на сервере, после чего вызов повторяется
+    """
+    __slots__ = ("source", "sha")
+    source: str
+    sha: str
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.sha = hashlib.sha1(source.encode()).hexdigest()
+
+    def __call__(self, client: redis.Redis, keys: Iterable[Any] = (), args: Iterable[Any] = ()) -> Any:
+        keys = list(keys)
+        args = list(args)
+        try:
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+        except redis.exceptions.NoScriptError:
+            client.script_load(self.source)
+            return client.evalsha(self.sha, len(keys), *keys, *args)
+
+
+FILTER_SCRIPT = ServerScript(source=FILTER_SCRIPT_SOURCE)
+
+
+def get_filter_script_args(
+    storage: str,
+    count: int,
+    fields: Iterable[str],
+    predicates: Iterable[ScriptPredicate],
+    patterns: Optional[list[str]] = None,
+    tables: Optional[list[str]] = None,
+) -> list[Any]:
+    """ ARGV скрипта выборки: поиск по паттернам (patterns) или значения переданных префиксов (tables) """
+    sources: list[str] = tables if tables is not None else patterns or []
+    fields = list(fields)
+    args: list[Any] = [
+        SCRIPT_MODE_TABLES if tables is not None else SCRIPT_MODE_SCAN,
+        storage,
+        count,
+        len(sources),
+        *sources,
+        len(fields),
+        *fields,
+    ]
+    predicates = list(predicates)
+    args.append(len(predicates))
+    for predicate in predicates:
+        args.extend((predicate.field_index, predicate.kind, predicate.operator, len(predicate.values)))
+        args.extend(predicate.values)
+    return args
+
+
+def parse_filter_reply(reply: list[bytes]) -> dict[bytes, bytes]:
+    """ Ключи полей (префиксы записей для blob) и значения из плоского ответа скрипта выборки """
+    return dict(zip(reply[::2], reply[1::2]))
@@ -0,0 +1,304 @@
+from __future__ import annotations
+import bisect
+import threading
+import zlib
+import redis
+import redis.cluster
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from typing import Optional
+from typing import Union
+
+from .schema import HASH_TAG_START
+from .schema import HASH_TAG_END
+
+# Количество виртуальных узлов каждого подключения в кольце консистентного хеширования
+RING_REPLICAS = 128
+# Команды с одним ключом (первый аргумент), выполняются на подключении, которому принадлежит ключ
+KEY_COMMANDS: frozenset[str] = frozenset({
+    "get", "set", "hset", "hmget", "hdel", "pexpire",
+    "zadd", "zrem", "zrangebyscore",
+    "sadd", "srem", "smembers", "sscan",
+})
+
+# Команда подключения: индекс подключения, имя команды, аргументы
+_Command = tuple[int, str, tuple, dict]
+
+
+def get_hash_tag(key: bytes) -> bytes:
+    """
+        Часть ключа, по которой выбирается подключение (слот): содержимое первых скобок
+          hash tag, если оно не пустое (как в Redis Cluster), иначе весь ключ
+    """
+    start: int = key.find(HASH_TAG_START.encode())
+    if start != -1:
+        end: int = key.find(HASH_TAG_END.encode(), start + 1)
+        if end > start + 1:
+            return key[start + 1:end]
+    return key
+
+
+class HashRing:
+    """
+        Кольцо консистентного хеширования: при добавлении подключения переносится
+          только часть ключей (~1/N), а не все ключи, как при остатке от деления
+    """
+    _points: list[int]
+    _nodes: list[int]
+
+    def __init__(self, nodes_count: int, replicas: int = RING_REPLICAS) -> None:
+        ring: list[tuple[int, int]] = sorted(
+            (zlib.crc32(f"{node}:{replica}".encode()), node)
+                for node in range(nodes_count)
+                    for replica in range(replicas)
+        )
+        self._points = [point for point, _ in ring]
+        self._nodes = [node for _, node in ring]
+
+    def get_node(self, key: bytes) -> int:
+        """ Индекс подключения для ключа (по hash tag ключа) """
+        index: int = bisect.bisect(self._points, zlib.crc32(get_hash_tag(key)))
+        return self._nodes[index % len(self._nodes)]
+
+
+class ShardedRedis:
+    """
+        Подключение к нескольким узлам Redis с распределением ключей на стороне клиента:
+          независимые серверы (консистентное хеширование по hash tag ключа) или
+          основные узлы Redis Cluster (слот ключа), см. from_cluster()
+
+        Поддерживаются команды, которые использует ORM: команды с одним ключом
+          выполняются на узле ключа, MSET/MGET/UNLINK разделяются по группам ключей
+          (узел или слот кластера), SCAN последовательно обходит все узлы
+        Команды pipeline группируются по узлам, pipeline узлов выполняются параллельно;
+          атомарность (MULTI/EXEC) между узлами не обеспечивается
+    """
+    clients: list[redis.Redis]
+    _get_group: Callable[[bytes], int]
+    _get_client: Callable[[int], int]
+    _executor: Optional[ThreadPoolExecutor]
+    _executor_lock: threading.Lock
+
+    def __init__(
+        self,
+        clients: list[redis.Redis],
+        get_group: Optional[Callable[[bytes], int]] = None,
+        get_client: Optional[Callable[[int], int]] = None,
+    ) -> None:
+        """
+            clients - подключения к узлам; get_group - группа ключа (ключи одной группы можно
+              передавать одной командой), get_client - индекс подключения группы;
+              по умолчанию группа - узел кольца консистентного хеширования
+        """
+        if not clients:
+            raise ValueError("ShardedRedis requires at least one client...")
+        self.clients = list(clients)
+        if get_group is None:
+            get_group = HashRing(nodes_count=len(self.clients)).get_node
+        self._get_group = get_group
+        self._get_client = get_client or (lambda group: group)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_cluster(cls, cluster: redis.cluster.RedisCluster) -> ShardedRedis:
+        """
+            Подключение к основным узлам Redis Cluster: группа ключа - слот, команды слота
+              выполняются на его основном узле (топология считывается при создании)
+        """
+        primaries: list[redis.cluster.ClusterNode] = cluster.get_primaries()
+        node_indexes: dict[str, int] = {node.name: index for index, node in enumerate(primaries)}
+        slot_clients: list[int] = [
+            node_indexes[cluster.nodes_manager.get_node_from_slot(slot).name]
+                for slot in range(redis.cluster.REDIS_CLUSTER_HASH_SLOTS)
+        ]
+        return cls(
+            clients=[cluster.get_redis_connection(node) for node in primaries],
+            get_group=cluster.keyslot,
+            get_client=slot_clients.__getitem__,
+        )
+
+    def get_client_index(self, key: Union[str, bytes]) -> int:
+        """ Индекс подключения узла, которому принадлежит ключ """
+        return self._get_client(self._get_group(_to_bytes(key)))
+
+    def group_keys(self, keys: list[Any]) -> dict[int, list[int]]:
+        """ Позиции ключей, сгруппированные по группам ключей (в порядке первого появления) """
+        groups: dict[int, list[int]] = {}
+        for position, key in enumerate(keys):
+            groups.setdefault(self._get_group(_to_bytes(key)), []).append(position)
+        return groups
+
+    def pipeline(self, transaction: bool = False, **_) -> ShardedPipeline:
+        return ShardedPipeline(sharded=self)
+
+    def execute_commands(self, commands: list[_Command]) -> list[Any]:
+        """
+            Выполнение команд узлов: команды каждого узла - одним pipeline,
+              pipeline разных узлов - параллельно; ответы в порядке команд
+        """
+        commands_by_client: dict[int, list[int]] = {}
+        for position, (client_index, _, _, _) in enumerate(commands):
+            commands_by_client.setdefault(client_index, []).append(position)
+
+        def execute_client_commands(client_index: int) -> list[Any]:
+            pipe: redis.client.Pipeline = self.clients[client_index].pipeline(transaction=False)
+            for position in commands_by_client[client_index]:
+                _, name, args, kwargs = commands[position]
+                getattr(pipe, name)(*args, **kwargs)
+            return pipe.execute()
+
+        replies: list[Any] = [None] * len(commands)
+        clients_replies: Iterator[list[Any]]
+        if len(commands_by_client) == 1:
+            clients_replies = map(execute_client_commands, commands_by_client)
+        else:
+            clients_replies = self._get_executor().map(execute_client_commands, commands_by_client)
+        for client_index, client_replies in zip(commands_by_client, clients_replies):
+            for position, reply in zip(commands_by_client[client_index], client_replies):
+                replies[position] = reply
+        return replies
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """ Пул потоков выполнения pipeline узлов (создаётся при первом обращении, один на подключение) """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.clients))
+            return self._executor
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None, **kwargs) -> Iterator[bytes]:
+        """ Инкрементальный поиск ключей на всех узлах (последовательно) """
+        for client in self.clients:
+            yield from client.scan_iter(match=match, count=count, **kwargs)
+
+    def sscan_iter(self, name: Any, match: Optional[str] = None, count: Optional[int] = None) -> Iterator[bytes]:
+        yield from self.clients[self.get_client_index(name)].sscan_iter(name, match=match, count=count)
+
+    def close(self) -> None:
+        """ Закрытие подключений всех узлов """
+        with self._executor_lock:
+            executor: Optional[ThreadPoolExecutor] = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown()
+        for client in self.clients:
+            client.close()
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        """ Команды ORM без pipeline выполняются как pipeline из одной команды """
+        if name not in KEY_COMMANDS and name not in ("mset", "mget", "unlink", "scan"):
+            raise AttributeError(f"ShardedRedis does not support command: {name}...")
+
+        def execute_command(*args: Any, **kwargs: Any) -> Any:
+            return getattr(self.pipeline(), name)(*args, **kwargs).execute()[0]
+
+        return execute_command
+
+
+class ShardedPipeline:
+    """
+        Pipeline ShardedRedis: каждая команда разделяется на команды узлов
+          и функцию объединения их ответов в ответ исходной команды
+    """
+    _sharded: ShardedRedis
+    _commands: list[tuple[list[_Command], Callable[[list[Any]], Any]]]
+
+    def __init__(self, sharded: ShardedRedis) -> None:
+        self._sharded = sharded
+        self._commands = []
+
+    def _queue(self, commands: list[_Command], merge: Callable[[list[Any]], Any]) -> ShardedPipeline:
+        self._commands.append((commands, merge))
+        return self
+
+    def __getattr__(self, name: str) -> Callable[..., ShardedPipeline]:
+        if name not in KEY_COMMANDS:
+            raise AttributeError(f"ShardedRedis does not support command: {name}...")
+
+        def queue_command(key: Any, *args: Any, **kwargs: Any) -> ShardedPipeline:
+            client_index: int = self._sharded.get_client_index(key)
+            return self._queue([(client_index, name, (key, *args), kwargs)], lambda replies: replies[0])
+
+        return queue_command
+
+    def mset(self, mapping: dict[Any, Any]) -> ShardedPipeline:
+        keys: list[Any] = list(mapping)
+        commands: list[_Command] = [
+            (self._sharded.get_client_index(keys[positions[0]]), "mset", (), {
+                "mapping": {keys[position]: mapping[keys[position]] for position in positions},
+            })
+                for positions in self._sharded.group_keys(keys).values()
+        ]
+        return self._queue(commands, lambda replies: all(replies))
+
+    def mget(self, keys: Any, *args: Any) -> ShardedPipeline:
+        keys = [*keys, *args] if isinstance(keys, (list, tuple)) else [keys, *args]
+        groups: list[list[int]] = list(self._sharded.group_keys(keys).values())
+        commands: list[_Command] = [
+            (self._sharded.get_client_index(keys[positions[0]]), "mget", (
+                [keys[position] for position in positions],
+            ), {})
+                for positions in groups
+        ]
+
+        def merge(replies: list[list[Any]]) -> list[Any]:
+            values: list[Any] = [None] * len(keys)
+            for positions, group_values in zip(groups, replies):
+                for position, value in zip(positions, group_values):
+                    values[position] = value
+            return values
+
+        return self._queue(commands, merge)
+
+    def unlink(self, *names: Any) -> ShardedPipeline:
+        commands: list[_Command] = [
+            (self._sharded.get_client_index(names[positions[0]]), "unlink", tuple(
+                names[position] for position in positions
+            ), {})
+                for positions in self._sharded.group_keys(list(names)).values()
+        ]
+        return self._queue(commands, sum)
+
+    def scan(
+        self,
+        cursor: int = 0,
+        match: Optional[str] = None,
+        count: Optional[int] = None,
+        **kwargs,
+    ) -> ShardedPipeline:
+        """
+            SCAN узлов по очереди: курсор содержит индекс узла и курсор SCAN узла
+              (cursor = курсор узла * количество узлов + индекс узла)
+        """
+        clients_count: int = len(self._sharded.clients)
+        client_index: int = cursor % clients_count
+
+        def merge(replies: list[tuple[int, list[bytes]]]) -> tuple[int, list[bytes]]:
+            client_cursor, keys = replies[0]
+            if client_cursor:
+                return client_cursor * clients_count + client_index, keys
+            # Обход узла завершён - следующий узел с начала (0 - обход всех узлов завершён)
+            return (client_index + 1) % clients_count, keys
+
+        return self._queue(
+            [(client_index, "scan", (), {"cursor": cursor // clients_count, "match": match, "count": count, **kwargs})],
+            merge,
+        )
+
+    def execute(self, **_) -> list[Any]:
+        commands: list[_Command] = [command for commands, _ in self._commands for command in commands]
+        replies: list[Any] = self._sharded.execute_commands(commands=commands) if commands else []
+        results: list[Any] = []
+        offset: int = 0
+        for commands, merge in self._commands:
+            results.append(merge(replies[offset:offset + len(commands)]))
+            offset += len(commands)
+        self._commands = []
+        return results
+
+
+def _to_bytes(value: Any) -> bytes:
+    """ Ключ в виде bytes (аналогично кодированию redis-py) """
+    return value if isinstance(value, bytes) else str(value).encode()
@@ -16,6 +16,7 @@ class StorageItem(metaclass=abc.ABCMeta):
                 class Meta:
                     table = "subsystem.{subsystem_id}.tag.{tag_id}"
     """
+    __slots__ = ()
 
     @abc.abstractclassmethod
     def get(cls, **kwargs) -> list[StorageItem]:
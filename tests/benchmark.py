@@ -0,0 +1,608 @@
+"""
+    Нагрузочное тестирование StorageORM: запись, выборка и формирование объектов
+
+        python -m tests.benchmark --backend fake --counts 1000,10000 --output results.json
+        python -m tests.benchmark --backend redis --port 8379 --db 1 --baseline results.json
+        python -m tests.benchmark --backend redis --url redis://localhost:8379/1 --scenario blocking --scenario parallel
+
+    Наборы сценариев (--scenario, можно указать несколько раз, по умолчанию - core) выполняются
+      для каждого количества объектов (--counts):
+    - core: для каждого количества полей модели (--fields), выборки с __in - для каждой ширины (--in-widths):
+      - write: групповая вставка (bulk_create) всех объектов
+      - filter_scan: выборка одной группы объектов по паттерну (SCAN)
+      - filter_in_scan: выборка width групп (__in по первому параметру, width паттернов SCAN)
+      - filter_exact: выборка width объектов по точным префиксам записей (без поиска)
+      - filter_in_server_side: выборка filter_in_scan одним Lua-скриптом на сервере (--server-side,
+        для --backend fake необходим пакет lupa)
+      - hydration: формирование объектов из данных БД без обращения к Redis
+    - blocking: keys_blocking/scan_blocking - максимальное время одной серверной команды поиска
+      ключей группы объектов: KEYS против SCAN с COUNT=--scan-count (max_command_seconds)
+    - threads: write_threads - групповые вставки частей объектов из --threads потоков
+      через один экземпляр RedisORM (каждая порция - отдельный pipeline и подключение пула)
+    - parallel: write_parallel - bulk_create_parallel в режимах thread и process с --threads
+      частями (режим process - только для --backend redis)
+    - codecs: codec_encode/codec_decode - кодирование и декодирование значений полей для сочетаний
+      кодека и варианта хранения, codec_memory - объём памяти сервера (только --backend redis)
+    - columns: columns_objects/columns_build - массивы NumPy из объектов против колонок
+      из ответа MGET (необходим пакет numpy)
+    - memory: object_memory - объём памяти на объект, сформированный из данных БД
+      (обычная и компактная модели, bytes_per_object)
+    - hydration: hydration_scaling - формирование объектов из данных БД (ratio - отношение
+      ко времени предыдущего количества объектов), construction - создание объектов и mapping
+    Количество объектов в результатах - фактическое количество записанных (полученных) объектов
+    Результат сценария - медиана и минимум времени повторов (--repeat), количество
+      обработанных объектов и пиковый объём выделенной памяти (tracemalloc, отдельным запуском)
+    --backend fake - данные в памяти процесса (fakeredis, без него - tests.redis_impl.MockedRedis),
+      --backend redis - сервер Redis (--url или --host/--port/--db; ключи бенчмарка удаляются
+      после каждого набора параметров)
+    --baseline - сравнение с сохранённым результатом: код возврата 1, если медиана сценария
+      больше медианы базового результата более чем на --tolerance (доля)
+"""
+import gc
+import sys
+import json
+import types
+import redis
+import argparse
+import platform
+import statistics
+import tracemalloc
+from time import perf_counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import OperationResult
+from storage_orm.redis_impl.codecs import msgpack
+from storage_orm.redis_impl.columns import build_columns
+from storage_orm.redis_impl.redis_item import SCAN_COUNT
+from storage_orm.redis_impl.redis_item import STORAGE_KEYS
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.redis_item import STORAGE_BLOB
+from storage_orm.redis_impl.redis_orm import PARALLEL_MODE_THREAD
+from storage_orm.redis_impl.redis_orm import PARALLEL_MODE_PROCESS
+
+# Количество групп объектов (значений первого параметра Meta.table)
+GROUPS_COUNT = 100
+# Допустимое относительное увеличение времени сценария по сравнению с базовым результатом
+TOLERANCE = 0.2
+# Наборы сценариев (см. описание модуля)
+SCENARIOS = ("core", "blocking", "threads", "parallel", "codecs", "columns", "memory", "hydration")
+# Значения результата сценария, не являющиеся его параметрами (не используются для сравнения)
+MEASUREMENTS = frozenset((
+    "objects", "seconds", "min_seconds", "peak_bytes", "max_command_seconds", "commands",
+    "used_memory_bytes", "bytes_per_object", "ratio",
+))
+
+
+class ParallelItem(RedisItem):
+    """ Модель сценария parallel: для режима process модель должна быть доступна для импорта (pickle) """
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "benchmark_parallel.{param1}.{param2}"
+
+
+class CompactItem(RedisItem):
+    """ Компактная модель сценария memory (поля совпадают с make_model(fields_count=2)) """
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "benchmark.{param1}.{param2}"
+        compact = True
+
+
+def make_model(
+    fields_count: int,
+    scan_count: int = SCAN_COUNT,
+    codec: Optional[str] = None,
+    storage: str = STORAGE_KEYS,
+) -> type[RedisItem]:
+    """ Модель с fields_count полями (чередуются int и str, для codec - int и float) """
+    annotations: dict[str, type] = {
+        f"attr{index}": int if index % 2 else (float if codec else str)
+            for index in range(1, fields_count + 1)
+    }
+
+    class Meta:
+        table = "benchmark.{param1}.{param2}"
+
+    Meta.scan_count = scan_count
+    Meta.storage = storage
+    if codec:
+        Meta.codec = codec
+
+    return types.new_class(
+        f"BenchmarkItem{fields_count}" + (f"_{codec}_{storage}" if codec else ""),
+        (RedisItem,),
+        exec_body=lambda namespace: namespace.update({"__annotations__": annotations, "Meta": Meta}),
+    )
+
+
+def make_items(model: type[RedisItem], count: int) -> list[RedisItem]:
+    """ Объекты модели: param1 - группа объекта, param2 - номер объекта """
+    return [
+        model(param1=i % GROUPS_COUNT, param2=i, **{
+            field: field_type(i) if field_type is not float else i / 7
+                for field, field_type in model.__annotations__.items()
+        })
+            for i in range(count)
+    ]
+
+
+def make_db_items(items: list[RedisItem]) -> dict[bytes, bytes]:
+    """ Данные БД (ключ-значение, как в ответе MGET) объектов модели с хранением в отдельных ключах """
+    return {
+        key.encode() if isinstance(key, str) else key: value if isinstance(value, bytes) else str(value).encode()
+            for item in items
+                for key, value in item.mapping.items()
+    }
+
+
+def make_client(args: argparse.Namespace) -> redis.Redis:
+    if args.backend == "redis" and args.url:
+        return redis.Redis.from_url(args.url)
+    if args.backend == "redis":
+        return redis.Redis(host=args.host, port=args.port, db=args.db)
+    try:
+        import fakeredis
+        return fakeredis.FakeRedis()
+    except ImportError:
+        from tests.redis_impl.mocked_redis import MockedRedis
+        return MockedRedis()
+
+
+def measure(action: Callable[[], int], repeat: int, memory: bool) -> dict[str, Any]:
+    """
+        Время повторов действия (медиана, минимум), количество обработанных объектов
+          (результат действия) и пиковый объём выделенной памяти отдельного запуска
+    """
+    times: list[float] = []
+    objects_count: int = 0
+    for _ in range(repeat):
+        gc.collect()
+        start_time: float = perf_counter()
+        objects_count = action()
+        times.append(perf_counter() - start_time)
+    result: dict[str, Any] = {
+        "objects": objects_count,
+        "seconds": statistics.median(times),
+        "min_seconds": min(times),
+    }
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        action()
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def report(results: list[dict[str, Any]], result: dict[str, Any]) -> None:
+    """ Добавление результата сценария и вывод в stderr """
+    results.append(result)
+    print(
+        f"StorageORM ({result['name']}) -> "
+        + ", ".join(f"{key}: {value}" for key, value in result.items() if key != "name"),
+        file=sys.stderr,
+    )
+
+
+def write_items(orm: RedisORM, items: list[RedisItem]) -> int:
+    """ Групповая вставка с проверкой результата """
+    operation_result: OperationResult = orm.bulk_create(items=items)
+    if not operation_result.ok:
+        raise RuntimeError(operation_result.message)
+    return len(items)
+
+
+def run_scenarios(
+    orm: RedisORM,
+    count: int,
+    fields_count: int,
+    in_widths: list[int],
+    repeat: int,
+    memory: bool,
+    scan_count: int = SCAN_COUNT,
+    server_side: bool = False,
+) -> list[dict[str, Any]]:
+    """ Сценарии core одного сочетания количества объектов и количества полей """
+    model: type[RedisItem] = make_model(fields_count=fields_count, scan_count=scan_count)
+    items: list[RedisItem] = make_items(model=model, count=count)
+    params: dict[str, Any] = {"count": count, "fields": fields_count}
+    results: list[dict[str, Any]] = []
+
+    def run(name: str, action: Callable[[], int], **scenario_params: Any) -> None:
+        result: dict[str, Any] = {"name": name, **params, **scenario_params}
+        result.update(measure(action=action, repeat=repeat, memory=memory))
+        report(results=results, result=result)
+
+    run("write", lambda: write_items(orm=orm, items=items))
+    run("filter_scan", lambda: len(model.filter(param1=0, param2="*")))
+    for width in in_widths:
+        groups: list[int] = list(range(min(width, GROUPS_COUNT)))
+        run("filter_in_scan", lambda: len(model.filter(param1__in=groups, param2="*")), in_width=width)
+        if server_side:
+            run(
+                "filter_in_server_side",
+                lambda: len(model.filter(param1__in=groups, param2="*", server_side=True)),
+                in_width=width,
+            )
+        # Объекты первой группы: param2 кратен GROUPS_COUNT
+        objects_params: list[int] = list(range(0, width * GROUPS_COUNT, GROUPS_COUNT))
+        run("filter_exact", lambda: len(model.filter(param1=0, param2__in=objects_params)), in_width=width)
+    db_items: dict[bytes, bytes] = make_db_items(items=items)
+    run("hydration", lambda: len(model._objects_from_db_items(items=db_items)))
+    orm.purge(model=model)
+    return results
+
+
+def run_blocking(orm: RedisORM, client: redis.Redis, count: int, scan_count: int) -> list[dict[str, Any]]:
+    """ Максимальное время одной серверной команды поиска ключей группы объектов: KEYS против SCAN """
+    model: type[RedisItem] = make_model(fields_count=2, scan_count=scan_count)
+    write_items(orm=orm, items=make_items(model=model, count=count))
+    pattern: str = model._get_filters_by_kwargs(kwargs={"param1": 1})[0]
+    results: list[dict[str, Any]] = []
+
+    start_time: float = perf_counter()
+    keys_count: int = len(client.keys(pattern))
+    keys_time: float = perf_counter() - start_time
+    report(results=results, result={
+        "name": "keys_blocking",
+        "count": count,
+        "objects": keys_count,
+        "seconds": keys_time,
+        "max_command_seconds": keys_time,
+        "commands": 1,
+    })
+
+    cursor: int = 0
+    scan_count_found: int = 0
+    max_command_time: float = 0.
+    commands: int = 0
+    total_start_time: float = perf_counter()
+    while True:
+        start_time = perf_counter()
+        cursor, keys = client.scan(cursor=cursor, match=pattern, count=scan_count)
+        max_command_time = max(max_command_time, perf_counter() - start_time)
+        scan_count_found += len(keys)
+        commands += 1
+        if not cursor:
+            break
+    report(results=results, result={
+        "name": "scan_blocking",
+        "count": count,
+        "scan_count": scan_count,
+        "objects": scan_count_found,
+        "seconds": perf_counter() - total_start_time,
+        "max_command_seconds": max_command_time,
+        "commands": commands,
+    })
+    orm.purge(model=model)
+    return results
+
+
+def run_threads(orm: RedisORM, count: int, threads: list[int], repeat: int) -> list[dict[str, Any]]:
+    """ Групповые вставки частей объектов из нескольких потоков через один экземпляр RedisORM """
+    model: type[RedisItem] = make_model(fields_count=2)
+    items: list[RedisItem] = make_items(model=model, count=count)
+    results: list[dict[str, Any]] = []
+    for threads_count in threads:
+        items_by_thread: list[list[RedisItem]] = [items[thread::threads_count] for thread in range(threads_count)]
+
+        def write() -> int:
+            with ThreadPoolExecutor(max_workers=threads_count) as executor:
+                return sum(executor.map(lambda thread_items: write_items(orm=orm, items=thread_items), items_by_thread))
+
+        report(results=results, result={
+            "name": "write_threads",
+            "count": count,
+            "threads": threads_count,
+            **measure(action=write, repeat=repeat, memory=False),
+        })
+    orm.purge(model=model)
+    return results
+
+
+def run_parallel(orm: RedisORM, count: int, threads: list[int], repeat: int, backend: str) -> list[dict[str, Any]]:
+    """ Параллельная групповая вставка (bulk_create_parallel) потоками и процессами """
+    items: list[RedisItem] = [
+        ParallelItem(param1=i % GROUPS_COUNT, param2=i, attr1=i, attr2=str(i))
+            for i in range(count)
+    ]
+    results: list[dict[str, Any]] = []
+    modes: tuple[str, ...] = (PARALLEL_MODE_THREAD, PARALLEL_MODE_PROCESS)
+    if backend != "redis":
+        # Процессы создают собственные подключения к серверу - данные в памяти процесса им недоступны
+        modes = (PARALLEL_MODE_THREAD,)
+        print("StorageORM (write_parallel) -> mode process skipped: requires --backend redis", file=sys.stderr)
+    for mode in modes:
+        for workers in threads:
+            def write() -> int:
+                operation_result: OperationResult = orm.bulk_create_parallel(items=items, workers=workers, mode=mode)
+                if not operation_result.ok:
+                    raise RuntimeError(operation_result.message)
+                return len(items)
+
+            report(results=results, result={
+                "name": "write_parallel",
+                "count": count,
+                "mode": mode,
+                "workers": workers,
+                **measure(action=write, repeat=repeat, memory=False),
+            })
+    orm.purge(model=ParallelItem)
+    return results
+
+
+def run_codecs(
+    orm: RedisORM,
+    client: redis.Redis,
+    count: int,
+    repeat: int,
+    backend: str,
+) -> list[dict[str, Any]]:
+    """
+        Кодирование и декодирование значений полей для сочетаний кодека и варианта хранения;
+          для --backend redis - объём памяти сервера на count объектов
+    """
+    variants: list[tuple[str, str]] = [
+        ("text", STORAGE_KEYS),
+        ("struct", STORAGE_KEYS),
+        ("struct", STORAGE_HASH),
+        ("struct", STORAGE_BLOB),
+    ]
+    if msgpack is not None:
+        variants.append(("msgpack", STORAGE_KEYS))
+    results: list[dict[str, Any]] = []
+    for codec, storage in variants:
+        model: type[RedisItem] = make_model(fields_count=2, codec=codec, storage=storage)
+        items: list[RedisItem] = make_items(model=model, count=count)
+        params: dict[str, Any] = {"count": count, "codec": codec, "storage": storage}
+        report(results=results, result={
+            "name": "codec_encode",
+            **params,
+            **measure(action=lambda: len([dict(item.mapping) for item in items]), repeat=repeat, memory=False),
+        })
+        # Декодирование - только для хранения в отдельных ключах (формат данных совпадает с ответом MGET)
+        if storage == STORAGE_KEYS:
+            db_items: dict[bytes, bytes] = make_db_items(items=items)
+            report(results=results, result={
+                "name": "codec_decode",
+                **params,
+                **measure(
+                    action=lambda: len(model._objects_from_db_items(items=db_items)),
+                    repeat=repeat,
+                    memory=False,
+                ),
+            })
+        if backend == "redis":
+            used_memory: int = client.info("memory")["used_memory"]
+            write_items(orm=orm, items=items)
+            report(results=results, result={
+                "name": "codec_memory",
+                **params,
+                "objects": count,
+                "used_memory_bytes": client.info("memory")["used_memory"] - used_memory,
+            })
+            orm.purge(model=model)
+    return results
+
+
+def run_columns(count: int, repeat: int) -> list[dict[str, Any]]:
+    """ Массивы значений полей: формирование объектов и преобразование в массивы против колонок из ответа MGET """
+    try:
+        import numpy
+    except ImportError:
+        print("StorageORM (columns) -> skipped: numpy is not installed", file=sys.stderr)
+        return []
+    model: type[RedisItem] = make_model(fields_count=2)
+    items: list[RedisItem] = make_items(model=model, count=count)
+    tables: list[bytes] = [item._table.encode() for item in items]
+    keys: list[bytes] = model._get_keys_by_tables(tables=tables)
+    db_items: dict[bytes, bytes] = make_db_items(items=items)
+    values: list[Optional[bytes]] = [db_items.get(key) for key in keys]
+
+    def objects_columns() -> int:
+        objects: list[RedisItem] = model._objects_from_db_items(items=model._get_existing_db_items(keys, values))
+        for field in model._schema.fields:
+            numpy.array([getattr(item, field) for item in objects])
+        return len(objects)
+
+    results: list[dict[str, Any]] = []
+    report(results=results, result={
+        "name": "columns_objects",
+        "count": count,
+        **measure(action=objects_columns, repeat=repeat, memory=False),
+    })
+    report(results=results, result={
+        "name": "columns_build",
+        "count": count,
+        **measure(
+            action=lambda: len(build_columns(schema=model._schema, tables=tables, values=values)["param1"]),
+            repeat=repeat,
+            memory=False,
+        ),
+    })
+    return results
+
+
+def run_memory(count: int) -> list[dict[str, Any]]:
+    """ Объём памяти на объект, сформированный из данных БД (обычная и компактная модели) """
+    model: type[RedisItem] = make_model(fields_count=2)
+    db_items: dict[bytes, bytes] = make_db_items(items=make_items(model=model, count=count))
+    results: list[dict[str, Any]] = []
+    for item_model, kind in ((model, "regular"), (CompactItem, "compact")):
+        gc.collect()
+        tracemalloc.start()
+        objects: list[RedisItem] = item_model._objects_from_db_items(items=db_items)
+        allocated_bytes: int = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        report(results=results, result={
+            "name": "object_memory",
+            "count": count,
+            "model": kind,
+            "objects": len(objects),
+            "bytes_per_object": round(allocated_bytes / len(objects)) if objects else 0,
+        })
+        del objects
+    return results
+
+
+def run_hydration(counts: list[int], repeat: int) -> list[dict[str, Any]]:
+    """
+        Формирование объектов из данных БД (время должно расти линейно: ratio - отношение
+          ко времени предыдущего количества объектов) и создание объектов с формированием mapping
+    """
+    model: type[RedisItem] = make_model(fields_count=2)
+    results: list[dict[str, Any]] = []
+    previous_result: Optional[dict[str, Any]] = None
+    for count in counts:
+        db_items: dict[bytes, bytes] = make_db_items(items=make_items(model=model, count=count))
+        result: dict[str, Any] = {
+            "name": "hydration_scaling",
+            "count": count,
+            **measure(action=lambda: len(model._objects_from_db_items(items=db_items)), repeat=repeat, memory=False),
+        }
+        if previous_result is not None and previous_result["seconds"]:
+            result["ratio"] = round(result["seconds"] / previous_result["seconds"], 2)
+        report(results=results, result=result)
+        previous_result = result
+
+        def construct() -> int:
+            for i in range(count):
+                model(param1=i % GROUPS_COUNT, param2=i, attr1=i, attr2=str(i)).mapping
+            return count
+
+        report(results=results, result={
+            "name": "construction",
+            "count": count,
+            **measure(action=construct, repeat=repeat, memory=False),
+        })
+    return results
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]], tolerance: float) -> list[str]:
+    """ Сценарии, медиана времени которых больше базовой более чем на tolerance (доля) """
+    def get_key(result: dict[str, Any]) -> tuple:
+        return tuple((key, value) for key, value in sorted(result.items()) if key not in MEASUREMENTS)
+
+    baseline_results: dict[tuple, dict[str, Any]] = {get_key(result): result for result in baseline}
+    regressions: list[str] = []
+    for result in results:
+        baseline_result: Optional[dict[str, Any]] = baseline_results.get(get_key(result))
+        if baseline_result is None or "seconds" not in result or "seconds" not in baseline_result:
+            continue
+        ratio: float = result["seconds"] / baseline_result["seconds"] if baseline_result["seconds"] else 1.
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{dict(get_key(result))}: {baseline_result['seconds']:.6f}s -> {result['seconds']:.6f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def parse_ints(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="StorageORM benchmark")
+    parser.add_argument("--backend", choices=("fake", "redis"), default="fake")
+    parser.add_argument("--url", help="Redis URL for --backend redis, e.g. redis://localhost:6379/1")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=6379)
+    parser.add_argument("--db", type=int, default=1)
+    parser.add_argument(
+        "--scenario",
+        dest="scenarios",
+        action="append",
+        choices=SCENARIOS,
+        help="scenario set to run, may be repeated (default: core)",
+    )
+    parser.add_argument("--counts", type=parse_ints, default=[1_000, 5_000])
+    parser.add_argument("--fields", type=parse_ints, default=[2, 8])
+    parser.add_argument("--in-widths", type=parse_ints, default=[1, 7, 30])
+    parser.add_argument("--threads", type=parse_ints, default=[1, 2, 4, 8], help="threads (workers) of write scenarios")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scan-count", type=int, default=SCAN_COUNT, help="Meta.scan_count of the model")
+    parser.add_argument("--server-side", action="store_true", help="run filter(server_side=True) scenarios")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="skip tracemalloc runs")
+    parser.add_argument("--output", help="path of JSON results (default: stdout)")
+    parser.add_argument("--baseline", help="path of JSON results to compare with")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args: argparse.Namespace = parser.parse_args(argv)
+    scenarios: list[str] = list(dict.fromkeys(args.scenarios or ["core"]))
+
+    client: redis.Redis = make_client(args=args)
+    orm: RedisORM = RedisORM(client=client)
+    results: list[dict[str, Any]] = []
+    for count in args.counts:
+        if "core" in scenarios:
+            for fields_count in args.fields:
+                results.extend(run_scenarios(
+                    orm=orm,
+                    count=count,
+                    fields_count=fields_count,
+                    in_widths=args.in_widths,
+                    repeat=args.repeat,
+                    memory=args.memory,
+                    scan_count=args.scan_count,
+                    server_side=args.server_side,
+                ))
+        if "blocking" in scenarios:
+            results.extend(run_blocking(orm=orm, client=client, count=count, scan_count=args.scan_count))
+        if "threads" in scenarios:
+            results.extend(run_threads(orm=orm, count=count, threads=args.threads, repeat=args.repeat))
+        if "parallel" in scenarios:
+            results.extend(run_parallel(
+                orm=orm,
+                count=count,
+                threads=args.threads,
+                repeat=args.repeat,
+                backend=args.backend,
+            ))
+        if "codecs" in scenarios:
+            results.extend(run_codecs(orm=orm, client=client, count=count, repeat=args.repeat, backend=args.backend))
+        if "columns" in scenarios:
+            results.extend(run_columns(count=count, repeat=args.repeat))
+        if "memory" in scenarios:
+            results.extend(run_memory(count=count))
+    if "hydration" in scenarios:
+        results.extend(run_hydration(counts=args.counts, repeat=args.repeat))
+    report_data: dict[str, Any] = {
+        "environment": {
+            "scan_count": args.scan_count,
+            "backend": args.backend if args.backend == "redis" else type(client).__name__,
+            "scenarios": scenarios,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "redis_py": redis.__version__,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report_data, file, indent=2)
+    else:
+        print(json.dumps(report_data, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            regressions: list[str] = compare(
+                results=results,
+                baseline=json.load(file)["results"],
+                tolerance=args.tolerance,
+            )
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
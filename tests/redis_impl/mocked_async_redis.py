@@ -0,0 +1,90 @@
+from __future__ import annotations
+import asyncio
+import redis.asyncio
+from typing import Any
+from typing import Optional
+
+from .mocked_redis import MockedRedis
+
+
+class MockedAsyncPipeline:
+    """ Pipeline: команды накапливаются и выполняются в MockedRedis во время execute() """
+    _sync: MockedRedis
+    _commands: list[tuple[str, tuple, dict]]
+
+    def __init__(self, sync: MockedRedis) -> None:
+        self._sync = sync
+        self._commands = []
+
+    def mset(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("mset", args, kwargs))
+        return self
+
+    def mget(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("mget", args, kwargs))
+        return self
+
+    def hset(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("hset", args, kwargs))
+        return self
+
+    def hmget(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("hmget", args, kwargs))
+        return self
+
+    def sadd(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("sadd", args, kwargs))
+        return self
+
+    def zadd(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("zadd", args, kwargs))
+        return self
+
+    def pexpire(self, *args, **kwargs) -> MockedAsyncPipeline:
+        self._commands.append(("pexpire", args, kwargs))
+        return self
+
+    async def execute(self, **_) -> list[Any]:
+        self._sync.execute_calls_count += 1
+        commands, self._commands = self._commands, []
+        return [getattr(self._sync, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+
+class MockedAsyncRedis(redis.asyncio.Redis):
+    """ Асинхронная обёртка над MockedRedis (данные и счётчики вызовов общие) """
+    sync: MockedRedis
+    max_concurrent_scans: int
+    _concurrent_scans: int
+
+    def __init__(self, sync: Optional[MockedRedis] = None) -> None:
+        self.sync = sync if sync is not None else MockedRedis()
+        self.max_concurrent_scans = 0
+        self._concurrent_scans = 0
+
+    async def mset(self, **kwargs) -> Any:
+        return self.sync.mset(**kwargs)
+
+    async def hset(self, *args, **kwargs) -> Any:
+        return self.sync.hset(*args, **kwargs)
+
+    async def smembers(self, *args, **kwargs) -> Any:
+        return self.sync.smembers(*args, **kwargs)
+
+    async def sscan_iter(self, name: Any, match: Optional[str] = None, count: Optional[int] = None):
+        for member in self.sync.sscan_iter(name, match=match, count=count):
+            await asyncio.sleep(0)
+            yield member
+
+    async def scan_iter(self, match: str = "*", count: Optional[int] = None, **_):
+        self._concurrent_scans += 1
+        self.max_concurrent_scans = max(self.max_concurrent_scans, self._concurrent_scans)
+        try:
+            for key in self.sync.scan_iter(match=match, count=count):
+                # Передача управления другим задачам между итерациями SCAN
+                await asyncio.sleep(0)
+                yield key
+        finally:
+            self._concurrent_scans -= 1
+
+    def pipeline(self, **_) -> MockedAsyncPipeline:
+        return MockedAsyncPipeline(sync=self.sync)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from storage_orm import RedisItem
 
 
@@ -7,8 +9,9 @@ class MockedItem(RedisItem):
     def __init__(self) -> None:
         self.calls_count = 0
 
-    def save(self) -> None:
+    def save(self, ttl: Optional[float] = None) -> None:
         self.calls_count += 1
 
-    def mapping(self) -> None:
-        return None
+    @property
+    def mapping(self) -> dict[str, int]:
+        return {f"mocked_item.{id(self)}.calls_count": self.calls_count}
@@ -1,23 +1,214 @@
 from __future__ import annotations
 import redis
+import fnmatch
+import hashlib
+from typing import Any
+from typing import Optional
 
 
 class MockedRedis(redis.Redis):
     calls_count: int
     execute_calls_count: int
+    scan_calls: list[dict]
+    mget_calls: list[list[bytes]]
+    connection_pool: redis.ConnectionPool
     _pipe: MockedRedis
+    _data: dict[bytes, bytes]
+    _hashes: dict[bytes, dict[bytes, bytes]]
+    _sorted_sets: dict[bytes, dict[bytes, float]]
+    _sets: dict[bytes, set[bytes]]
+    _expires: dict[bytes, int]
+    _scripts: dict[str, str]
+    _is_pipe: bool
+    _results: list[Any]
 
-    def __init__(self, is_pipe: bool = False) -> None:
+    def __init__(
+        self,
+        is_pipe: bool = False,
+        data: Optional[dict[bytes, bytes]] = None,
+        hashes: Optional[dict[bytes, dict[bytes, bytes]]] = None,
+        sorted_sets: Optional[dict[bytes, dict[bytes, float]]] = None,
+        sets: Optional[dict[bytes, set[bytes]]] = None,
+        expires: Optional[dict[bytes, int]] = None,
+    ) -> None:
         self.calls_count = 0
         self.execute_calls_count = 0
+        self.scan_calls = []
+        self.mget_calls = []
+        self._data = data if data is not None else {}
+        self._hashes = hashes if hashes is not None else {}
+        self._sorted_sets = sorted_sets if sorted_sets is not None else {}
+        self._sets = sets if sets is not None else {}
+        self._expires = expires if expires is not None else {}
+        self._scripts = {}
+        self._is_pipe = is_pipe
+        self._results = []
         if not is_pipe:
-            self._pipe = self.__class__(is_pipe=True)
+            self.connection_pool = redis.ConnectionPool()
+            self._pipe = self.__class__(is_pipe=True, **self._storages)
 
-    def mset(self, **_) -> None:
+    @property
+    def _storages(self) -> dict[str, Any]:
+        """ Данные БД для создания pipeline с общими данными """
+        return {
+            "data": self._data,
+            "hashes": self._hashes,
+            "sorted_sets": self._sorted_sets,
+            "sets": self._sets,
+            "expires": self._expires,
+        }
+
+    def _reply(self, value: Any) -> Any:
+        """ В режиме pipeline результат команды возвращается во время execute() """
+        if self._is_pipe:
+            self._results.append(value)
+            return self
+        return value
+
+    def mset(self, mapping: Optional[dict] = None, **_) -> Any:
+        self.calls_count += 1
+        for key, value in (mapping or {}).items():
+            self._data[_to_bytes(key)] = _to_bytes(value)
+        return self._reply(True)
+
+    def hset(self, name: Any, mapping: Optional[dict] = None, **_) -> Any:
+        self.calls_count += 1
+        fields: dict[bytes, bytes] = self._hashes.setdefault(_to_bytes(name), {})
+        fields.update({_to_bytes(key): _to_bytes(value) for key, value in (mapping or {}).items()})
+        return self._reply(len(fields))
+
+    def hdel(self, name: Any, *keys: Any) -> Any:
+        """ Удаление полей hash, hash без полей удаляется (как в Redis) """
+        fields: dict[bytes, bytes] = self._hashes.get(_to_bytes(name), {})
+        deleted: int = sum(fields.pop(key, None) is not None for key in map(_to_bytes, keys))
+        if not fields:
+            self._hashes.pop(_to_bytes(name), None)
+        return self._reply(deleted)
+
+    def hmget(self, name: Any, keys: list, *_) -> Any:
+        fields: dict[bytes, bytes] = self._hashes.get(_to_bytes(name), {})
+        return self._reply([fields.get(_to_bytes(key)) for key in keys])
+
+    def zadd(self, name: Any, mapping: dict, **_) -> Any:
+        self.calls_count += 1
+        members: dict[bytes, float] = self._sorted_sets.setdefault(_to_bytes(name), {})
+        members.update({_to_bytes(member): float(score) for member, score in mapping.items()})
+        return self._reply(len(mapping))
+
+    def zrangebyscore(self, name: Any, min: Any, max: Any, **_) -> Any:
+        def in_range(score: float, bound: Any, is_min: bool) -> bool:
+            bound = str(bound)
+            exclusive: bool = bound.startswith("(")
+            limit: float = float(bound.lstrip("("))
+            if is_min:
+                return score > limit if exclusive else score >= limit
+            return score < limit if exclusive else score <= limit
+
+        members: dict[bytes, float] = self._sorted_sets.get(_to_bytes(name), {})
+        return self._reply([
+            member for member, score in sorted(members.items(), key=lambda item: item[1])
+                if in_range(score, min, is_min=True) and in_range(score, max, is_min=False)
+        ])
+
+    def sadd(self, name: Any, *values: Any) -> Any:
+        self.calls_count += 1
+        members: set[bytes] = self._sets.setdefault(_to_bytes(name), set())
+        members.update(map(_to_bytes, values))
+        return self._reply(len(values))
+
+    def zrem(self, name: Any, *values: Any) -> Any:
+        members: dict[bytes, float] = self._sorted_sets.get(_to_bytes(name), {})
+        return self._reply(sum(members.pop(value, None) is not None for value in map(_to_bytes, values)))
+
+    def srem(self, name: Any, *values: Any) -> Any:
+        members: set[bytes] = self._sets.get(_to_bytes(name), set())
+        removed: set[bytes] = members.intersection(map(_to_bytes, values))
+        members.difference_update(removed)
+        return self._reply(len(removed))
+
+    def pexpire(self, name: Any, time: int, **_) -> Any:
+        """ Время жизни ключа, мс, запоминается без удаления ключа по истечении """
+        name = _to_bytes(name)
+        exists: bool = name in self._data or name in self._hashes
+        if exists:
+            self._expires[name] = time
+        return self._reply(exists)
+
+    def smembers(self, name: Any) -> Any:
+        return self._reply(set(self._sets.get(_to_bytes(name), set())))
+
+    def sscan(self, name: Any, cursor: int = 0, match: Optional[str] = None, count: Optional[int] = None) -> Any:
+        """ Постраничный поиск элементов set: курсор - позиция в отсортированном списке элементов """
+        self.scan_calls.append({"name": name, "match": match, "count": count})
+        members: list[bytes] = sorted(self._sets.get(_to_bytes(name), set()))
+        next_cursor: int = cursor + (count or 10)
+        found_members: list[bytes] = [
+            member for member in members[cursor:next_cursor]
+                if match is None or fnmatch.fnmatchcase(member.decode(), match)
+        ]
+        return self._reply((next_cursor if next_cursor < len(members) else 0, found_members))
+
+    def sscan_iter(self, name: Any, match: Optional[str] = None, count: Optional[int] = None):
+        self.scan_calls.append({"name": name, "match": match, "count": count})
+        for member in sorted(self._sets.get(_to_bytes(name), set())):
+            if match is None or fnmatch.fnmatchcase(member.decode(), match):
+                yield member
+
+    def unlink(self, *names: Any) -> Any:
+        deleted: int = 0
+        for name in map(_to_bytes, names):
+            deleted += int(self._data.pop(name, None) is not None or self._hashes.pop(name, None) is not None)
+            self._expires.pop(name, None)
+        return self._reply(deleted)
+
+    def mget(self, keys: list[bytes], *_) -> Any:
+        self.mget_calls.append(keys)
+        return self._reply([self._data.get(key) for key in keys])
+
+    def scan(self, cursor: int = 0, match: str = "*", count: Optional[int] = None, **_) -> Any:
+        """ Постраничный поиск: курсор - позиция в отсортированном списке ключей """
+        self.scan_calls.append({"match": match, "count": count})
+        keys: list[bytes] = sorted([*self._data, *self._hashes, *self._sorted_sets, *self._sets])
+        next_cursor: int = cursor + (count or 10)
+        found_keys: list[bytes] = [
+            key for key in keys[cursor:next_cursor]
+                if fnmatch.fnmatchcase(key.decode(), match)
+        ]
+        return self._reply((next_cursor if next_cursor < len(keys) else 0, found_keys))
+
+    def script_load(self, script: str) -> str:
+        sha: str = hashlib.sha1(script.encode()).hexdigest()
+        self._scripts[sha] = script
+        return sha
+
+    def evalsha(self, sha: str, numkeys: int, *args: Any) -> Any:
+        """ Скрипты не выполняются: результат - пустой список (после загрузки скрипта) """
         self.calls_count += 1
+        if sha not in self._scripts:
+            raise redis.exceptions.NoScriptError("No matching script. Please use EVAL.")
+        return []
+
+    def dbsize(self) -> Any:
+        return self._reply(len([*self._data, *self._hashes, *self._sorted_sets, *self._sets]))
 
-    def execute(self, **_) -> None:
+    def scan_iter(self, match: str = "*", count: Optional[int] = None, **_):
+        self.scan_calls.append({"match": match, "count": count})
+        for key in [*self._data, *self._hashes, *self._sorted_sets, *self._sets]:
+            if fnmatch.fnmatchcase(key.decode(), match):
+                # SCAN может возвращать один и тот же ключ несколько раз
+                yield key
+                yield key
+
+    def execute(self, **_) -> list[Any]:
         self.execute_calls_count += 1
+        results: list[Any] = self._results
+        self._results = []
+        return results
 
     def pipeline(self, **_) -> MockedRedis:
         return self._pipe
+
+
+def _to_bytes(value: Any) -> bytes:
+    """ Приведение значения к bytes (аналогично кодированию redis-py) """
+    return value if isinstance(value, bytes) else str(value).encode()
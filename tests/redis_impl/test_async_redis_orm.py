@@ -0,0 +1,44 @@
+import asyncio
+import pytest
+
+from storage_orm import AsyncRedisORM
+from storage_orm import RedisItem
+from storage_orm import OperationResult
+
+from .mocked_item import MockedItem
+from .mocked_async_redis import MockedAsyncRedis
+
+
+@pytest.fixture
+def mocked_async_redis() -> MockedAsyncRedis:
+    return MockedAsyncRedis()
+
+
+def test_empty_constructor() -> None:
+    """ Отсутствие аргументов для подключения """
+    with pytest.raises(Exception) as exception:
+        AsyncRedisORM()
+
+    assert "must contains" in str(exception.value)
+
+
+def test_abulk_create_chunks(mocked_async_redis: MockedAsyncRedis) -> None:
+    """ Групповая вставка: одна команда mset и один execute на каждую порцию """
+    items: list[MockedItem] = [MockedItem() for _ in range(11)]
+    result: OperationResult = asyncio.run(
+        AsyncRedisORM(client=mocked_async_redis).abulk_create(items=items, chunk_size=5),
+    )
+    assert result.ok
+    assert len(result.details) == 3
+    assert mocked_async_redis.sync.calls_count == 3
+    assert mocked_async_redis.sync.execute_calls_count == 3
+
+
+def test_init_global_async_db_connection(mocked_async_redis: MockedAsyncRedis) -> None:
+    """ При первом подключении должна устанавливаться глобальная ссылка на него """
+    RedisItem._async_db_instance = None
+    AsyncRedisORM(client=mocked_async_redis)
+    assert id(MockedItem._async_db_instance) == id(mocked_async_redis)
+    # Синхронное подключение не заменяется
+    assert not isinstance(RedisItem._db_instance, MockedAsyncRedis)
+    RedisItem._async_db_instance = None
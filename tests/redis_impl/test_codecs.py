@@ -0,0 +1,61 @@
+import pytest
+from typing import Any
+
+from storage_orm.redis_impl.codecs import Codec
+from storage_orm.redis_impl.codecs import TextCodec
+from storage_orm.redis_impl.codecs import StructCodec
+from storage_orm.redis_impl.codecs import get_codec
+from storage_orm.redis_impl.codecs import to_bytes
+from storage_orm.redis_impl.codecs import pack_blob
+from storage_orm.redis_impl.codecs import unpack_blob
+
+
+@pytest.mark.parametrize(
+    "field_type, value", [
+        (str, "value"),
+        (int, 19),
+        (float, 99.9),
+        (bytes, b"value"),
+    ],
+)
+def test_text_codec(field_type: Any, value: Any) -> None:
+    """ Текстовый кодек: значение записывается как есть, читается с приведением к типу поля """
+    codec: TextCodec = TextCodec(field_type=field_type)
+    assert codec.encode(value) == value
+    assert codec.decode(to_bytes(value)) == value
+
+
+@pytest.mark.parametrize("field_type, value", [(int, -19), (float, 99.9), (bool, True)])
+def test_struct_codec(field_type: Any, value: Any) -> None:
+    """ Упаковка числовых значений в бинарный формат фиксированной длины """
+    codec: StructCodec = StructCodec(field_type=field_type)
+    assert codec.decode(codec.encode(value)) == value
+
+
+def test_struct_codec_unsupported_type() -> None:
+    """ Для типов без формата struct необходимо явно указать формат """
+    with pytest.raises(ValueError):
+        StructCodec(field_type=str)
+    assert StructCodec(format="<I").decode(StructCodec(format="<I").encode(7)) == 7
+
+
+def test_msgpack_codec() -> None:
+    """ Сериализация значений в msgpack """
+    pytest.importorskip("msgpack")
+    codec: Codec = get_codec(codec="msgpack", field_type=dict)
+    assert codec.decode(codec.encode({"a": [1, 2.5]})) == {"a": [1, 2.5]}
+
+
+def test_get_codec() -> None:
+    """ Получение кодека по имени или готового экземпляра """
+    codec: Codec = StructCodec(field_type=int)
+    assert get_codec(codec=codec, field_type=float) is codec
+    assert isinstance(get_codec(codec="text", field_type=int), TextCodec)
+    with pytest.raises(ValueError):
+        get_codec(codec="unknown", field_type=int)
+
+
+def test_blob_pack_unpack() -> None:
+    """ Упаковка значений полей объекта в одно значение, с сохранением отсутствующих полей """
+    values: list[Any] = ["value", 19, 99.9, None, b"", b"\x00\x01"]
+    assert unpack_blob(pack_blob(values=values)) == [b"value", b"19", b"99.9", None, b"", b"\x00\x01"]
@@ -0,0 +1,99 @@
+import pytest
+from typing import Any
+
+from storage_orm import RedisItem
+from storage_orm.redis_impl.redis_item import STORAGE_KEYS
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.redis_item import STORAGE_BLOB
+
+from .mocked_redis import MockedRedis
+
+numpy = pytest.importorskip("numpy")
+
+
+def _get_model(storage: str, codec: str = "text") -> type:
+    """ Модель с числовыми и строковым полями для выбранного варианта хранения """
+    storage_value: str = storage
+    codec_value: str = codec
+
+    class ColumnsItem(RedisItem):
+        date_time: int
+        any_value: float
+        name: str
+
+        class Meta:
+            table = "subsystem.{subsystem_id}.tag.{tag_id}"
+            storage = storage_value
+            codec = codec_value
+            codecs = {"name": "text"}
+
+    return ColumnsItem
+
+
+def _save_items(model: type, mocked_redis: MockedRedis, count: int) -> None:
+    for tag_id in range(count):
+        model(
+            subsystem_id=1,
+            tag_id=tag_id,
+            date_time=1_600_000_000 + tag_id,
+            any_value=tag_id / 10,
+            name=f"tag_{tag_id}",
+        ).using(db_instance=mocked_redis).save()
+
+
+@pytest.mark.parametrize("storage", [STORAGE_KEYS, STORAGE_HASH, STORAGE_BLOB])
+@pytest.mark.parametrize("codec", ["text", "struct"])
+def test_filter_as_columns(storage: str, codec: str) -> None:
+    """ Колонки по параметрам Meta.table и полям модели совпадают с данными объектов """
+    model: type = _get_model(storage=storage, codec=codec)
+    mocked_redis: MockedRedis = MockedRedis()
+    _save_items(model=model, mocked_redis=mocked_redis, count=3)
+    columns: dict[str, Any] = model.using(db_instance=mocked_redis).filter(subsystem_id=1, as_columns=True)
+    order: Any = numpy.argsort(columns["date_time"])
+
+    assert set(columns) == {"subsystem_id", "tag_id", "date_time", "any_value", "name"}
+    assert columns["date_time"].dtype == numpy.int64
+    assert columns["any_value"].dtype == numpy.float64
+    assert columns["tag_id"][order].tolist() == ["0", "1", "2"]
+    assert columns["date_time"][order].tolist() == [1_600_000_000, 1_600_000_001, 1_600_000_002]
+    assert columns["any_value"][order].tolist() == [0., .1, .2]
+    assert columns["name"][order].tolist() == ["tag_0", "tag_1", "tag_2"]
+
+
+def test_filter_as_columns_exact_keys() -> None:
+    """ Точная выборка: порядок строк - порядок значений __in, отсутствующие записи исключаются """
+    model: type = _get_model(storage=STORAGE_KEYS)
+    mocked_redis: MockedRedis = MockedRedis()
+    _save_items(model=model, mocked_redis=mocked_redis, count=3)
+    columns: dict[str, Any] = model.using(db_instance=mocked_redis).filter(
+        subsystem_id=1,
+        tag_id__in=[2, 5, 0],
+        as_columns=True,
+    )
+    assert not mocked_redis._pipe.scan_calls
+    assert columns["tag_id"].tolist() == ["2", "0"]
+    assert columns["date_time"].tolist() == [1_600_000_002, 1_600_000_000]
+
+
+def test_filter_as_columns_missing_values() -> None:
+    """ Отсутствующие значения: NaN для float-полей, None для остальных """
+    model: type = _get_model(storage=STORAGE_KEYS)
+    mocked_redis: MockedRedis = MockedRedis()
+    _save_items(model=model, mocked_redis=mocked_redis, count=2)
+    del mocked_redis._data[b"subsystem.1.tag.1.any_value"]
+    del mocked_redis._data[b"subsystem.1.tag.1.date_time"]
+    columns: dict[str, Any] = model.using(db_instance=mocked_redis).filter(
+        subsystem_id=1,
+        tag_id__in=[0, 1],
+        as_columns=True,
+    )
+    assert numpy.isnan(columns["any_value"][1])
+    assert columns["date_time"].tolist() == [1_600_000_000, None]
+    assert columns["name"].tolist() == ["tag_0", "tag_1"]
+
+
+def test_filter_as_columns_empty() -> None:
+    """ Пустая выборка - колонки нулевой длины """
+    model: type = _get_model(storage=STORAGE_KEYS)
+    columns: dict[str, Any] = model.using(db_instance=MockedRedis()).filter(subsystem_id=1, as_columns=True)
+    assert all(len(column) == 0 for column in columns.values())
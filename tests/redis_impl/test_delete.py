@@ -0,0 +1,167 @@
+import copy
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import OperationResult
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.indexes import get_value_index_key
+
+from .mocked_redis import MockedRedis
+
+
+class UpdateItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "update.{param1}"
+
+
+class CompactUpdateItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "compact.{param1}"
+        storage = STORAGE_HASH
+        compact = True
+        indexes = ["attr2"]
+        registry = True
+
+
+@pytest.fixture
+def orm(monkeypatch: MonkeyPatch) -> RedisORM:
+    # Глобальное подключение, установленное RedisORM, восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    orm: RedisORM = RedisORM(client=MockedRedis())
+    orm.bulk_create(items=[UpdateItem(param1=i, attr1=i, attr2=str(i)) for i in range(5)])
+    orm.bulk_create(items=[CompactUpdateItem(param1=i, attr1=i, attr2=str(i % 2)) for i in range(5)])
+    return orm
+
+
+@pytest.mark.parametrize("model", [UpdateItem, CompactUpdateItem])
+def test_dirty_fields(model: type) -> None:
+    """ Присваивание значения поля отмечает поле изменённым и обновляет _params """
+    item: RedisItem = model(param1=1, attr1=1, attr2="a")
+    assert not item.dirty_fields
+    copied_item: RedisItem = copy.copy(item)
+    item.attr1 = 2
+    item.param1 = 3
+    assert item.dirty_fields == {"attr1"}
+    assert item._params == {"attr1": 2, "attr2": "a"}
+    # Копия объекта не разделяет изменения
+    assert copied_item._params == {"attr1": 1, "attr2": "a"}
+    assert not copied_item.dirty_fields
+
+
+def test_save_update_fields(orm: RedisORM) -> None:
+    """ Записываются только перечисленные поля, признак изменения записанных полей сбрасывается """
+    client: MockedRedis = orm._client
+    item: UpdateItem = UpdateItem.get(param1=2)
+    assert not item.dirty_fields
+    item.attr1 = 20
+    item.attr2 = "20"
+    client._data[b"update.2.attr2"] = b"other"
+    assert item.save(update_fields=["attr1"]).ok
+    assert client._data[b"update.2.attr1"] == b"20"
+    assert client._data[b"update.2.attr2"] == b"other"
+    assert item.dirty_fields == {"attr2"}
+    assert item.save(update_fields=item.dirty_fields).ok
+    assert client._data[b"update.2.attr2"] == b"20"
+    assert not item.dirty_fields
+    with pytest.raises(ValueError):
+        item._get_update_fields(update_fields=["unknown"])
+
+
+def test_save_skips_none_fields(orm: RedisORM) -> None:
+    """ Поля без значения (None) не записываются """
+    client: MockedRedis = orm._client
+    assert UpdateItem(param1=10, attr1=10).save().ok
+    assert client._data[b"update.10.attr1"] == b"10"
+    assert b"update.10.attr2" not in client._data
+
+
+@pytest.mark.parametrize("update_fields", [None, ["attr1", "attr2"]])
+def test_save_clears_none_fields(orm: RedisORM, update_fields: list) -> None:
+    """ Изменённое поле без значения (None) удаляется из БД при записи (UNLINK ключа поля, HDEL для hash) """
+    client: MockedRedis = orm._client
+    item: UpdateItem = UpdateItem.get(param1=2)
+    item.attr2 = None
+    assert item.save(update_fields=update_fields or item.dirty_fields).ok
+    assert b"update.2.attr2" not in client._data
+    assert UpdateItem.get(param1=2)._params == {"attr1": 2, "attr2": None} and not item.dirty_fields
+    compact_item: CompactUpdateItem = CompactUpdateItem.get(param1=2)
+    compact_item.attr1 = None
+    assert compact_item.save(update_fields=update_fields).ok
+    assert client._hashes[b"compact.2"] == {b"attr2": b"0"}
+    assert CompactUpdateItem.get(param1=2)._params == {"attr1": None, "attr2": "0"}
+
+
+def test_compact_save_update_fields(orm: RedisORM) -> None:
+    """ Частичная запись hash компактного объекта с обновлением индекса записанного поля """
+    client: MockedRedis = orm._client
+    item: CompactUpdateItem = CompactUpdateItem.get(param1=3)
+    item.attr2 = "x"
+    assert item.save(update_fields=["attr2"]).ok
+    assert client._hashes[b"compact.3"] == {b"attr1": b"3", b"attr2": b"x"}
+    index_key: str = get_value_index_key(table=CompactUpdateItem.Meta.table, field="attr2", value="x")
+    assert b"compact.3" in client._sets[index_key.encode()]
+    assert [item.param1 for item in CompactUpdateItem.filter(attr2="x")] == ["3"]
+
+
+def test_compact_using_keeps_dirty_fields(orm: RedisORM) -> None:
+    """ Копия компактного объекта для другого подключения сохраняет признаки изменения и прежние значения полей """
+    client: MockedRedis = orm._client
+    item: CompactUpdateItem = CompactUpdateItem.get(param1=3)
+    item.attr2 = "y"
+    copied_item: CompactUpdateItem = item.using(db_instance=client)
+    assert copied_item.dirty_fields == {"attr2"}
+    assert copied_item.save(update_fields=copied_item.dirty_fields).ok
+    previous_index_key: str = get_value_index_key(table=CompactUpdateItem.Meta.table, field="attr2", value="1")
+    assert b"compact.3" not in client._sets[previous_index_key.encode()]
+    assert [item.param1 for item in CompactUpdateItem.filter(attr2="y")] == ["3"]
+
+
+def test_delete(orm: RedisORM) -> None:
+    """ Удаление объекта: ключи записи, индексы значений полей и реестр """
+    client: MockedRedis = orm._client
+    item: CompactUpdateItem = CompactUpdateItem.get(param1=1)
+    result: OperationResult = item.delete()
+    assert result.ok and result.message == "deleted=1"
+    assert b"compact.1" not in client._hashes
+    index_key: str = get_value_index_key(table=CompactUpdateItem.Meta.table, field="attr2", value="1")
+    assert b"compact.1" not in client._sets[index_key.encode()]
+    assert item.delete().message == "deleted=0"
+    assert UpdateItem.get(param1=4).delete().ok
+    assert not [key for key in client._data if key.startswith(b"update.4.")]
+
+
+def test_filter_delete(orm: RedisORM) -> None:
+    """ Удаление объектов выборки одним pipeline (после получения последних индексированных значений полей) """
+    client: MockedRedis = orm._client
+    items: list[CompactUpdateItem] = CompactUpdateItem.filter(param1="*")
+    execute_calls_count: int = client._pipe.execute_calls_count
+    result: OperationResult = items.delete()
+    assert result.message == "deleted=5"
+    assert client._pipe.execute_calls_count == execute_calls_count + 2
+    assert not client._hashes
+    assert UpdateItem.filter(param1=100).delete().message == "deleted=0"
+
+
+def test_bulk_delete(orm: RedisORM) -> None:
+    """ Групповое удаление объектов разных моделей порциями """
+    client: MockedRedis = orm._client
+    items: list[RedisItem] = [
+        *UpdateItem.filter(param1__in=[0, 1, 2]),
+        *CompactUpdateItem.filter(param1__in=[0, 1]),
+        UpdateItem(param1=100, attr1=0, attr2=""),
+    ]
+    execute_calls_count: int = client._pipe.execute_calls_count
+    result: OperationResult = orm.bulk_delete(items=items, chunk_size=4)
+    assert result.ok and result.message == "deleted=5"
+    # Обе порции содержат объекты модели с индексом значений: два pipeline на порцию
+    assert client._pipe.execute_calls_count == execute_calls_count + 4
+    assert sorted(item.param1 for item in UpdateItem.filter(param1="*")) == ["3", "4"]
+    assert sorted(item.param1 for item in CompactUpdateItem.filter(param1="*")) == ["2", "3", "4"]
@@ -0,0 +1,233 @@
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm.redis_impl.indexes import IndexPredicate
+from storage_orm.redis_impl.indexes import get_score_range
+from storage_orm.redis_impl.indexes import get_value_index_key
+from storage_orm.redis_impl.indexes import split_index_predicates
+from storage_orm.redis_impl.redis_item import STORAGE_KEYS
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.redis_item import STORAGE_BLOB
+
+from .mocked_redis import MockedRedis
+
+
+class IndexedItem(RedisItem):
+    date_time: int
+    status: str
+    any_value: float
+
+    class Meta:
+        table = "subsystem.{subsystem_id}.tag.{tag_id}"
+        indexes = ["date_time", "status"]
+
+
+@pytest.fixture
+def mocked_redis(monkeypatch: MonkeyPatch) -> MockedRedis:
+    """ Подключение с данными шести объектов двух подсистем """
+    mocked_redis: MockedRedis = MockedRedis()
+    # Глобальное подключение, установленное RedisORM, восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    RedisORM(client=mocked_redis).bulk_create(items=[
+        IndexedItem(
+            subsystem_id=tag_id % 2,
+            tag_id=tag_id,
+            date_time=1_600_000_000 + tag_id * 60,
+            status="ok" if tag_id < 4 else "error",
+            any_value=tag_id / 10,
+        )
+            for tag_id in range(6)
+    ])
+    mocked_redis._pipe.scan_calls.clear()
+    return mocked_redis
+
+
+def test_split_index_predicates() -> None:
+    """ Условия по индексируемым полям отделяются от параметров Meta.table """
+    predicates, kwargs = split_index_predicates(
+        kwargs={"subsystem_id": 1, "date_time__gte": 10, "status__in": ["ok"]},
+        indexes={"date_time": True, "status": False},
+        fields=["date_time", "status", "any_value"],
+    )
+    assert predicates == [
+        IndexPredicate(field="date_time", operator="gte", value=10),
+        IndexPredicate(field="status", operator="in", value=["ok"]),
+    ]
+    assert kwargs == {"subsystem_id": 1}
+    with pytest.raises(ValueError):
+        split_index_predicates(kwargs={"any_value": 1.}, indexes={"date_time": True}, fields=["any_value"])
+    with pytest.raises(ValueError):
+        split_index_predicates(kwargs={"status__gt": "a"}, indexes={"status": False}, fields=["status"])
+
+
+@pytest.mark.parametrize(
+    "operator_name, expected_range", [
+        ("gt", ("(5", "+inf")),
+        ("gte", (5, "+inf")),
+        ("lt", ("-inf", "(5")),
+        ("lte", ("-inf", 5)),
+        ("eq", (5, 5)),
+    ],
+)
+def test_get_score_range(operator_name: str, expected_range: tuple) -> None:
+    assert get_score_range(operator_name=operator_name, value=5) == expected_range
+
+
+def test_unknown_index_field() -> None:
+    """ Индекс по неизвестному полю - ошибка объявления модели """
+    with pytest.raises(ValueError):
+        class UnknownIndexItem(RedisItem):
+            attr1: int
+
+            class Meta:
+                table = "param1.{param1}"
+                indexes = ["attr2"]
+
+
+def test_save_updates_indexes() -> None:
+    """
+        Запись объекта и обновление индексов выполняются одним pipeline
+          (после получения последних индексированных значений полей)
+    """
+    mocked_redis: MockedRedis = MockedRedis()
+    item: IndexedItem = IndexedItem(subsystem_id=1, tag_id=2, date_time=100, status="ok", any_value=.5)
+    assert item.using(db_instance=mocked_redis).save().ok
+    assert mocked_redis._pipe.execute_calls_count == 2
+    # MSET, ZADD, SADD и HSET обратной записи индекса значений
+    assert mocked_redis._pipe.calls_count == 4
+    assert b"subsystem.1.tag.2" in next(iter(mocked_redis._sets.values()))
+
+
+def test_filter_by_range(mocked_redis: MockedRedis) -> None:
+    """ Выборка по диапазону значений индексируемого поля без поиска ключей """
+    model: type = IndexedItem.using(db_instance=mocked_redis)
+    items: list[IndexedItem] = model.filter(date_time__gte=1_600_000_060, date_time__lt=1_600_000_240)
+    assert sorted(item.tag_id for item in items) == ["1", "2", "3"]
+    assert not mocked_redis._pipe.scan_calls
+
+
+def test_filter_by_equality_and_table_params(mocked_redis: MockedRedis) -> None:
+    """ Пересечение условий по индексам и отбор по параметрам Meta.table """
+    model: type = IndexedItem.using(db_instance=mocked_redis)
+    items: list[IndexedItem] = model.filter(subsystem_id=1, status="ok")
+    assert sorted(item.tag_id for item in items) == ["1", "3"]
+    items = model.filter(status__in=["ok", "error"], date_time__gt=1_600_000_180)
+    assert sorted(item.tag_id for item in items) == ["4", "5"]
+    assert len(list(model.iter_filter(status="error", batch_size=1))) == 2
+
+
+def test_filter_stale_index(mocked_redis: MockedRedis) -> None:
+    """ Устаревшие записи индекса (после изменения значения поля) исключаются из результата """
+    model: type = IndexedItem.using(db_instance=mocked_redis)
+    item: IndexedItem = model.get(subsystem_id=0, tag_id=0)
+    model(subsystem_id=0, tag_id=0, date_time=item.date_time, status="error", any_value=0.).save()
+    assert sorted(item.tag_id for item in model.filter(status="ok")) == ["1", "2", "3"]
+    assert sorted(item.tag_id for item in model.filter(status="error")) == ["0", "4", "5"]
+
+
+def test_filter_as_columns_by_range(mocked_redis: MockedRedis) -> None:
+    """ Колонки значений по условиям на индексируемые поля """
+    pytest.importorskip("numpy")
+    model: type = IndexedItem.using(db_instance=mocked_redis)
+    columns: dict = model.filter(date_time__lte=1_600_000_060, status="ok", as_columns=True)
+    assert columns["tag_id"].tolist() == ["0", "1"]
+
+
+def get_value_index_members(mocked_redis: MockedRedis, status: str) -> set[bytes]:
+    key: str = get_value_index_key(table=IndexedItem.Meta.table, field="status", value=status)
+    return mocked_redis._sets.get(key.encode(), set())
+
+
+@pytest.mark.parametrize("storage_type", [STORAGE_KEYS, STORAGE_HASH, STORAGE_BLOB])
+def test_purge_removes_value_indexes(monkeypatch: MonkeyPatch, storage_type: str) -> None:
+    """ Удаление по параметрам Meta.table удаляет префиксы записей из индексов значений """
+    class PurgedItem(IndexedItem):
+        __annotations__ = dict(IndexedItem.__annotations__)
+
+        class Meta:
+            table = IndexedItem.Meta.table
+            indexes = ["date_time", "status"]
+            storage = storage_type
+
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    mocked_redis: MockedRedis = MockedRedis()
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    assert orm.bulk_create(items=[
+        PurgedItem(subsystem_id=tag_id % 2, tag_id=tag_id, date_time=tag_id, status=str(tag_id % 3), any_value=0.)
+            for tag_id in range(6)
+    ]).ok
+    assert orm.purge(model=PurgedItem, subsystem_id=1).message == "purged=3"
+    assert {
+        status: sorted(get_value_index_members(mocked_redis=mocked_redis, status=str(status)))
+            for status in range(3)
+    } == {0: [b"subsystem.0.tag.0"], 1: [b"subsystem.0.tag.4"], 2: [b"subsystem.0.tag.2"]}
+    assert orm.purge(model=PurgedItem).message == "purged=3"
+    assert not any(mocked_redis._sets.values())
+    assert not any(mocked_redis._sorted_sets.values())
+
+
+@pytest.mark.parametrize("storage_type", [STORAGE_KEYS, STORAGE_HASH, STORAGE_BLOB])
+def test_overwrite_removes_previous_value_index(monkeypatch: MonkeyPatch, storage_type: str) -> None:
+    """
+        Перезапись записи новым объектом (bulk_create, save) удаляет префикс записи из индекса
+          прежнего значения, удаление (purge) - из индекса последнего значения вместе с обратной записью
+    """
+    class OverwrittenItem(IndexedItem):
+        __annotations__ = dict(IndexedItem.__annotations__)
+
+        class Meta:
+            table = IndexedItem.Meta.table
+            indexes = ["date_time", "status"]
+            storage = storage_type
+
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    mocked_redis: MockedRedis = MockedRedis()
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    for prefix in ("a", "b"):
+        assert orm.bulk_create(items=[
+            OverwrittenItem(
+                subsystem_id=0,
+                tag_id=tag_id,
+                date_time=tag_id,
+                status=f"{prefix}{tag_id % 2}",
+                any_value=0.,
+            )
+                for tag_id in range(4)
+        ]).ok
+    assert OverwrittenItem(subsystem_id=0, tag_id=0, date_time=0, status="c", any_value=0.).save().ok
+    assert {
+        status: sorted(get_value_index_members(mocked_redis=mocked_redis, status=status))
+            for status in ("a0", "a1", "b0", "b1", "c")
+    } == {
+        "a0": [],
+        "a1": [],
+        "b0": [b"subsystem.0.tag.2"],
+        "b1": [b"subsystem.0.tag.1", b"subsystem.0.tag.3"],
+        "c": [b"subsystem.0.tag.0"],
+    }
+    assert [item.tag_id for item in OverwrittenItem.filter(status="c")] == ["0"]
+    assert orm.purge(model=OverwrittenItem).message == "purged=4"
+    assert not any(mocked_redis._sets.values())
+    assert not mocked_redis._hashes
+
+
+@pytest.mark.parametrize("update_fields", [None, ["status"]])
+def test_update_removes_previous_value_index(mocked_redis: MockedRedis, update_fields: list) -> None:
+    """ Запись изменённого значения поля удаляет префикс записи из индекса прежнего значения """
+    model: type = IndexedItem.using(db_instance=mocked_redis)
+    item: IndexedItem = model.get(subsystem_id=0, tag_id=0)
+    item.status = "changed"
+    item.status = "error"
+    assert item.save(update_fields=update_fields).ok
+    assert b"subsystem.0.tag.0" not in get_value_index_members(mocked_redis=mocked_redis, status="ok")
+    assert b"subsystem.0.tag.0" in get_value_index_members(mocked_redis=mocked_redis, status="error")
+    assert not item._replaced_values
+    # Удаление объекта, изменённого после записи, удаляет записанное и новое значения
+    item.status = "new"
+    assert item.delete().ok
+    assert not any(
+        b"subsystem.0.tag.0" in members
+            for members in mocked_redis._sets.values()
+    )
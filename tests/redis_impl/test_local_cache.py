@@ -0,0 +1,50 @@
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm.redis_impl import local_cache
+from storage_orm.redis_impl.local_cache import LocalCache
+
+
+@pytest.fixture
+def cache() -> LocalCache:
+    return LocalCache(max_items=2, ttl=10.)
+
+
+def test_hits_and_misses(cache: LocalCache) -> None:
+    """ Учёт попаданий и промахов """
+    cache.put("table.1", 1)
+    assert cache.get("table.1") == 1
+    assert cache.get("table.2") is None
+    assert (cache.info.hits, cache.info.misses, cache.info.size) == (1, 1, 1)
+
+
+def test_lru_eviction(cache: LocalCache) -> None:
+    """ При переполнении вытесняется наиболее давно использованный объект """
+    cache.put("table.1", 1)
+    cache.put("table.2", 2)
+    # Обращение делает table.1 последним использованным
+    cache.get("table.1")
+    cache.put("table.3", 3)
+    assert cache.get("table.2") is None
+    assert cache.get("table.1") == 1
+    assert cache.get("table.3") == 3
+
+
+def test_ttl_expiration(cache: LocalCache, monkeypatch: MonkeyPatch) -> None:
+    """ Просроченный объект удаляется из кеша и считается промахом """
+    current_time: list[float] = [100.]
+    monkeypatch.setattr(local_cache, "monotonic", lambda: current_time[0])
+    cache.put("table.1", 1)
+    current_time[0] += 5.
+    assert cache.get("table.1") == 1
+    current_time[0] += 10.
+    assert cache.get("table.1") is None
+    assert cache.info.size == 0
+
+
+def test_invalidate(cache: LocalCache) -> None:
+    """ Удаление объекта из кеша """
+    cache.put("table.1", 1)
+    cache.invalidate("table.1")
+    cache.invalidate("not_exists")
+    assert cache.get("table.1") is None
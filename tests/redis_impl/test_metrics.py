@@ -0,0 +1,129 @@
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import CallbackHook
+from storage_orm import InMemoryCollector
+from storage_orm import OperationMetrics
+from storage_orm.redis_impl import metrics
+from storage_orm.redis_impl.metrics import Histogram
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+
+from .mocked_redis import MockedRedis
+
+
+class MetricsItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "metrics.{param1}.{param2}"
+
+
+class MetricsHashItem(RedisItem):
+    attr1: int
+
+    class Meta:
+        table = "metrics_hash.{param1}"
+        storage = STORAGE_HASH
+
+
+@pytest.fixture
+def orm(monkeypatch: MonkeyPatch) -> RedisORM:
+    # Глобальное подключение и обработчики метрик восстанавливаются после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    for model in (RedisItem, MetricsItem, MetricsHashItem):
+        monkeypatch.setattr(model, "_metrics_hooks", ())
+    orm: RedisORM = RedisORM(client=MockedRedis())
+    orm.bulk_create(items=[MetricsItem(param1=i, param2=i % 2, attr1=i, attr2="value") for i in range(10)])
+    orm.bulk_create(items=[MetricsHashItem(param1=i, attr1=i) for i in range(10)])
+    return orm
+
+
+def test_filter_metrics(orm: RedisORM) -> None:
+    """ Этапы, сетевые запросы, ключи и объём ответа filter() """
+    collector: InMemoryCollector = InMemoryCollector()
+    RedisItem.add_metrics_hook(collector)
+    assert len(MetricsItem.filter(param1="*", param2=1)) == 5
+    assert len(MetricsItem.filter(param1__in=[1, 2], param2=1)) == 1
+
+    stats = collector.get_stats(operation="filter", model="MetricsItem")
+    assert stats is not None
+    assert stats.count == 2 and stats.errors == 0
+    assert set(stats.phases) == {"discover", "cache", "fetch", "build"}
+    assert stats.phases["discover"].count == 2
+    # SCAN (один раунд) и MGET, затем только MGET по точным ключам
+    assert stats.round_trips == 3
+    assert stats.keys == 5 * 2 + 2 * 2
+    # Значения ответов MGET: attr1 ("1", "3", ...), attr2 ("value") и имена найденных ключей
+    assert stats.bytes > 6 * len("value")
+    assert "filter:MetricsItem" in collector.snapshot()
+
+
+def test_model_hooks(orm: RedisORM) -> None:
+    """ Обработчик модели не получает метрики других моделей, отключение обработчика """
+    operations: list[OperationMetrics] = []
+    hook: CallbackHook = CallbackHook(operations.append)
+    MetricsHashItem.add_metrics_hook(hook)
+    MetricsItem.get(param1=1, param2=1)
+    MetricsHashItem.get(param1=1)
+    assert [(item.operation, item.model, item.round_trips, item.keys) for item in operations] == [
+        ("filter", "MetricsHashItem", 1, 1),
+    ]
+    assert operations[0].attributes["storage_orm.keys"] == 1
+    MetricsHashItem.remove_metrics_hook(hook)
+    MetricsHashItem.get(param1=1)
+    assert len(operations) == 1
+
+
+def test_orm_metrics(orm: RedisORM) -> None:
+    """ Метрики bulk_create и bulk_get: порции, формирование данных, запись """
+    collector: InMemoryCollector = InMemoryCollector(slow_threshold=0.)
+    orm._metrics_hooks = (collector,)
+    orm.bulk_create(items=[MetricsItem(param1=i, param2=0, attr1=i, attr2="a") for i in range(10)], chunk_size=4)
+    orm.bulk_get(items=[{"param1": i} for i in range(3)], model=MetricsHashItem)
+
+    bulk_create_stats = collector.get_stats(operation="bulk_create")
+    assert bulk_create_stats.round_trips == 3
+    assert bulk_create_stats.keys == 20
+    assert set(bulk_create_stats.phases) == {"encode", "write"}
+    bulk_get_stats = collector.get_stats(operation="bulk_get", model="MetricsHashItem")
+    assert bulk_get_stats.round_trips == 1 and bulk_get_stats.keys == 3
+    assert len(collector.slow_operations) == 2
+    collector.reset()
+    assert not collector.snapshot()
+
+
+def test_errors_and_failing_hooks(orm: RedisORM) -> None:
+    """ Исключение операции отмечается в метриках, исключение обработчика не влияет на операцию """
+    operations: list[OperationMetrics] = []
+
+    def failing_hook(metrics: OperationMetrics) -> None:
+        raise RuntimeError("hook error")
+
+    MetricsItem.add_metrics_hook(CallbackHook(failing_hook))
+    MetricsItem.add_metrics_hook(CallbackHook(operations.append))
+    assert MetricsItem.get(param1=2, param2=0).attr1 == 2
+    orm._client._pipe.scan = None
+    with pytest.raises(TypeError):
+        MetricsItem.filter(param1="*", param2=0)
+    assert [item.error is None for item in operations] == [True, False]
+
+
+def test_disabled_metrics() -> None:
+    """ Без обработчиков контексты операций и этапов не собирают метрики """
+    assert metrics.track(hooks=(), operation="filter") is metrics.phase("fetch")
+    items: list[int] = [1, 2]
+    assert metrics.timed(items, name="encode") is items
+    metrics.record(payload=[b"value"])
+
+
+def test_histogram() -> None:
+    histogram: Histogram = Histogram(buckets=(0.1, 1.))
+    for value in (0.05, 0.5, 0.5, 3.):
+        histogram.observe(value)
+    assert histogram.counts == [1, 2, 1]
+    assert histogram.quantile(0.5) == 1.
+    assert histogram.quantile(1.) == 3.
+    assert histogram.as_dict()["buckets"] == {"0.1": 1, "1.0": 2, "+Inf": 1}
@@ -0,0 +1,178 @@
+import random
+import fnmatch
+import itertools
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm.redis_impl.planner import PLAN_EXACT
+from storage_orm.redis_impl.planner import PLAN_PATTERNS
+from storage_orm.redis_impl.planner import PLAN_SCAN
+from storage_orm.redis_impl.planner import QueryPlan
+from storage_orm.redis_impl.planner import build_plan
+from storage_orm.redis_impl.planner import collapse_values
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+
+from .mocked_redis import MockedRedis
+
+
+class PlannerItem(RedisItem):
+    any_value: int
+
+    class Meta:
+        table = "planner.{param1}.tag.{param2}"
+        max_patterns = 4
+
+
+class PlannerRegistryItem(RedisItem):
+    any_value: int
+
+    class Meta:
+        table = "planner_registry.{param1}.tag.{param2}"
+        storage = STORAGE_HASH
+        registry = "sharded"
+        max_patterns = 4
+
+
+@pytest.fixture
+def mocked_redis(monkeypatch: MonkeyPatch) -> MockedRedis:
+    # Глобальное подключение восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    mocked_redis: MockedRedis = MockedRedis()
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    for model in (PlannerItem, PlannerRegistryItem):
+        orm.bulk_create(items=[
+            model(param1=param1, param2=param2, any_value=param1 * 10 + param2)
+                for param1 in range(30)
+                    for param2 in range(3)
+        ])
+    return mocked_redis
+
+
+@pytest.mark.parametrize(
+    "values, expected_patterns", [
+        ([0, 1, 2], ["[0-2]"]),
+        (["10", "11", "12", "20", "21", "22"], ["[12][0-2]"]),
+        (["1", "22", "23", "3*"], ["1", "2[23]", "3*"]),
+        (["a", "b", "1", "a"], ["[1ab]"]),
+        (["10", "21"], ["10", "21"]),
+    ],
+)
+def test_collapse_values(values: list, expected_patterns: list[str]) -> None:
+    """ Значения объединяются в классы символов, только если паттерн не совпадает с лишними значениями """
+    assert collapse_values(values=values) == expected_patterns
+
+
+def test_collapse_values_exact() -> None:
+    """ Паттерны объединённых значений совпадают в точности с исходными значениями """
+    universe: list[str] = ["".join(chars) for length in (1, 2) for chars in itertools.product("0129ab", repeat=length)]
+    random_generator: random.Random = random.Random(0)
+    for _ in range(200):
+        values: list[str] = random_generator.sample(universe, k=random_generator.randint(1, 12))
+        patterns: list[str] = collapse_values(values=values)
+        assert len(patterns) <= len(values)
+        assert {
+            value for value in universe
+                if any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+        } == set(values)
+
+
+def test_build_plan_strategies() -> None:
+    """ Выбор плана: точные префиксы, объединённые паттерны, расширенные паттерны с отбором на клиенте """
+    schema = PlannerItem._schema
+    exact_plan: QueryPlan = build_plan(schema=schema, kwargs={"param1__in": [1, 2], "param2": 0})
+    assert exact_plan.strategy == PLAN_EXACT
+    assert exact_plan.tables == ["planner.1.tag.0", "planner.2.tag.0"]
+
+    patterns_plan: QueryPlan = build_plan(schema=schema, kwargs={"param1__in": list(range(10, 20)) + [3]})
+    assert patterns_plan.strategy == PLAN_PATTERNS
+    assert patterns_plan.patterns == ["planner.1[0-9].tag.*", "planner.3.tag.*"]
+    assert patterns_plan.cartesian_count == 11
+
+    scan_plan: QueryPlan = build_plan(
+        schema=schema,
+        kwargs={"param1__in": [1, 13, 25, 27], "param2__in": ["0", "2*"]},
+        max_patterns=2,
+    )
+    assert scan_plan.strategy == PLAN_SCAN
+    assert scan_plan.patterns == ["planner.*.tag.0", "planner.*.tag.2*"]
+    assert scan_plan.filter_keys(keys=[b"planner.13.tag.0", b"planner.14.tag.0", b"planner.27.tag.21"]) == [
+        b"planner.13.tag.0",
+        b"planner.27.tag.21",
+    ]
+
+    empty_plan: QueryPlan = build_plan(schema=schema, kwargs={"param1__in": [], "param2": 0})
+    assert empty_plan.strategy == PLAN_EXACT and empty_plan.tables == []
+
+
+@pytest.mark.parametrize("model", [PlannerItem, PlannerRegistryItem])
+def test_filter_by_plan(mocked_redis: MockedRedis, model: type) -> None:
+    """ Паттернов больше Meta.max_patterns - отбор префиксов записей выполняется на стороне клиента """
+    param1_values: list[int] = [1, 4, 9, 13, 22, 27, 100]
+    result: list[RedisItem] = model.filter(param1__in=param1_values, param2__in=[0, "2"])
+    assert sorted(item.any_value for item in result) == sorted(
+        param1 * 10 + param2 for param1 in param1_values[:-1] for param2 in (0, 2)
+    )
+    iterated: list[RedisItem] = list(model.iter_filter(param1__in=param1_values, param2="1", batch_size=2))
+    assert sorted(item.any_value for item in iterated) == [param1 * 10 + 1 for param1 in param1_values[:-1]]
+
+
+def test_filter_patterns_count(mocked_redis: MockedRedis) -> None:
+    """ Количество паттернов поиска не превышает Meta.max_patterns """
+    assert len(PlannerItem.filter(param1__in=list(range(0, 30, 3)))) == 30
+    assert [call["match"] for call in mocked_redis._pipe.scan_calls] == [
+        "planner.[0369].tag.*.*",
+        "planner.1[258].tag.*.*",
+        "planner.2[147].tag.*.*",
+    ]
+    mocked_redis._pipe.scan_calls.clear()
+    assert len(PlannerItem.filter(param1__in=[1, 13, 25, 27, 5, 100, 222])) == 15
+    assert {call["match"] for call in mocked_redis._pipe.scan_calls} == {"planner.*.tag.*.*"}
+    mocked_redis._pipe.scan_calls.clear()
+    assert len(PlannerItem.filter(param1__in=list(range(10, 20)), param2="1*")) == 10
+    assert {call["match"] for call in mocked_redis._pipe.scan_calls} == {"planner.1[0-9].tag.1*.*"}
+
+
+def test_purge_by_plan(mocked_redis: MockedRedis) -> None:
+    """ Удаление по расширенным паттернам не затрагивает записи, не совпадающие с аргументами """
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    assert orm.purge(model=PlannerItem, param1__in=[1, 13, 25, 27, 5, 100, 222]).message == "purged=15"
+    assert len(PlannerItem.filter(param1="*")) == 75
+
+
+def test_explain(mocked_redis: MockedRedis) -> None:
+    assert PlannerItem.explain(param1__in=[1, 2], param2=0) == {
+        "strategy": PLAN_EXACT,
+        "source": "keys",
+        "patterns": [],
+        "patterns_count": 0,
+        "cartesian_count": 2,
+        "tables_count": 2,
+        "client_filters": [],
+        "round_trips": 1,
+    }
+    explained: dict = PlannerItem.explain(
+        param1__in=[1, 13, 25, 27, 5, 100, 222],
+        param2__in=[0, "1*"],
+        scan_count=100,
+    )
+    assert explained["strategy"] == PLAN_SCAN
+    assert explained["patterns"] == ["planner.*.tag.0.*", "planner.*.tag.1*.*"]
+    assert explained["cartesian_count"] == 14
+    assert explained["client_filters"] == ["param1"]
+    # Ключи двух моделей и реестра: 90 + 90 + 31 - три раунда SCAN и MGET
+    assert explained["round_trips"] == 4
+    assert PlannerRegistryItem.explain(param1=1, param2="*")["source"] == "registry"
+
+
+def test_max_patterns_validation() -> None:
+    with pytest.raises(ValueError) as exception:
+        class InvalidItem(RedisItem):
+            any_value: int
+
+            class Meta:
+                table = "invalid.{param1}"
+                max_patterns = 0
+
+    assert "max_patterns" in str(exception.value)
@@ -1,13 +1,24 @@
 import pytest
 import redis
+import asyncio
 from pytest import MonkeyPatch
+from typing import Any
+from typing import Callable
 from typing import Union
 
 from storage_orm import RedisItem
+from storage_orm import OperationResult
 from storage_orm import MoreThanOneFoundException
 from storage_orm import NotFoundException
+from storage_orm.redis_impl.redis_item import SCAN_COUNT
+from storage_orm.redis_impl.redis_item import STORAGE_KEYS
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.redis_item import STORAGE_BLOB
+from storage_orm.redis_impl.planner import QueryPlan
+from storage_orm.redis_impl.planner import build_plan
 
 from .mocked_redis import MockedRedis
+from .mocked_async_redis import MockedAsyncRedis
 
 
 @pytest.fixture
@@ -155,6 +166,16 @@ def test_using_when_defined(test_item: RedisItem, monkeypatch: MonkeyPatch) -> N
         assert test_item._db_instance == tmp_redis_1
 
 
+def test_using_shares_schema(cached_item_class: type, monkeypatch: MonkeyPatch) -> None:
+    """ Копия класса using() использует скомпилированную схему и кеши исходной модели без повторной компиляции """
+    model: type = cached_item_class.__mro__[1]
+    monkeypatch.setattr(model, "_compile_schema", lambda: pytest.fail("schema compiled again"))
+    copied_class: type = model.using(db_instance=MockedRedis())
+    assert copied_class._schema is model._schema
+    assert copied_class._caches is model._caches is not None
+    assert copied_class.__annotations__ == model.__annotations__
+
+
 def test_save_when_instance_not_defined(test_item: RedisItem) -> None:
     """
         Сохранение объекта в БД.
@@ -229,6 +250,478 @@ def test_get_multiple_items_found(monkeypatch: MonkeyPatch) -> None:
         ),
     ],
 )
-def test_get_list_of_prepared_kwargs(input_kwargs: dict, expected_kwargs: dict) -> None:
-    """ Формирование элементов для использования в паттерне поиска """
-    assert RedisItem._get_list_of_prepared_kwargs(kwargs=input_kwargs) == expected_kwargs
+def test_build_plan_in_combinations(test_item: RedisItem, input_kwargs: dict, expected_kwargs: dict) -> None:
+    """ Префиксы записей плана выборки - все комбинации значений __in с остальными аргументами """
+    plan: QueryPlan = build_plan(schema=test_item._schema, kwargs=input_kwargs)
+    assert plan.tables == [test_item._schema.build_table(kwargs) for kwargs in expected_kwargs]
+
+
+def _get_db_data(src_dict: dict) -> dict[bytes, bytes]:
+    """ Искусственное формирование данных БД (ключ-значение) из словаря """
+    prefix: str = _get_prefix(src_dict=src_dict)
+    return {
+        f"{prefix}.{key}".encode(): value if isinstance(value, bytes) else str(value).encode()
+            for key, value in src_dict.items()
+                if key.startswith("attr")
+    }
+
+
+def test_filter_uses_scan(test_item: RedisItem, test_input_dict: dict) -> None:
+    """ Поиск ключей должен выполняться через SCAN с подсказкой COUNT из Meta """
+    mocked_redis: MockedRedis = MockedRedis(data=_get_db_data(src_dict=test_input_dict))
+    result: list[RedisItem] = test_item.__class__.using(db_instance=mocked_redis).filter(
+        param1=test_input_dict["param1"],
+    )
+    # Повторно возвращённые SCAN ключи не должны влиять на результат
+    assert [item.mapping for item in result] == [test_item.mapping]
+    assert mocked_redis._pipe.scan_calls == [{
+        "match": f"param1.{test_input_dict['param1']}.param2.*.*",
+        "count": SCAN_COUNT,
+    }]
+
+
+def test_filter_scan_count_argument(test_item: RedisItem, test_input_dict: dict) -> None:
+    """ Подсказка COUNT, переданная в filter(), приоритетнее значения из Meta """
+    mocked_redis: MockedRedis = MockedRedis(data=_get_db_data(src_dict=test_input_dict))
+    test_item.__class__.using(db_instance=mocked_redis).filter(param1="not_exists", scan_count=17)
+    assert mocked_redis._pipe.scan_calls[0]["count"] == 17
+
+
+def test_meta_scan_count() -> None:
+    """ Подсказка COUNT может быть переопределена в Meta модели """
+    class ScanItem(RedisItem):
+        attr1: int
+
+        class Meta:
+            table = "param1.{param1}.param2.{param2}"
+            scan_count = 50
+
+    mocked_redis: MockedRedis = MockedRedis()
+    ScanItem.using(db_instance=mocked_redis).filter(param1=1)
+    assert mocked_redis._pipe.scan_calls[0]["count"] == 50
+
+
+def test_iter_filter_batches(test_item: RedisItem, test_input_dict: dict) -> None:
+    """ Потоковая выборка должна запрашивать значения порциями по batch_size объектов """
+    db_data: dict[bytes, bytes] = {}
+    expected_mappings: list[dict] = []
+    for param2 in range(3):
+        item_dict: dict = test_input_dict | {"param2": param2}
+        db_data |= _get_db_data(src_dict=item_dict)
+        expected_mappings.append(test_item.__class__(**item_dict).mapping)
+    mocked_redis: MockedRedis = MockedRedis(data=db_data)
+    items_iterator = test_item.__class__.using(db_instance=mocked_redis).iter_filter(
+        param1=test_input_dict["param1"],
+        batch_size=2,
+    )
+    # Первая порция запрашивается только при обращении к генератору
+    assert not mocked_redis.mget_calls
+    first_item: RedisItem = next(items_iterator)
+    assert len(mocked_redis.mget_calls) == 1
+    result: list[RedisItem] = [first_item, *items_iterator]
+    # Повторно возвращённые SCAN ключи не должны приводить к дублированию объектов
+    assert sorted(map(str, (item.mapping for item in result))) == sorted(map(str, expected_mappings))
+    assert len(mocked_redis.mget_calls) == 2
+
+
+def test_iter_filter_empty_filter(test_item: RedisItem) -> None:
+    """ Потоковая выборка без фильтра запрещена """
+    with pytest.raises(Exception) as exception:
+        next(test_item.__class__.using(db_instance=MockedRedis()).iter_filter())
+
+    assert "empty filter" in str(exception.value)
+
+
+@pytest.mark.parametrize("count", [1, 100, 1_000])
+def test_objects_from_db_items_linear_scaling(
+    test_item: RedisItem,
+    test_input_dict: dict,
+    monkeypatch: MonkeyPatch,
+    count: int,
+) -> None:
+    """ Формирование объектов линейно: каждое значение декодируется один раз, один конструктор на объект """
+    model: type = test_item.__class__
+    db_data: dict[bytes, bytes] = {}
+    for param2 in range(count):
+        db_data |= _get_db_data(src_dict=test_input_dict | {"param2": param2})
+    decode_calls: list[str] = []
+    init_calls: list[dict] = []
+
+    def counted(field: str, decoder: Callable[[bytes], Any]) -> Callable[[bytes], Any]:
+        def decode(value: bytes) -> Any:
+            decode_calls.append(field)
+            return decoder(value)
+        return decode
+
+    for field, decoder in dict(model._schema.decoders).items():
+        monkeypatch.setitem(model._schema.decoders, field, counted(field=field, decoder=decoder))
+    original_init: Callable[..., None] = model.__init__
+
+    def init(self: RedisItem, **kwargs) -> None:
+        init_calls.append(kwargs)
+        original_init(self, **kwargs)
+
+    monkeypatch.setattr(model, "__init__", init)
+    result: list[RedisItem] = model._objects_from_db_items(items=db_data)
+    assert len(result) == len(init_calls) == count
+    assert len(decode_calls) == len(db_data) == count * len(model._schema.fields)
+
+
+@pytest.fixture
+def mocked_redis_with_items(test_input_dict: dict) -> MockedRedis:
+    """ Подключение с данными пяти объектов, различающихся значением param2 """
+    db_data: dict[bytes, bytes] = {}
+    for param2 in range(5):
+        db_data |= _get_db_data(src_dict=test_input_dict | {"param2": param2})
+    return MockedRedis(data=db_data)
+
+
+def test_filter_pipelines_patterns(test_item: RedisItem, mocked_redis_with_items: MockedRedis) -> None:
+    """ Поиск по нескольким паттернам выполняется одним pipeline, значения - одним MGET """
+    # Значения с символами glob не объединяются - каждое значение является отдельным паттерном
+    result: list[RedisItem] = test_item.__class__.using(db_instance=mocked_redis_with_items).filter(
+        param2__in=[0, "1*", "[34]"],
+    )
+    assert len(result) == 4
+    assert len(mocked_redis_with_items._pipe.scan_calls) == 3
+    assert mocked_redis_with_items._pipe.execute_calls_count == 1
+    assert len(mocked_redis_with_items.mget_calls) == 1
+
+
+def test_filter_exact_keys_without_scan(
+    test_item: RedisItem,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Если аргументы однозначно определяют ключи - поиск ключей не выполняется """
+    result: list[RedisItem] = test_item.__class__.using(db_instance=mocked_redis_with_items).filter(
+        param1=test_input_dict["param1"],
+        param2__in=[1, 3, 7],
+    )
+    assert sorted(item.param2 for item in result) == ["1", "3"]
+    assert not mocked_redis_with_items._pipe.scan_calls
+    assert mocked_redis_with_items.mget_calls == [[
+        f"param1.{test_input_dict['param1']}.param2.{param2}.{field}".encode()
+            for param2 in (1, 3, 7)
+                for field in test_item.__annotations__
+    ]]
+
+
+@pytest.mark.parametrize(
+    "input_kwargs, expected_tables", [
+        ({"param1": "1", "param2": "2"}, ["param1.1.param2.2"]),
+        ({"param1__in": [1, 2], "param2": 3}, ["param1.1.param2.3", "param1.2.param2.3"]),
+        ({"param1": "1"}, None),
+        ({"param1": "1", "param2": "*"}, None),
+        ({"param1": "[12]", "param2": "2"}, None),
+    ],
+)
+def test_build_plan_tables(test_item: RedisItem, input_kwargs: dict, expected_tables: list) -> None:
+    """ Формирование префиксов записей без поиска возможно только при полностью определённых аргументах """
+    assert build_plan(schema=test_item._schema, kwargs=input_kwargs).tables == expected_tables
+
+
+def test_get_exact_keys_single_mget(
+    test_item: RedisItem,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Получение объекта по всем параметрам Meta.table - одна команда MGET без поиска ключей """
+    item: RedisItem = test_item.__class__.using(db_instance=mocked_redis_with_items).get(
+        param1=test_input_dict["param1"],
+        param2=4,
+    )
+    assert item.mapping == test_item.__class__(**(test_input_dict | {"param2": "4"})).mapping
+    assert not mocked_redis_with_items._pipe.scan_calls
+    assert len(mocked_redis_with_items.mget_calls) == 1
+
+
+def test_iter_filter_exact_keys_without_scan(
+    test_item: RedisItem,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Потоковая выборка по полностью определённым аргументам не выполняет поиск ключей """
+    result: list[RedisItem] = list(test_item.__class__.using(db_instance=mocked_redis_with_items).iter_filter(
+        param1=test_input_dict["param1"],
+        param2__in=[0, 1, 2],
+        batch_size=2,
+    ))
+    assert len(result) == 3
+    assert not mocked_redis_with_items.scan_calls
+    assert len(mocked_redis_with_items.mget_calls) == 2
+
+
+def test_afilter_not_instance(test_item: RedisItem) -> None:
+    """ Осмысленное исключение, при отсутствии асинхронного подключения к БД """
+    with pytest.raises(Exception) as exception:
+        asyncio.run(test_item.__class__.afilter(param1="any_value"))
+
+    assert "not connected" in str(exception.value)
+
+
+def test_afilter_concurrency_limit(test_item: RedisItem, mocked_redis_with_items: MockedRedis) -> None:
+    """ Поиск по нескольким паттернам выполняется конкурентно, но не более concurrency одновременно """
+    mocked_async_redis: MockedAsyncRedis = MockedAsyncRedis(sync=mocked_redis_with_items)
+    result: list[RedisItem] = asyncio.run(
+        test_item.__class__.using(db_instance=mocked_async_redis).afilter(param2__in=[0, "1*", "[34]"], concurrency=2),
+    )
+    assert sorted(item.param2 for item in result) == ["0", "1", "3", "4"]
+    assert mocked_async_redis.max_concurrent_scans == 2
+    # Значения запрашиваются одним pipeline
+    assert mocked_redis_with_items.execute_calls_count == 1
+
+
+def test_aget_exact_keys(
+    test_item: RedisItem,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Получение объекта по всем параметрам Meta.table без поиска ключей (asyncio) """
+    mocked_async_redis: MockedAsyncRedis = MockedAsyncRedis(sync=mocked_redis_with_items)
+    item: RedisItem = asyncio.run(test_item.__class__.using(db_instance=mocked_async_redis).aget(
+        param1=test_input_dict["param1"],
+        param2=4,
+    ))
+    assert item.param2 == "4"
+    assert not mocked_redis_with_items.scan_calls
+
+
+def test_asave_called_mset(test_item: RedisItem) -> None:
+    """ Асинхронное сохранение объекта в БД должно быть реализовано через mset """
+    mocked_async_redis: MockedAsyncRedis = MockedAsyncRedis()
+    result: OperationResult = asyncio.run(test_item.using(db_instance=mocked_async_redis).asave())
+    assert result.ok
+    assert mocked_async_redis.sync.calls_count == 1
+
+
+def test_filter_by_items(test_item: RedisItem, test_input_dict: dict) -> None:
+    """ Получение объектов по префиксам записей переданных объектов (без поиска ключей) """
+    db_data: dict[bytes, bytes] = {}
+    for param2 in (1, 12, 2):
+        db_data |= _get_db_data(src_dict=test_input_dict | {"param2": param2})
+    mocked_redis: MockedRedis = MockedRedis(data=db_data)
+    model: type = test_item.__class__.using(db_instance=mocked_redis)
+    items: list[RedisItem] = [model(**test_input_dict | {"param2": param2}) for param2 in (12, 3)]
+    result: list[RedisItem] = model.filter(_items=items)
+    assert [item.param2 for item in result] == ["12"]
+    assert not mocked_redis._pipe.scan_calls
+    assert model.get(_items=items[:1]).param2 == "12"
+
+
+@pytest.fixture
+def cached_item_class(test_item: RedisItem, mocked_redis_with_items: MockedRedis) -> type:
+    """ Модель с локальным кешем, подключенная к БД с данными пяти объектов """
+    class CachedItem(test_item.__class__):  # type: ignore
+        __annotations__ = dict(test_item.__annotations__)
+
+        class Meta:
+            table = test_item.Meta.table
+            cache = {"max_items": 10, "ttl": 60.}
+
+    return CachedItem.using(db_instance=mocked_redis_with_items)
+
+
+def test_get_read_through_cache(
+    cached_item_class: type,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Повторное получение объекта обслуживается локальным кешем без обращения к БД """
+    first_item: RedisItem = cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    second_item: RedisItem = cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    assert first_item.mapping == second_item.mapping
+    assert len(mocked_redis_with_items.mget_calls) == 1
+    assert cached_item_class.cache_info()[:3] == (1, 1, 1)
+
+
+def test_save_write_through_cache(
+    cached_item_class: type,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Сохранённый объект доступен из локального кеша """
+    item: RedisItem = cached_item_class(**(test_input_dict | {"param2": "new"}))
+    assert item.save().ok
+    cached_item: RedisItem = cached_item_class.get(param1=test_input_dict["param1"], param2="new")
+    assert cached_item.mapping == item.mapping
+    assert not mocked_redis_with_items.mget_calls
+
+
+def test_save_update_fields_invalidates_cache(
+    cached_item_class: type,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ После частичной записи объект удаляется из кеша: следующее получение возвращает запись из БД """
+    cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    partial_item: RedisItem = cached_item_class(param1=test_input_dict["param1"], param2=1, attr2=5)
+    assert partial_item.save(update_fields=["attr2"]).ok
+    item: RedisItem = cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    assert item.attr2 == 5
+    assert item.attr1 == test_input_dict["attr1"]
+    assert len(mocked_redis_with_items.mget_calls) == 2
+
+
+def test_keyspace_event_invalidates_cache(
+    cached_item_class: type,
+    test_input_dict: dict,
+    mocked_redis_with_items: MockedRedis,
+) -> None:
+    """ Уведомление об изменении ключа объекта удаляет объект из локального кеша """
+    cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    cached_item_class._on_keyspace_event({
+        "channel": f"__keyspace@0__:param1.{test_input_dict['param1']}.param2.1.attr2".encode(),
+        "data": b"set",
+    })
+    cached_item_class.get(param1=test_input_dict["param1"], param2=1)
+    assert len(mocked_redis_with_items.mget_calls) == 2
+
+
+def test_cache_per_connection(cached_item_class: type, test_input_dict: dict) -> None:
+    """ Объекты разных БД кешируются раздельно: чтение через другое подключение не обслуживается чужим кешем """
+    model: type = cached_item_class.__mro__[1]
+    first_redis: MockedRedis = MockedRedis()
+    second_redis: MockedRedis = MockedRedis()
+    params: dict = test_input_dict | {"param2": "cached"}
+    assert model(**(params | {"attr2": 111})).using(db_instance=first_redis).save().ok
+    assert model(**(params | {"attr2": 222})).using(db_instance=second_redis).save().ok
+    assert model.using(db_instance=first_redis).get(param1=params["param1"], param2="cached").attr2 == 111
+    assert model.using(db_instance=second_redis).get(param1=params["param1"], param2="cached").attr2 == 222
+    assert model.using(db_instance=MockedRedis()).filter(param1=params["param1"], param2="cached") == []
+    assert not first_redis.mget_calls and not second_redis.mget_calls
+    assert model.cache_info(db_instance=first_redis).size == model.cache_info(db_instance=second_redis).size == 1
+
+
+def test_cache_info_disabled(test_item: RedisItem) -> None:
+    """ Кеш не используется, если не задан в Meta """
+    assert test_item.cache_info() is None
+
+
+@pytest.fixture
+def hash_item_class(test_item: RedisItem) -> type:
+    """ Модель с хранением объекта в одном hash """
+    class HashItem(test_item.__class__):  # type: ignore
+        __annotations__ = dict(test_item.__annotations__)
+
+        class Meta:
+            table = test_item.Meta.table
+            storage = STORAGE_HASH
+
+    return HashItem
+
+
+def test_hash_storage_save(hash_item_class: type, test_input_dict: dict) -> None:
+    """ Объект с хранением в hash сохраняется одной командой HSET по ключу записи """
+    mocked_redis: MockedRedis = MockedRedis()
+    item: RedisItem = hash_item_class(**test_input_dict)
+    assert item.using(db_instance=mocked_redis).save().ok
+    assert mocked_redis.calls_count == 1
+    assert not mocked_redis._data
+    assert mocked_redis._hashes == {
+        _get_prefix(src_dict=test_input_dict).encode(): {
+            key.encode(): value if isinstance(value, bytes) else str(value).encode()
+                for key, value in test_input_dict.items()
+                    if key.startswith("attr")
+        },
+    }
+
+
+def test_hash_storage_filter(hash_item_class: type, test_input_dict: dict) -> None:
+    """ Выборка объектов, хранящихся в hash: поиск по паттерну записи и HMGET одним pipeline """
+    mocked_redis: MockedRedis = MockedRedis()
+    for param2 in range(3):
+        hash_item_class(**(test_input_dict | {"param2": param2})).using(db_instance=mocked_redis).save()
+    model: type = hash_item_class.using(db_instance=mocked_redis)
+    result: list[RedisItem] = model.filter(param2__in=[0, 2])
+    assert sorted(item.param2 for item in result) == ["0", "2"]
+    assert result[0].attr2 == test_input_dict["attr2"]
+    assert {call["match"] for call in mocked_redis._pipe.scan_calls} == {"param1.*.param2.[02]"}
+    # Точная выборка - без поиска ключей
+    mocked_redis._pipe.scan_calls.clear()
+    assert model.get(param1=test_input_dict["param1"], param2=1).param2 == "1"
+    assert not mocked_redis._pipe.scan_calls
+    assert len(list(model.iter_filter(param1=test_input_dict["param1"], batch_size=2))) == 3
+
+
+def test_unknown_storage() -> None:
+    """ Неизвестный вариант хранения - ошибка объявления модели """
+    with pytest.raises(ValueError):
+        class UnknownStorageItem(RedisItem):
+            attr1: int
+
+            class Meta:
+                table = "param1.{param1}"
+                storage = "unknown"
+
+
+@pytest.mark.parametrize("storage", [STORAGE_KEYS, STORAGE_HASH, STORAGE_BLOB])
+def test_codecs_round_trip(storage: str) -> None:
+    """ Значения полей кодируются кодеками модели при записи и декодируются при чтении """
+    storage_value: str = storage
+
+    class CodecItem(RedisItem):
+        attr1: int
+        attr2: float
+        attr3: str
+
+        class Meta:
+            table = "param1.{param1}"
+            codec = "struct"
+            codecs = {"attr3": "text"}
+            storage = storage_value
+
+    mocked_redis: MockedRedis = MockedRedis()
+    item: RedisItem = CodecItem(param1=1, attr1=-19, attr2=99.9, attr3="value")
+    assert item.using(db_instance=mocked_redis).save().ok
+    loaded_item: RedisItem = CodecItem.using(db_instance=mocked_redis).get(param1=1)
+    assert (loaded_item.attr1, loaded_item.attr2, loaded_item.attr3) == (-19, 99.9, "value")
+    assert len(CodecItem.using(db_instance=mocked_redis).filter(param1="*")) == 1
+
+
+@pytest.fixture
+def compact_item_class(test_item: RedisItem) -> type:
+    """ Тестовый класс с компактными экземплярами (__slots__) """
+    class CompactItem(RedisItem):
+        __annotations__ = dict(test_item.__class__.__annotations__)
+
+        class Meta:
+            table = test_item.Meta.table
+            compact = True
+
+    return CompactItem
+
+
+def test_compact_item_slots(compact_item_class: type, test_item: RedisItem, test_input_dict: dict) -> None:
+    """ Компактный объект не содержит __dict__ и формирует те же данные, что и обычный """
+    compact_item: RedisItem = compact_item_class(**test_input_dict)
+    assert not hasattr(compact_item, "__dict__")
+    assert compact_item_class.__slots__ == (
+        "param1", "param2", "attr1", "attr2", "attr3", "attr4", "_dirty", "_replaced",
+    )
+    assert compact_item.attr2 == test_input_dict["attr2"]
+    assert compact_item._table == test_item._table
+    assert compact_item._params == test_item._params
+    assert compact_item.mapping == test_item.mapping
+    # Изменение значения поля отражается в данных для БД
+    compact_item.attr2 = 20
+    assert compact_item._params["attr2"] == 20
+
+
+def test_compact_item_missing_table_param(compact_item_class: type) -> None:
+    """ Отсутствие параметра Meta.table определяется при создании объекта """
+    with pytest.raises(KeyError):
+        compact_item_class(param1="param_value_1", attr1="attr_value_1")
+
+
+def test_compact_item_save_and_filter(compact_item_class: type, test_input_dict: dict) -> None:
+    """ Сохранение и получение компактных объектов """
+    mocked_redis: MockedRedis = MockedRedis()
+    compact_item: RedisItem = compact_item_class(**test_input_dict)
+    assert compact_item.using(db_instance=mocked_redis).save().ok
+    # Копия класса (using) также формирует компактные объекты
+    found_item: RedisItem = compact_item_class.using(db_instance=mocked_redis).get(**test_input_dict)
+    assert not hasattr(found_item, "__dict__")
+    assert found_item.mapping == compact_item.mapping
+    # Подключение объекта не заменяет подключение класса
+    assert compact_item._db_instance is None
@@ -1,12 +1,32 @@
+import redis
 import pytest
+import threading
+from pytest import MonkeyPatch
 
 from storage_orm import RedisORM
 from storage_orm import RedisItem
+from storage_orm import OperationResult
+from storage_orm.redis_impl import redis_item
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
 
 from .mocked_item import MockedItem
 from .mocked_redis import MockedRedis
 
 
+class ThreadedMockedRedis(MockedRedis):
+    """ Подключение, выдающее отдельный pipeline для каждой операции (как redis.Redis) """
+    pipes: list[MockedRedis]
+
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.pipes = []
+
+    def pipeline(self, **_) -> MockedRedis:
+        pipe: MockedRedis = MockedRedis(is_pipe=True, **self._storages)
+        self.pipes.append(pipe)
+        return pipe
+
+
 @pytest.fixture
 def mocked_redis() -> MockedRedis:
     return MockedRedis()
@@ -32,17 +52,59 @@ def test_save_calls_item_method(mocked_redis: MockedRedis) -> None:
 
 def test_bulk_create_calls_methods(mocked_redis: MockedRedis) -> None:
     """
-        Вызов метода группового сохранения должен вызывать у
-            pipe методы mset для каждого объекта и закрывать
-            транзакцию вызовом метода execute
+        Вызов метода группового сохранения должен объединять поля
+            объектов порции в одну команду mset и закрывать
+            каждую порцию вызовом метода execute
     """
     items_count: int = 11
     items: list[MockedItem] = [MockedItem() for _ in range(items_count)]
-    RedisORM(client=mocked_redis).bulk_create(items=items)
-    assert mocked_redis._pipe.calls_count == items_count
+    result: OperationResult = RedisORM(client=mocked_redis).bulk_create(items=items)
+    assert result.ok
+    assert mocked_redis._pipe.calls_count == 1
     assert mocked_redis._pipe.execute_calls_count == 1
 
 
+def test_bulk_create_chunk_size(mocked_redis: MockedRedis) -> None:
+    """ Групповая вставка из генератора выполняется порциями не более chunk_size объектов """
+    items_count: int = 11
+    result: OperationResult = RedisORM(client=mocked_redis).bulk_create(
+        items=(MockedItem() for _ in range(items_count)),
+        chunk_size=5,
+    )
+    assert mocked_redis._pipe.calls_count == 3
+    assert mocked_redis._pipe.execute_calls_count == 3
+    assert [chunk_result.message for chunk_result in result.details] == [
+        "chunk=0, items=5",
+        "chunk=1, items=5",
+        "chunk=2, items=1",
+    ]
+
+
+def test_bulk_create_max_bytes(mocked_redis: MockedRedis) -> None:
+    """ Порция групповой вставки ограничена объёмом данных max_bytes """
+    items: list[MockedItem] = [MockedItem() for _ in range(4)]
+    item_size: int = sum(len(key) + len(str(value)) for key, value in items[0].mapping.items())
+    RedisORM(client=mocked_redis).bulk_create(items=items, max_bytes=item_size * 2)
+    assert mocked_redis._pipe.execute_calls_count == 2
+
+
+def test_bulk_create_failed_chunk(mocked_redis: MockedRedis, monkeypatch: MonkeyPatch) -> None:
+    """ Ошибка вставки порции отражается в результате порции и общем результате операции """
+    execute_results: list = [None, Exception("connection lost"), None]
+
+    def execute(**_) -> None:
+        execute_result = execute_results.pop(0)
+        if isinstance(execute_result, Exception):
+            raise execute_result
+
+    monkeypatch.setattr(mocked_redis._pipe, "execute", execute)
+    items: list[MockedItem] = [MockedItem() for _ in range(3)]
+    result: OperationResult = RedisORM(client=mocked_redis).bulk_create(items=items, chunk_size=1)
+    assert not result.ok
+    assert [chunk_result.ok for chunk_result in result.details] == [True, False, True]
+    assert "connection lost" in result.message
+
+
 def test_init_global_db_connection(mocked_redis: MockedRedis) -> None:
     """
         При первом подключении должна устанавливаться глобальная
@@ -66,3 +128,176 @@ def test_noreinit_global_db_connection(mocked_redis: MockedRedis) -> None:
     # Создать новое и проверить, что сохранилось первое подключение
     RedisORM(client=mocked_redis)
     assert id(MockedItem._db_instance) != id(mocked_redis)
+
+
+class HashItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "param1.{param1}"
+        storage = STORAGE_HASH
+
+
+def test_bulk_create_hash_storage(mocked_redis: MockedRedis) -> None:
+    """ Групповая вставка объектов с хранением в hash - команда HSET для каждого объекта """
+    items: list[HashItem] = [HashItem(param1=i, attr1=i, attr2=str(i)) for i in range(3)]
+    assert RedisORM(client=mocked_redis).bulk_create(items=items).ok
+    assert mocked_redis._pipe.calls_count == 3
+    assert mocked_redis._hashes[b"param1.2"] == {b"attr1": b"2", b"attr2": b"2"}
+    assert not mocked_redis._data
+
+
+def test_migrate_to_hash(mocked_redis: MockedRedis) -> None:
+    """ Перенос объектов из отдельных ключей полей в hash с удалением исходных ключей """
+    for i in range(5):
+        mocked_redis._data |= {f"param1.{i}.attr1".encode(): str(i).encode(), f"param1.{i}.attr2".encode(): b"x"}
+    result: OperationResult = RedisORM(client=mocked_redis).migrate_to_hash(model=HashItem, batch_size=2)
+    assert result.ok
+    assert result.message == "migrated=5"
+    assert not mocked_redis._data
+    assert mocked_redis._hashes[b"param1.3"] == {b"attr1": b"3", b"attr2": b"x"}
+    # Объекты доступны для выборки из hash
+    assert HashItem.using(db_instance=mocked_redis).get(param1=3).attr1 == 3
+
+
+def test_migrate_to_hash_mget_chunks(mocked_redis: MockedRedis, monkeypatch: MonkeyPatch) -> None:
+    """ Значения порции переносимых объектов запрашиваются командами MGET по MGET_CHUNK_SIZE ключей """
+    monkeypatch.setattr(redis_item, "MGET_CHUNK_SIZE", 3)
+    for i in range(5):
+        mocked_redis._data |= {f"param1.{i}.attr1".encode(): str(i).encode(), f"param1.{i}.attr2".encode(): b"x"}
+    result: OperationResult = RedisORM(client=mocked_redis).migrate_to_hash(model=HashItem, batch_size=5)
+    assert result.ok and result.message == "migrated=5"
+    assert [len(keys) for keys in mocked_redis._pipe.mget_calls] == [3, 3, 3, 1]
+    assert mocked_redis._hashes[b"param1.4"] == {b"attr1": b"4", b"attr2": b"x"}
+
+
+def test_init_connection_pool(monkeypatch: MonkeyPatch) -> None:
+    """ Подключение по host создаёт блокирующий пул заданного размера (без подключения к БД) """
+    monkeypatch.setattr(RedisItem, "_db_instance", MockedRedis())
+    orm: RedisORM = RedisORM(host="localhost", max_connections=8, pool_timeout=1.)
+    assert isinstance(orm.pool, redis.BlockingConnectionPool)
+    assert orm.pool.max_connections == 8
+    assert orm.pool.timeout == 1.
+    orm.close()
+
+
+def test_bulk_create_threads() -> None:
+    """ Групповые вставки из нескольких потоков выполняются в отдельных pipeline """
+    threads_count: int = 8
+    client: ThreadedMockedRedis = ThreadedMockedRedis()
+    orm: RedisORM = RedisORM(client=client)
+    results: list[OperationResult] = []
+    # Ключи MockedItem формируются по id(), поэтому объекты создаются заранее
+    items: list[list[MockedItem]] = [[MockedItem() for _ in range(100)] for _ in range(threads_count)]
+
+    def bulk_create(thread_items: list[MockedItem]) -> None:
+        results.append(orm.bulk_create(items=thread_items, chunk_size=10))
+
+    threads: list[threading.Thread] = [
+        threading.Thread(target=bulk_create, args=(thread_items,))
+            for thread_items in items
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result.ok for result in results)
+    assert len(client._data) == threads_count * 100
+    assert len(client.pipes) == threads_count * 10
+    assert all(pipe.calls_count == 1 and pipe.execute_calls_count == 1 for pipe in client.pipes)
+
+
+def test_bulk_create_parallel_threads() -> None:
+    """ Объекты распределяются по частям по префиксу записи, части записываются потоками """
+    client: ThreadedMockedRedis = ThreadedMockedRedis()
+    items: list[HashItem] = [HashItem(param1=i, attr1=i, attr2=str(i)) for i in range(100)]
+    result: OperationResult = RedisORM(client=client).bulk_create_parallel(items=items, workers=4, chunk_size=10)
+    assert result.ok
+    assert len(client._hashes) == 100
+    assert sum(int(shard_result.message.split("items=")[1]) for shard_result in result.details) == 100
+    assert 1 < len(result.details) <= 4
+    # Части детерминированы: повторная вставка распределяет объекты так же
+    repeated_result: OperationResult = RedisORM(client=client).bulk_create_parallel(items=items, workers=4)
+    assert [shard_result.message for shard_result in repeated_result.details] == [
+        shard_result.message for shard_result in result.details
+    ]
+
+
+def test_bulk_create_parallel_unknown_mode(mocked_redis: MockedRedis) -> None:
+    """ Неизвестный вариант параллельной вставки """
+    with pytest.raises(ValueError):
+        RedisORM(client=mocked_redis).bulk_create_parallel(items=[], mode="unknown")
+
+
+def test_bulk_create_parallel_processes_errors() -> None:
+    """ Ошибки записи частей в процессах собираются в результатах частей """
+    client: MockedRedis = MockedRedis()
+    # Подключение процессов к заведомо недоступному серверу
+    client.connection_pool = redis.ConnectionPool(host="localhost", port=1, socket_connect_timeout=1)
+    items: list[HashItem] = [HashItem(param1=i, attr1=i, attr2=str(i)) for i in range(10)]
+    result: OperationResult = RedisORM(client=client).bulk_create_parallel(items=items, workers=2, mode="process")
+    assert not result.ok
+    assert len(result.details) == 2
+    assert all("error=" in shard_result.message for shard_result in result.details)
+    assert not client._hashes
+
+
+def test_bulk_create_parallel_processes() -> None:
+    """ Части записываются процессами через собственные подключения, результаты порций - в details частей """
+    fakeredis = pytest.importorskip("fakeredis")
+    # Сервер в потоке текущего процесса доступен процессам по TCP
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address
+    orm: RedisORM = RedisORM(host=host, port=port)
+    try:
+        items: list[HashItem] = [HashItem(param1=i, attr1=i, attr2=str(i)) for i in range(100)]
+        result: OperationResult = orm.bulk_create_parallel(items=items, workers=4, mode="process", chunk_size=10)
+        assert result.ok
+        assert len(result.details) == 4
+        assert sum(int(shard_result.message.split("items=")[1]) for shard_result in result.details) == 100
+        assert all(shard_result.ok and shard_result.details for shard_result in result.details)
+        assert len(orm._client.keys("*")) == 100
+        assert orm.bulk_get(items=[{"param1": 42}], model=HashItem)[0].attr2 == "42"
+    finally:
+        orm.close()
+        server.shutdown()
+        server.server_close()
+
+
+class KeysItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "param1.{param1}"
+
+
+def test_bulk_get(mocked_redis: MockedRedis) -> None:
+    """ Объекты разных моделей получаются одним pipeline в порядке запроса, None - отсутствует """
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    orm.bulk_create(items=[KeysItem(param1=i, attr1=i, attr2=str(i)) for i in (1, 12, 123)])
+    orm.bulk_create(items=[HashItem(param1=i, attr1=i, attr2=str(i)) for i in (5, 7)])
+    execute_calls_count: int = mocked_redis._pipe.execute_calls_count
+
+    result: list = orm.bulk_get(items=[
+        KeysItem(param1=123, attr1=0, attr2=""),
+        HashItem(param1=7, attr1=0, attr2=""),
+        KeysItem(param1=2, attr1=0, attr2=""),
+        KeysItem(param1=12, attr1=0, attr2=""),
+    ])
+    assert mocked_redis._pipe.execute_calls_count == execute_calls_count + 1
+    assert [item.attr1 if item else None for item in result] == [123, 7, None, 12]
+    assert isinstance(result[1], HashItem)
+
+
+def test_bulk_get_by_kwargs(mocked_redis: MockedRedis) -> None:
+    """ Получение объектов по значениям параметров Meta.table модели """
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    orm.bulk_create(items=[KeysItem(param1=i, attr1=i, attr2=str(i)) for i in (1, 12)])
+    result: list = orm.bulk_get(items=[{"param1": 12}, {"param1": 3}, {"param1": 1}], model=KeysItem)
+    assert [item.attr1 if item else None for item in result] == [12, None, 1]
+    with pytest.raises(ValueError):
+        orm.bulk_get(items=[{"param1": 12}])
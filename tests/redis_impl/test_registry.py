@@ -0,0 +1,129 @@
+import asyncio
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.indexes import get_registry_key
+from storage_orm.redis_impl.indexes import get_registry_shards_key
+
+from .mocked_redis import MockedRedis
+from .mocked_async_redis import MockedAsyncRedis
+
+
+class RegistryItem(RedisItem):
+    any_value: int
+
+    class Meta:
+        table = "subsystem.{subsystem_id}.tag.{tag_id}"
+        registry = True
+
+
+class ShardedRegistryItem(RedisItem):
+    any_value: int
+
+    class Meta:
+        table = "sharded.{subsystem_id}.tag.{tag_id}"
+        storage = STORAGE_HASH
+        registry = "sharded"
+
+
+class OtherItem(RedisItem):
+    any_value: int
+
+    class Meta:
+        table = "other.{other_id}"
+
+
+@pytest.fixture
+def mocked_redis(monkeypatch: MonkeyPatch) -> MockedRedis:
+    """ Подключение с объектами моделей с реестром и объектами другой модели """
+    mocked_redis: MockedRedis = MockedRedis()
+    # Глобальное подключение, установленное RedisORM, восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    orm: RedisORM = RedisORM(client=mocked_redis)
+    for model in (RegistryItem, ShardedRegistryItem):
+        orm.bulk_create(items=[
+            model(subsystem_id=tag_id % 3, tag_id=tag_id, any_value=tag_id)
+                for tag_id in range(9)
+        ])
+    orm.bulk_create(items=[OtherItem(other_id=other_id, any_value=other_id) for other_id in range(100)])
+    mocked_redis._pipe.scan_calls.clear()
+    return mocked_redis
+
+
+def test_registry_keys(mocked_redis: MockedRedis) -> None:
+    """ Префиксы записей регистрируются в set модели (для разделённого - в части и списке частей) """
+    assert len(mocked_redis._sets[get_registry_key(table=RegistryItem.Meta.table).encode()]) == 9
+    assert mocked_redis._sets[get_registry_shards_key(table=ShardedRegistryItem.Meta.table).encode()] == {
+        b"0", b"1", b"2",
+    }
+    assert mocked_redis._sets[get_registry_key(table=ShardedRegistryItem.Meta.table, shard="1").encode()] == {
+        b"sharded.1.tag.1", b"sharded.1.tag.4", b"sharded.1.tag.7",
+    }
+
+
+def test_save_registers_table() -> None:
+    """ Запись объекта и регистрация префикса выполняются одним pipeline """
+    mocked_redis: MockedRedis = MockedRedis()
+    item: RegistryItem = RegistryItem(subsystem_id=1, tag_id=2, any_value=3)
+    assert item.using(db_instance=mocked_redis).save().ok
+    assert mocked_redis._pipe.execute_calls_count == 1
+    assert mocked_redis._sets == {get_registry_key(table=RegistryItem.Meta.table).encode(): {b"subsystem.1.tag.2"}}
+
+
+@pytest.mark.parametrize("model", [RegistryItem, ShardedRegistryItem])
+def test_filter_by_registry(mocked_redis: MockedRedis, model: type) -> None:
+    """ Паттерны ищутся в реестре модели (SSCAN), ключи БД не просматриваются (SCAN) """
+    model = model.using(db_instance=mocked_redis)
+    assert sorted(item.any_value for item in model.filter(subsystem_id=1)) == [1, 4, 7]
+    assert sorted(item.any_value for item in model.filter(tag_id__in=[2, 3])) == [2, 3]
+    assert sorted(item.any_value for item in model.filter(subsystem_id="[01]", tag_id="?")) == [0, 1, 3, 4, 6, 7]
+    assert sorted(item.any_value for item in model.iter_filter(subsystem_id=2, batch_size=1)) == [2, 5, 8]
+    assert mocked_redis._pipe.scan_calls
+    assert all("name" in scan_call for scan_call in mocked_redis._pipe.scan_calls)
+
+
+def test_filter_by_registry_shard(mocked_redis: MockedRedis) -> None:
+    """ Значение первого параметра определяет часть реестра - список частей не запрашивается """
+    model: type = ShardedRegistryItem.using(db_instance=mocked_redis)
+    assert sorted(item.any_value for item in model.filter(subsystem_id=2)) == [2, 5, 8]
+    assert [scan_call["name"] for scan_call in mocked_redis._pipe.scan_calls] == [
+        get_registry_key(table=ShardedRegistryItem.Meta.table, shard="2"),
+    ]
+
+
+def test_filter_as_columns_by_registry(mocked_redis: MockedRedis) -> None:
+    """ Колонки значений по префиксам записей из реестра """
+    pytest.importorskip("numpy")
+    model: type = RegistryItem.using(db_instance=mocked_redis)
+    columns: dict = model.filter(subsystem_id=0, as_columns=True)
+    assert sorted(columns["any_value"].tolist()) == [0, 3, 6]
+
+
+def test_afilter_by_registry(mocked_redis: MockedRedis) -> None:
+    """ Поиск в реестре модели (asyncio) """
+    mocked_async_redis: MockedAsyncRedis = MockedAsyncRedis(sync=mocked_redis)
+    model: type = ShardedRegistryItem.using(db_instance=mocked_async_redis)
+    items: list = asyncio.run(model.afilter(tag_id="[12]"))
+    assert sorted(item.any_value for item in items) == [1, 2]
+    assert mocked_async_redis.max_concurrent_scans == 0
+
+
+def test_unknown_registry() -> None:
+    """ Неизвестный вариант реестра и разделённый реестр модели без параметров Meta.table """
+    with pytest.raises(ValueError):
+        class UnknownRegistryItem(RedisItem):
+            any_value: int
+
+            class Meta:
+                table = "param1.{param1}"
+                registry = "unknown"
+    with pytest.raises(ValueError):
+        class ShardedWithoutParamsItem(RedisItem):
+            any_value: int
+
+            class Meta:
+                table = "param1"
+                registry = "sharded"
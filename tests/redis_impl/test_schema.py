@@ -0,0 +1,59 @@
+import pytest
+
+from storage_orm.redis_impl.codecs import StructCodec
+from storage_orm.redis_impl.schema import ModelSchema
+
+
+@pytest.fixture
+def schema() -> ModelSchema:
+    return ModelSchema(
+        table="param1.{param1}.param2.{param2}",
+        annotations={"attr1": int, "attr2": str},
+        default_codec="text",
+        field_codecs={"attr1": "struct"},
+    )
+
+
+def test_schema_compiled_values(schema: ModelSchema) -> None:
+    """ Параметры, позиции параметров и окончания ключей полей вычисляются один раз """
+    assert schema.placeholders == ("param1", "param2")
+    assert schema.table_keys == {"param1": 1, "param2": 3}
+    assert schema.fields == ("attr1", "attr2")
+    assert schema.field_suffixes == (b".attr1", b".attr2")
+    assert isinstance(schema.codecs["attr1"], StructCodec)
+    # Текстовые поля записываются как есть и декодируются без обёртки кодека
+    assert schema.encoders["attr2"] is None
+    assert schema.decoders["attr2"](b"value") == "value"
+
+
+@pytest.mark.parametrize("hash_tag", [False, True])
+def test_build_table(hash_tag: bool) -> None:
+    """ Формирование префикса записи из частей шаблона совпадает с str.format """
+    schema: ModelSchema = ModelSchema(
+        table="item.{param1}.{{literal}}.{param2}",
+        annotations={},
+        default_codec="text",
+        field_codecs={},
+        hash_tag=hash_tag,
+    )
+    kwargs: dict = {"param1": 1, "param2": "two"}
+    assert schema.build_table(kwargs) == schema.table.format(**kwargs)
+    with pytest.raises(KeyError):
+        schema.build_table({"param1": 1})
+
+
+@pytest.mark.parametrize("table", ["item.{param[0]}", "item.{value:>{width}}", "item.{value!r}", "item.{value:03}"])
+def test_build_table_fallback(table: str) -> None:
+    """ Для нестандартных параметров используется str.format_map """
+    schema: ModelSchema = ModelSchema(table=table, annotations={}, default_codec="text", field_codecs={})
+    kwargs: dict = {"param": [7], "value": 5, "width": 3}
+    assert schema.build_table == table.format_map
+    assert schema.build_table(kwargs) == table.format_map(kwargs)
+
+
+def test_filter_template(schema: ModelSchema) -> None:
+    """ Параметры, не переданные в фильтр, заменяются на звездочку (шаблон кешируется) """
+    template: str = schema.get_filter_template(frozenset({"param2"}))
+    assert template == "param1.*.param2.{param2}"
+    assert schema.get_filter_template(frozenset({"param2"})) is template
+    assert schema.get_filter_template(frozenset({"param1"})) == "param1.{param1}.param2.*"
@@ -0,0 +1,148 @@
+import redis
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import ShardedRedis
+from storage_orm.redis_impl.scripts import FILTER_SCRIPT
+from storage_orm.redis_impl.scripts import ServerScript
+from storage_orm.redis_impl.indexes import split_index_predicates
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.redis_item import STORAGE_BLOB
+
+from .mocked_redis import MockedRedis
+
+
+class ScriptItem(RedisItem):
+    int_value: int
+    float_value: float
+    str_value: str
+
+    class Meta:
+        table = "script.{param1}.tag.{param2}"
+        max_patterns = 2
+
+
+class ScriptHashItem(RedisItem):
+    int_value: int
+    float_value: float
+    str_value: str
+
+    class Meta:
+        table = "script_hash.{param1}.tag.{param2}"
+        storage = STORAGE_HASH
+
+
+class ScriptBlobItem(RedisItem):
+    int_value: int
+    float_value: float
+    str_value: str
+
+    class Meta:
+        table = "script_blob.{param1}.tag.{param2}"
+        storage = STORAGE_BLOB
+        codec = "struct"
+        codecs = {"str_value": "text"}
+
+
+@pytest.fixture
+def fake_redis(monkeypatch: MonkeyPatch) -> redis.Redis:
+    """ Выполнение Lua-скриптов: fakeredis с интерпретатором Lua (lupa) """
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    # Глобальное подключение восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    client: redis.Redis = fakeredis.FakeRedis()
+    orm: RedisORM = RedisORM(client=client)
+    for model in (ScriptItem, ScriptHashItem, ScriptBlobItem):
+        orm.bulk_create(items=[
+            model(
+                param1=param1,
+                param2=param2,
+                int_value=param1 * 10 + param2,
+                float_value=param2 / 2,
+                str_value=f"value{param2}",
+            )
+                for param1 in range(20)
+                    for param2 in range(3)
+        ])
+    return client
+
+
+def get_values(items: list[RedisItem]) -> list[int]:
+    return sorted(item.int_value for item in items)
+
+
+@pytest.mark.parametrize("model", [ScriptItem, ScriptHashItem, ScriptBlobItem])
+@pytest.mark.parametrize(
+    "kwargs", [
+        {"param1": 1},
+        {"param1__in": [1, 12, 17, 5], "param2__in": [0, 2]},
+        {"param1__in": [3, 4], "param2": 1},
+        {"param1": "1*", "int_value__gte": 150, "str_value__in": ["value0", "value1"]},
+        {"param2": 2, "float_value__lt": 1, "int_value__in": [12, 22, 23]},
+        {"param2": 0, "str_value": "value1"},
+    ],
+)
+def test_filter_server_side(fake_redis: redis.Redis, model: type, kwargs: dict) -> None:
+    """ Результат выборки на стороне сервера совпадает с отбором всех объектов модели на клиенте """
+    predicates, table_kwargs = split_index_predicates(
+        kwargs=kwargs,
+        indexes=dict.fromkeys(model._schema.fields, True),
+        fields=model._schema.fields,
+    )
+    expected: list[RedisItem] = [
+        item for item in model.filter(**table_kwargs)
+            if all(predicate.match(getattr(item, predicate.field)) for predicate in predicates)
+    ]
+    assert get_values(model.filter(server_side=True, **kwargs)) == get_values(expected)
+
+
+def test_filter_server_side_reply(fake_redis: redis.Redis, monkeypatch: MonkeyPatch) -> None:
+    """ Условия по текстовым полям проверяются скриптом: в ответе только значения отобранных объектов """
+    replies: list[list[bytes]] = []
+
+    def evalsha(*args, **kwargs) -> list[bytes]:
+        replies.append(original_evalsha(*args, **kwargs))
+        return replies[-1]
+
+    original_evalsha = fake_redis.evalsha
+    monkeypatch.setattr(fake_redis, "evalsha", evalsha)
+    result: list[ScriptItem] = ScriptItem.filter(param1="*", int_value__in=[11, 21], server_side=True)
+    assert get_values(result) == [11, 21]
+    assert sorted(replies[-1][::2]) == sorted(
+        f"script.{param1}.tag.1.{field}".encode()
+            for param1 in (1, 2)
+                for field in ("int_value", "float_value", "str_value")
+    )
+    assert result[0].float_value == 0.5 and result[0].str_value == "value1"
+    assert ScriptItem.get(_items=[result[0]], server_side=True) == result[0]
+
+
+def test_server_script_reload() -> None:
+    """ Скрипт загружается при ответе NOSCRIPT, повторные вызовы выполняются по SHA1 """
+    mocked_redis: MockedRedis = MockedRedis()
+    script: ServerScript = ServerScript(source="return {}")
+    assert script(client=mocked_redis) == []
+    assert list(mocked_redis._scripts) == [script.sha]
+    assert script(client=mocked_redis, args=[1]) == []
+    # После SCRIPT FLUSH скрипт загружается повторно
+    mocked_redis._scripts.clear()
+    assert script(client=mocked_redis) == []
+    assert mocked_redis.calls_count == 5
+
+
+def test_filter_server_side_errors(monkeypatch: MonkeyPatch) -> None:
+    """ Загрузка скрипта при первом вызове, неподдерживаемые сочетания аргументов и подключения """
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    mocked_redis: MockedRedis = MockedRedis()
+    RedisORM(client=mocked_redis)
+    assert ScriptItem.filter(param1=1, server_side=True) == []
+    assert FILTER_SCRIPT.sha in mocked_redis._scripts
+    with pytest.raises(ValueError):
+        ScriptItem.filter(param1=1, server_side=True, as_columns=True)
+    sharded_model: type = ScriptItem.using(db_instance=ShardedRedis(clients=[MockedRedis(), MockedRedis()]))
+    with pytest.raises(Exception) as exception:
+        sharded_model.filter(param1=1, server_side=True)
+    assert "not supported" in str(exception.value)
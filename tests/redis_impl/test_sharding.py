@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import ShardedRedis
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.sharding import HashRing
+from storage_orm.redis_impl.sharding import get_hash_tag
+
+from .mocked_redis import MockedRedis
+
+SHARDS_COUNT = 3
+
+
+class ShardedItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "sharded.{param1}.{param2}"
+        hash_tag = True
+
+
+class ShardedHashItem(RedisItem):
+    attr1: int
+
+    class Meta:
+        table = "sharded_hash.{param1}"
+        storage = STORAGE_HASH
+        indexes = ["attr1"]
+        registry = True
+
+
+@pytest.fixture
+def shards() -> list[MockedRedis]:
+    return [MockedRedis() for _ in range(SHARDS_COUNT)]
+
+
+@pytest.fixture
+def orm(monkeypatch: MonkeyPatch, shards: list[MockedRedis]) -> RedisORM:
+    # Глобальное подключение, установленное RedisORM, восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    orm: RedisORM = RedisORM(shards=shards)
+    assert orm.bulk_create(items=[ShardedItem(param1=i, param2=i % 2, attr1=i, attr2=str(i)) for i in range(20)]).ok
+    assert orm.bulk_create(items=[ShardedHashItem(param1=i, attr1=i) for i in range(20)]).ok
+    return orm
+
+
+def test_hash_tag_keys() -> None:
+    """ Префикс записи в hash tag: все ключи объекта относятся к одному слоту (узлу) """
+    item: ShardedItem = ShardedItem(param1=1, param2=2, attr1=1, attr2="a")
+    assert item._table == "{sharded.1.2}"
+    assert set(item.mapping) == {"{sharded.1.2}.attr1", "{sharded.1.2}.attr2"}
+    assert get_hash_tag(b"{sharded.1.2}.attr1") == b"sharded.1.2"
+    assert get_hash_tag(b"sharded.{}.attr1") == b"sharded.{}.attr1"
+    assert ShardedItem._get_filters_by_kwargs(kwargs={"param1": 1}) == ["{sharded.1.*}.*"]
+
+
+def test_hash_ring() -> None:
+    """ Распределение ключей по узлам стабильно и охватывает все узлы """
+    ring: HashRing = HashRing(nodes_count=SHARDS_COUNT)
+    nodes: list[int] = [ring.get_node(f"key.{i}".encode()) for i in range(300)]
+    assert nodes == [ring.get_node(f"key.{i}".encode()) for i in range(300)]
+    assert set(nodes) == set(range(SHARDS_COUNT))
+    assert ring.get_node(b"{tag}.a") == ring.get_node(b"{tag}.b")
+
+
+def test_bulk_create_distributes_keys(orm: RedisORM, shards: list[MockedRedis]) -> None:
+    """ Ключи объектов распределяются по узлам, ключи одного объекта - на одном узле """
+    assert all(shard._data for shard in shards)
+    assert sum(len(shard._data) for shard in shards) == 40
+    for shard in shards:
+        tables: set[bytes] = {key.rsplit(b".", 1)[0] for key in shard._data}
+        for table in tables:
+            assert shard._data[table + b".attr1"] and shard._data[table + b".attr2"]
+    assert sum(len(shard._hashes) for shard in shards) == 20
+
+
+def test_filter(orm: RedisORM) -> None:
+    """ Выборка по точным ключам, по шаблону (SCAN всех узлов) и по индексу """
+    items: list[ShardedItem] = ShardedItem.filter(param1__in=[1, 2, 3], param2="*")
+    assert sorted((item.param1, item.attr1) for item in items) == [("1", 1), ("2", 2), ("3", 3)]
+    assert len(ShardedItem.filter(param1="*", param2=1)) == 10
+    assert sorted(item.attr1 for item in ShardedHashItem.filter(attr1__gte=17)) == [17, 18, 19]
+    assert len(ShardedHashItem.filter(param1="*")) == 20
+    assert ShardedItem.get(param1=5, param2=1).attr2 == "5"
+
+
+def test_bulk_get(orm: RedisORM) -> None:
+    """ Групповое получение: MGET разделяется по узлам, порядок ответов сохраняется """
+    items: list = orm.bulk_get(items=[{"param1": i, "param2": i % 2} for i in (7, 100, 3)], model=ShardedItem)
+    assert [item and item.attr1 for item in items] == [7, None, 3]
+
+
+def test_delete(orm: RedisORM, shards: list[MockedRedis]) -> None:
+    """ Удаление и purge объектов на всех узлах """
+    assert ShardedItem.filter(param1="*", param2=0).delete().message == "deleted=10"
+    assert orm.purge(model=ShardedHashItem).message == "purged=20"
+    assert sum(len(shard._data) for shard in shards) == 20
+    assert not any(shard._hashes for shard in shards)
+
+
+def test_sharded_client(orm: RedisORM, shards: list[MockedRedis]) -> None:
+    """ Команды без pipeline, неподдерживаемые команды и закрытие подключений """
+    client: ShardedRedis = orm._client
+    assert orm.is_sharded and orm.pool is None
+    key: bytes = b"{sharded.4.0}.attr1"
+    assert client.mget([key, b"unknown"]) == [b"4", None]
+    assert shards[client.get_client_index(key)]._data[key] == b"4"
+    with pytest.raises(AttributeError):
+        client.flushall()
+    with pytest.raises(ValueError):
+        orm.bulk_create_parallel(items=[], mode="process")
+    with pytest.raises(Exception):
+        ShardedItem.listen_cache_invalidations()
+    orm.close()
+    assert all(shard.connection_pool._created_connections == 0 for shard in shards)
+
+
+def test_sharded_executor_concurrent(shards: list[MockedRedis]) -> None:
+    """ Одновременные pipeline из нескольких потоков используют один пул потоков узлов """
+    client: ShardedRedis = ShardedRedis(clients=shards)
+    keys: list[str] = [f"{{sharded.{i}.0}}.attr1" for i in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        replies: list[list] = list(executor.map(lambda _: client.mget(keys), range(32)))
+    assert all(reply == [None] * len(keys) for reply in replies)
+    executor_instance: ThreadPoolExecutor = client._executor
+    assert executor_instance is not None and client._get_executor() is executor_instance
+    client.close()
+    assert client._executor is None and executor_instance._shutdown
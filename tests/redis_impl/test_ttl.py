@@ -0,0 +1,160 @@
+import time
+import asyncio
+import pytest
+from pytest import MonkeyPatch
+
+from storage_orm import RedisORM
+from storage_orm import RedisItem
+from storage_orm import AsyncRedisORM
+from storage_orm import OperationResult
+from storage_orm.redis_impl.redis_item import STORAGE_HASH
+from storage_orm.redis_impl.indexes import get_index_key
+from storage_orm.redis_impl.indexes import get_registry_key
+from storage_orm.redis_impl.indexes import INDEX_KEY_PREFIX
+from storage_orm.redis_impl.indexes import REGISTRY_KEY_PREFIX
+
+from .mocked_redis import MockedRedis
+from .mocked_async_redis import MockedAsyncRedis
+
+
+class TtlItem(RedisItem):
+    attr1: int
+    attr2: str
+
+    class Meta:
+        table = "ttl.{param1}.{param2}"
+        ttl = 60
+
+
+class TtlHashItem(RedisItem):
+    attr1: int
+
+    class Meta:
+        table = "ttl_hash.{param1}.{param2}"
+        storage = STORAGE_HASH
+
+
+class PurgeItem(RedisItem):
+    attr1: int
+
+    class Meta:
+        table = "purge.{param1}.{param2}"
+        storage = STORAGE_HASH
+        indexes = ["attr1"]
+        registry = "sharded"
+        cache = {"max_items": 100}
+
+
+@pytest.fixture
+def orm(monkeypatch: MonkeyPatch) -> RedisORM:
+    # Глобальное подключение, установленное RedisORM, восстанавливается после теста
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    return RedisORM(client=MockedRedis())
+
+
+def test_save_with_model_ttl() -> None:
+    """ Время жизни Meta.ttl устанавливается для ключа каждого поля тем же pipeline """
+    mocked_redis: MockedRedis = MockedRedis()
+    assert TtlItem(param1=1, param2=2, attr1=1, attr2="a").using(db_instance=mocked_redis).save().ok
+    assert mocked_redis._pipe.execute_calls_count == 1
+    assert mocked_redis._expires == {b"ttl.1.2.attr1": 60_000, b"ttl.1.2.attr2": 60_000}
+
+
+def test_save_ttl_override() -> None:
+    """ ttl вызова заменяет Meta.ttl, для hash - время жизни ключа hash """
+    mocked_redis: MockedRedis = MockedRedis()
+    assert TtlItem(param1=1, param2=2, attr1=1, attr2="a").using(db_instance=mocked_redis).save(ttl=1.5).ok
+    assert set(mocked_redis._expires.values()) == {1500}
+    mocked_redis._expires.clear()
+    assert TtlHashItem(param1=1, param2=2, attr1=1).using(db_instance=mocked_redis).save(ttl=5).ok
+    assert mocked_redis._expires == {b"ttl_hash.1.2": 5000}
+
+
+def test_bulk_create_ttl(orm: RedisORM) -> None:
+    """ Групповая вставка устанавливает время жизни записей в pipeline порции """
+    client: MockedRedis = orm._client
+    assert orm.bulk_create(items=[TtlItem(param1=i, param2=0, attr1=i, attr2="a") for i in range(5)]).ok
+    assert len(client._expires) == 10 and set(client._expires.values()) == {60_000}
+    assert orm.bulk_create(items=[TtlHashItem(param1=i, param2=0, attr1=i) for i in range(5)], ttl=10).ok
+    assert client._expires[b"ttl_hash.3.0"] == 10_000
+    assert client._pipe.execute_calls_count == 2
+
+
+def test_abulk_create_ttl() -> None:
+    """ Время жизни записей при групповой вставке (asyncio) """
+    mocked_async_redis: MockedAsyncRedis = MockedAsyncRedis()
+    result: OperationResult = asyncio.run(AsyncRedisORM(client=mocked_async_redis).abulk_create(
+        items=[TtlHashItem(param1=i, param2=0, attr1=i) for i in range(3)],
+        ttl=2,
+    ))
+    assert result.ok
+    assert mocked_async_redis.sync._expires == {f"ttl_hash.{i}.0".encode(): 2000 for i in range(3)}
+    RedisItem._async_db_instance = None
+
+
+def test_invalid_ttl() -> None:
+    with pytest.raises(ValueError):
+        class InvalidTtlItem(RedisItem):
+            attr1: int
+
+            class Meta:
+                table = "param1.{param1}"
+                ttl = 0
+
+
+@pytest.mark.parametrize("options", [{"registry": True}, {"indexes": ["attr1"]}])
+def test_ttl_with_registry_or_indexes(orm: RedisORM, options: dict) -> None:
+    """ Время жизни не поддерживается для моделей с реестром или индексами (их записи не истекают) """
+    with pytest.raises(ValueError):
+        type("InvalidTtlItem", (RedisItem,), {
+            "__annotations__": {"attr1": int},
+            "Meta": type("Meta", (), {"table": "param1.{param1}", "ttl": 60, **options}),
+        })
+    client: MockedRedis = orm._client
+    assert not PurgeItem(param1=1, param2=2, attr1=1).save(ttl=5).ok
+    assert not orm.bulk_create(items=[PurgeItem(param1=i, param2=0, attr1=i) for i in range(3)], ttl=5).ok
+    assert not client._hashes and not client._sets and not client._sorted_sets
+
+
+def test_ttl_expired_keys(monkeypatch: MonkeyPatch) -> None:
+    """ После истечения Meta.ttl в БД не остаётся ни записей объектов, ни записей реестра и индексов """
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setattr(RedisItem, "_db_instance", None)
+    client = fakeredis.FakeRedis()
+    orm: RedisORM = RedisORM(client=client)
+    assert orm.bulk_create(items=[TtlItem(param1=i % 2, param2=i, attr1=i, attr2="a") for i in range(6)]).ok
+    assert TtlItem(param1=5, param2=5, attr1=5, attr2="b").save().ok
+    assert len(TtlItem.filter(param1="*")) == 7 and client.dbsize() == 14
+    # Время сервера сдвигается за пределы Meta.ttl
+    now: float = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + TtlItem.Meta.ttl + 1)
+    assert TtlItem.filter(param1="*") == []
+    assert client.keys("*") == []
+    assert client.keys(f"{INDEX_KEY_PREFIX}*") == [] and client.keys(f"{REGISTRY_KEY_PREFIX}*") == []
+
+
+def test_purge(orm: RedisORM) -> None:
+    """ Удаление объектов порциями с очисткой реестра, индексов и локального кеша """
+    client: MockedRedis = orm._client
+    orm.bulk_create(items=[PurgeItem(param1=i % 2, param2=i, attr1=i) for i in range(7)])
+    orm.bulk_create(items=[TtlItem(param1=i % 2, param2=i, attr1=i, attr2="a") for i in range(7)])
+    execute_calls_count: int = client._pipe.execute_calls_count
+
+    result: OperationResult = orm.purge(model=PurgeItem, chunk_size=2, param1=1)
+    assert result.ok
+    assert result.message == "purged=3"
+    assert client._pipe.execute_calls_count == execute_calls_count + 2
+    assert sorted(client._hashes) == [b"purge.0.0", b"purge.0.2", b"purge.0.4", b"purge.0.6"]
+    assert not client._sets[get_registry_key(table=PurgeItem.Meta.table, shard="1").encode()]
+    assert len(client._sorted_sets[get_index_key(table=PurgeItem.Meta.table, field="attr1").encode()]) == 4
+    assert PurgeItem._get_cache(db_instance=client).get("purge.1.1") is None
+    assert PurgeItem._get_cache(db_instance=client).get("purge.0.2") is not None
+    # Модель без реестра: ключи полей ищутся SCAN
+    assert orm.purge(model=TtlItem, param2=3).message == "purged=1"
+    assert orm.purge(model=TtlItem).message == "purged=6"
+    assert not client._data
+
+
+def test_purge_by_index_predicates(orm: RedisORM) -> None:
+    with pytest.raises(ValueError):
+        orm.purge(model=PurgeItem, attr1=1)